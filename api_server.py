@@ -1,29 +1,48 @@
 #!/usr/bin/env python
 """FastAPI server to expose the NASCAR Pit Box Agent as an API."""
 
+import json
 import os
-import asyncio
-from typing import Dict, Any, List
-from fastapi import FastAPI, HTTPException
+import time
+from contextlib import aclosing, asynccontextmanager
+from typing import Literal, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from langchain_core.messages import HumanMessage, AIMessage
-import json
-import uvicorn
 
 from app.graphs.simple_pitbox import graph
+from app.runs import AgentRun, run_manager
+from app.scheduler import SchedulerBusy, scheduler
+from app.streaming import stream_speech_chunks
+from app.tools.rag_knowledge import get_knowledge_status, start_knowledge_warmup
+from app.tools.semantic_cache import answer_cache
 
 
 class ChatRequest(BaseModel):
     message: str
+    # Streaming mode for /chat/stream: raw tokens, or sentence chunks for TTS
+    mode: Literal["tokens", "speech"] = "tokens"
+    # A new question from the same session cancels its unfinished previous one
+    session_id: Optional[str] = None
+    # Scheduling priority: urgent pit calls run ahead of analytics questions
+    priority: Literal["urgent", "normal", "analytics"] = "normal"
 
 
 class ChatResponse(BaseModel):
     response: str
 
 
-app = FastAPI(title="NASCAR Pit Box AI API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the knowledge RAG while the server starts taking requests
+    start_knowledge_warmup()
+    yield
+
+
+app = FastAPI(title="NASCAR Pit Box AI API", version="1.0.0", lifespan=lifespan)
 
 # Configure CORS to allow frontend access
 app.add_middleware(
@@ -43,74 +62,142 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/chat": "POST - Send a message to the NASCAR AI agent",
-            "/chat/stream": "POST - Stream responses from the NASCAR AI agent",
-            "/health": "GET - Check API health status"
-        }
+            "/chat/stream": "POST - Stream tokens (SSE); mode=speech for TTS chunks",
+            "/health": "GET - API health and knowledge base readiness",
+            "/metrics": "GET - Agent run, queue and knowledge cache metrics",
+        },
     }
 
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "service": "pitbox-ai-api"}
+    knowledge = get_knowledge_status()
+    return {
+        "status": "healthy",
+        "service": "pitbox-ai-api",
+        "ready": knowledge["ready"],
+        "knowledge": knowledge,
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "runs": run_manager.get_metrics(),
+        "scheduler": scheduler.get_metrics(),
+        "knowledge_cache": answer_cache.get_stats(),
+    }
+
+
+async def start_run(request: ChatRequest) -> AgentRun:
+    """Admit a request through the scheduler and start its agent run.
+
+    An identical question already in flight (or answered moments ago) is
+    joined instead, without taking a run slot. Raises a 429 with Retry-After
+    when the server is saturated. The run slot is released when the run
+    finishes or is cancelled.
+    """
+    run = run_manager.join(request.message, request.session_id)
+    if run is not None:
+        return run
+    try:
+        await scheduler.acquire(request.priority)
+    except SchedulerBusy as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Server busy: {e.reason}",
+            headers={"Retry-After": str(max(1, round(e.retry_after)))},
+        )
+    try:
+        # Someone may have started the same question while this one was queued
+        run, started = run_manager.join_or_start(
+            graph, request.message, request.session_id
+        )
+    except Exception:
+        scheduler.release()
+        raise
+    if not started:
+        scheduler.release()
+        return run
+    run.task.add_done_callback(lambda _: scheduler.release())
+    return run
 
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
     """Send a message to the NASCAR Pit Box Agent and get a response."""
+    run = await start_run(request)
+    answer = None
     try:
-        # Invoke the graph with the user's message
-        result = await graph.ainvoke({
-            "messages": [HumanMessage(content=request.message)]
-        })
-        
-        # Get the final message (should be the AI's response)
-        final_message = result["messages"][-1]
-        
-        if isinstance(final_message, AIMessage):
-            return ChatResponse(response=final_message.content)
-        else:
-            raise HTTPException(status_code=500, detail="Unexpected response type from agent")
-            
+        subscription = run_manager.subscribe(run, http_request.is_disconnected)
+        async with aclosing(subscription):
+            async for event in subscription:
+                if event["type"] == "answer":
+                    answer = event["content"]
+                elif event["type"] == "cancelled":
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"Request cancelled: {event['reason']}",
+                    )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-
-async def generate_stream(message: str):
-    """Generate streaming response from the agent."""
+    if answer is None:
+        if run.cancel_reason:
+            # Client went away; nobody will read this
+            raise HTTPException(status_code=499, detail="Client disconnected")
+        raise HTTPException(
+            status_code=500, detail="Unexpected response type from agent"
+        )
+    return ChatResponse(response=answer)
+
+
+async def generate_stream(
+    run: AgentRun,
+    request: ChatRequest,
+    http_request: Request,
+    started: Optional[float] = None,
+):
+    """Generate streaming response from the agent.
+
+    Answer tokens are sent as they are generated, along with tool_start and
+    tool_end events, as Server-Sent Events. In speech mode tokens are grouped
+    into speakable sentence chunks with latency timestamps instead. If the
+    client disconnects, the run and its tool calls are cancelled.
+    """
     try:
-        # For now, we'll send the complete response as a single chunk
-        # In a production system, you'd want to implement true streaming
-        result = await graph.ainvoke({
-            "messages": [HumanMessage(content=message)]
-        })
-        
-        final_message = result["messages"][-1]
-        
-        if isinstance(final_message, AIMessage):
-            # Send as Server-Sent Events format
-            data = json.dumps({"content": final_message.content})
-            yield f"data: {data}\n\n"
-            yield f"data: [DONE]\n\n"
-        else:
-            error_data = json.dumps({"error": "Unexpected response type"})
-            yield f"data: {error_data}\n\n"
-            
+        # Closing the subscription when the response ends (including a client
+        # disconnect mid-stream) cancels the run if nobody else is listening
+        subscription = run_manager.subscribe(run, http_request.is_disconnected)
+        async with aclosing(subscription):
+            events = subscription
+            if request.mode == "speech":
+                events = stream_speech_chunks(subscription, started=started)
+            async for event in events:
+                yield f"data: {json.dumps(event)}\n\n"
+        yield "data: [DONE]\n\n"
+
     except Exception as e:
-        error_data = json.dumps({"error": str(e)})
+        error_data = json.dumps({"type": "error", "error": str(e)})
         yield f"data: {error_data}\n\n"
 
 
 @app.post("/chat/stream")
-async def chat_stream(request: ChatRequest):
+async def chat_stream(request: ChatRequest, http_request: Request):
     """Stream responses from the NASCAR Pit Box Agent."""
+    started = time.perf_counter()
+    # Admit before streaming so a saturated server can still answer 429
+    run = await start_run(request)
     return StreamingResponse(
-        generate_stream(request.message),
+        generate_stream(run, request, http_request, started),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "Access-Control-Allow-Origin": "*",
-        }
+        },
     )
 
 
@@ -120,10 +207,10 @@ if __name__ == "__main__":
     print("Server running at: http://localhost:8765")
     print("API documentation: http://localhost:8765/docs")
     print("=" * 60)
-    
+
     # Check for required environment variables
     if not os.getenv("OPENAI_API_KEY"):
         print("⚠️  Warning: OPENAI_API_KEY not set")
-    
+
     # Run the server without reload to avoid the import string issue
-    uvicorn.run(app, host="0.0.0.0", port=8765)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8765)
@@ -19,10 +19,61 @@ DEFAULT_TEMP = float(os.getenv("MODEL_TEMPERATURE", "0.1"))
 # Simulator configuration
 SIMULATOR_BASE_URL = os.getenv("SIMULATOR_BASE_URL", "http://127.0.0.1:8000")
 
+# Tool execution configuration
+TOOL_MAX_PARALLEL = int(os.getenv("TOOL_MAX_PARALLEL", "5"))
+TOOL_TIMEOUT = float(os.getenv("TOOL_TIMEOUT", "30"))
+
+# Speech streaming configuration (sentence-chunked output for TTS)
+SPEECH_MIN_CHARS = int(os.getenv("SPEECH_MIN_CHARS", "20"))
+SPEECH_MAX_CHARS = int(os.getenv("SPEECH_MAX_CHARS", "200"))
+
+# API server configuration
+DISCONNECT_POLL_INTERVAL = float(os.getenv("DISCONNECT_POLL_INTERVAL", "0.5"))
+API_MAX_CONCURRENT = int(os.getenv("API_MAX_CONCURRENT", "8"))
+API_MAX_QUEUE = int(os.getenv("API_MAX_QUEUE", "32"))
+API_QUEUE_TIMEOUT = float(os.getenv("API_QUEUE_TIMEOUT", "10"))
+API_URGENT_RESERVED = int(os.getenv("API_URGENT_RESERVED", "1"))
+# Identical concurrent questions share one run; finished answers are reused
+# for CHAT_REUSE_WINDOW seconds if they read live race data (the race state
+# mirror refreshes every second), or CHAT_REUSE_WINDOW_STATIC if they didn't
+CHAT_DEDUP_ENABLED = os.getenv("CHAT_DEDUP_ENABLED", "true").lower() == "true"
+CHAT_REUSE_WINDOW = float(os.getenv("CHAT_REUSE_WINDOW", "1.0"))
+CHAT_REUSE_WINDOW_STATIC = float(os.getenv("CHAT_REUSE_WINDOW_STATIC", "300"))
+
 # Knowledge base configuration
 KNOWLEDGE_BASE_PATH = os.getenv("KNOWLEDGE_BASE_PATH", "app/knowledge")
+# Chunk embeddings persisted across restarts (empty to disable)
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite3")
+# Prebuilt chunk/vector index, rebuilt when knowledge files change (empty to disable)
+KNOWLEDGE_INDEX_PATH = os.getenv("KNOWLEDGE_INDEX_PATH", ".cache/knowledge_index")
+# Build the knowledge RAG in the background when the API or CLI starts
+KNOWLEDGE_WARMUP = os.getenv("KNOWLEDGE_WARMUP", "true").lower() == "true"
+# Knowledge retrieval: auto (BM25 for exact terms, else hybrid), hybrid, dense, bm25
+KNOWLEDGE_RETRIEVAL_MODE = os.getenv("KNOWLEDGE_RETRIEVAL_MODE", "auto")
+# Dense hits under this cosine score are dropped; each ranking also stops at
+# hits scoring under KNOWLEDGE_RELATIVE_CUTOFF x its best hit
+KNOWLEDGE_MIN_SCORE = float(os.getenv("KNOWLEDGE_MIN_SCORE", "0.3"))
+KNOWLEDGE_RELATIVE_CUTOFF = float(os.getenv("KNOWLEDGE_RELATIVE_CUTOFF", "0.5"))
+# Max chunks for the team, glossary and track tools (general search uses 5)
+KNOWLEDGE_SOURCE_K = int(os.getenv("KNOWLEDGE_SOURCE_K", "3"))
+# Knowledge tools return a generated answer ("generate") or cited excerpts for
+# the agent to answer from directly ("retrieve", one LLM generation fewer)
+KNOWLEDGE_TOOL_MODE = os.getenv("KNOWLEDGE_TOOL_MODE", "generate")
+# Semantic answer cache: near-duplicate knowledge questions reuse an answer
+KNOWLEDGE_CACHE_ENABLED = os.getenv("KNOWLEDGE_CACHE_ENABLED", "true").lower() == "true"
+KNOWLEDGE_CACHE_THRESHOLD = float(os.getenv("KNOWLEDGE_CACHE_THRESHOLD", "0.95"))
+KNOWLEDGE_CACHE_MAX_ENTRIES = int(os.getenv("KNOWLEDGE_CACHE_MAX_ENTRIES", "256"))
+KNOWLEDGE_CACHE_TTL = float(os.getenv("KNOWLEDGE_CACHE_TTL", "86400"))
 
 # MCP Server configuration
 MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio")  # 'stdio' or 'http'
 MCP_HOST = os.getenv("MCP_HOST", "127.0.0.1")
 MCP_PORT = int(os.getenv("MCP_PORT", "8000"))
+MCP_CONNECT_TIMEOUT = float(os.getenv("MCP_CONNECT_TIMEOUT", "30"))
+MCP_RETRY_INTERVAL = float(os.getenv("MCP_RETRY_INTERVAL", "30"))
+
+# MCP stdio worker pool
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "2"))
+MCP_WORKER_MAX_CALLS = int(os.getenv("MCP_WORKER_MAX_CALLS", "1000"))  # 0 disables
+MCP_WORKER_MAX_AGE = float(os.getenv("MCP_WORKER_MAX_AGE", "3600"))  # 0 disables
+MCP_HEALTH_INTERVAL = float(os.getenv("MCP_HEALTH_INTERVAL", "30"))
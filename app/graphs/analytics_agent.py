@@ -1,23 +1,24 @@
 """Advanced NASCAR Analytics Agent - Multi-step analysis with evaluation loop"""
 
 from functools import lru_cache
-from typing import Any, Dict, Literal
+from typing import Any, Dict, Literal, Optional, Tuple
 
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, StateGraph
 from langgraph.prebuilt import ToolNode
 
 from .. import ANALYTICS_MODEL
-from ..models import get_chat_model
 from ..state import PitBoxState
-from ..tools import get_tools
+from ..tools import aget_model_with_tools, aget_tools, get_tools_version
 
+# Tool node for the current tool set, keyed by tool set version
+_tool_node: Optional[Tuple[int, ToolNode]] = None
 
-def analyze_query(state: PitBoxState) -> Dict[str, Any]:
+
+async def analyze_query(state: PitBoxState) -> Dict[str, Any]:
     """Analyze complex NASCAR queries and plan multi-step data collection."""
-    model = get_chat_model(model_name=ANALYTICS_MODEL)
-    tools = get_tools()
-    model_with_tools = model.bind_tools(tools)
+    model_with_tools = await aget_model_with_tools(ANALYTICS_MODEL)
 
     system_prompt = """
     You are an advanced NASCAR analytics agent. For complex queries requiring
@@ -31,11 +32,23 @@ def analyze_query(state: PitBoxState) -> Dict[str, Any]:
     """
 
     messages = [{"role": "system", "content": system_prompt}] + state["messages"]
-    response = model_with_tools.invoke(messages)
+    response = await model_with_tools.ainvoke(messages)
 
     return {"messages": [response]}
 
 
+async def execute_tools(state: PitBoxState, config: RunnableConfig) -> Dict[str, Any]:
+    """Run the requested tools with the current tool set."""
+    global _tool_node
+
+    tools = await aget_tools()
+    version = get_tools_version()
+    if _tool_node is None or _tool_node[0] != version:
+        # The tool list changed (e.g. MCP reconnect): rebuild the tool node
+        _tool_node = (version, ToolNode(tools))
+    return await _tool_node[1].ainvoke(state, config)
+
+
 def evaluate_response(state: PitBoxState) -> Dict[str, Any]:
     """Evaluate if the analysis is complete and accurate."""
     # Simple loop protection - limit message count
@@ -93,7 +106,7 @@ def build_graph() -> StateGraph:
 
     # Add nodes
     graph.add_node("agent", analyze_query)
-    graph.add_node("action", ToolNode(get_tools()))
+    graph.add_node("action", execute_tools)
     graph.add_node("evaluate", evaluate_response)
 
     # Set entry point
@@ -1,85 +1,98 @@
 """Simple NASCAR Pit Box Agent - Basic Q&A with tool routing"""
 
+import asyncio
+import json
+import logging
+import time
 from functools import lru_cache
 from typing import Any, Dict, Literal
 
 from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
 from langgraph.graph import END, StateGraph
 
-from ..models import get_chat_model
+from .. import TOOL_MAX_PARALLEL, TOOL_TIMEOUT
 from ..state import PitBoxState
-from ..tools import get_tools
+from ..tools import aget_model_with_tools, aget_tools
 
+logger = logging.getLogger(__name__)
 
-async def execute_tools(state: PitBoxState) -> Dict[str, Any]:
-    """Execute async tools from the last message's tool calls."""
-    last_message = state["messages"][-1]
-    
-    if not hasattr(last_message, "tool_calls") or not last_message.tool_calls:
-        return {"messages": []}
-    
-    tools = get_tools()
-    tool_map = {tool.name: tool for tool in tools}
-    
-    tool_messages = []
-    for tool_call in last_message.tool_calls:
-        tool_name = tool_call["name"]
-        tool_args = tool_call["args"]
-        tool_id = tool_call["id"]
-        
-        if tool_name not in tool_map:
-            tool_messages.append(
-                ToolMessage(
-                    content=f"Tool {tool_name} not found",
-                    tool_call_id=tool_id,
-                    name=tool_name,
-                )
-            )
-            continue
-        
-        tool = tool_map[tool_name]
-        
+
+async def _run_tool_call(
+    tool_call: Dict[str, Any],
+    tool_map: Dict[str, BaseTool],
+    semaphore: asyncio.Semaphore,
+) -> ToolMessage:
+    """Run one tool call under the parallelism limit and timeout."""
+    tool_name = tool_call["name"]
+    tool_args = tool_call["args"]
+    tool_id = tool_call["id"]
+
+    if tool_name not in tool_map:
+        return ToolMessage(
+            content=f"Tool {tool_name} not found",
+            tool_call_id=tool_id,
+            name=tool_name,
+        )
+
+    tool = tool_map[tool_name]
+
+    async with semaphore:
+        started = time.perf_counter()
         try:
-            # Try async invocation first (for MCP tools)
-            if hasattr(tool, "ainvoke"):
-                result = await tool.ainvoke(tool_args)
-            else:
-                # Fallback to sync invocation
-                result = tool.invoke(tool_args)
-            
+            # Async invocation works for both MCP tools and sync RAG tools
+            result = await asyncio.wait_for(tool.ainvoke(tool_args), TOOL_TIMEOUT)
+
             # Convert result to string if needed
             if isinstance(result, dict):
-                import json
                 content = json.dumps(result)
             else:
                 content = str(result)
-            
-            tool_messages.append(
-                ToolMessage(
-                    content=content,
-                    tool_call_id=tool_id,
-                    name=tool_name,
-                )
-            )
+        except asyncio.TimeoutError:
+            content = f"Error executing tool: timed out after {TOOL_TIMEOUT}s"
         except Exception as e:
-            tool_messages.append(
-                ToolMessage(
-                    content=f"Error executing tool: {str(e)}",
-                    tool_call_id=tool_id,
-                    name=tool_name,
-                )
-            )
-    
-    return {"messages": tool_messages}
-
-
-def call_model(state: PitBoxState) -> Dict[str, Any]:
+            content = f"Error executing tool: {str(e)}"
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    logger.info(f"Tool {tool_name} finished in {duration_ms}ms")
+    return ToolMessage(
+        content=content,
+        tool_call_id=tool_id,
+        name=tool_name,
+        additional_kwargs={"duration_ms": duration_ms},
+    )
+
+
+async def execute_tools(state: PitBoxState) -> Dict[str, Any]:
+    """Execute the last message's tool calls concurrently.
+
+    At most TOOL_MAX_PARALLEL calls run at once, each limited to TOOL_TIMEOUT
+    seconds. Tool messages are returned in the order the calls were made.
+    """
+    last_message = state["messages"][-1]
+
+    if not hasattr(last_message, "tool_calls") or not last_message.tool_calls:
+        return {"messages": []}
+
+    tools = await aget_tools()
+    tool_map = {tool.name: tool for tool in tools}
+
+    semaphore = asyncio.Semaphore(TOOL_MAX_PARALLEL)
+    tool_messages = await asyncio.gather(
+        *(
+            _run_tool_call(tool_call, tool_map, semaphore)
+            for tool_call in last_message.tool_calls
+        )
+    )
+
+    return {"messages": list(tool_messages)}
+
+
+async def call_model(state: PitBoxState) -> Dict[str, Any]:
     """Main agent node - processes user query and decides on tool usage."""
-    model = get_chat_model()
-    tools = get_tools()
-    model_with_tools = model.bind_tools(tools)
+    model_with_tools = await aget_model_with_tools()
 
-    response = model_with_tools.invoke(state["messages"])
+    response = await model_with_tools.ainvoke(state["messages"])
     return {"messages": [response]}
 
 
@@ -0,0 +1,292 @@
+"""Cancellable agent graph runs"""
+
+import asyncio
+import logging
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from langgraph.graph.state import CompiledStateGraph
+
+from . import (
+    CHAT_DEDUP_ENABLED,
+    CHAT_REUSE_WINDOW,
+    CHAT_REUSE_WINDOW_STATIC,
+    DISCONNECT_POLL_INTERVAL,
+)
+from .streaming import stream_agent_events
+from .tools.rag_knowledge import get_knowledge_tools
+
+# Tools that answer from the static knowledge base rather than live race data
+KNOWLEDGE_TOOL_NAMES = {tool.name for tool in get_knowledge_tools()}
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_message(message: str) -> str:
+    """Key for spotting identical questions: case, spacing and end punctuation."""
+    return " ".join(message.lower().split()).rstrip("?!. ")
+
+
+class AgentRun:
+    """One agent graph execution running in its own task.
+
+    Events are buffered so every listener sees the full stream from the start.
+    """
+
+    def __init__(
+        self, graph: CompiledStateGraph, message: str, session_id: Optional[str] = None
+    ):
+        self.message = message
+        self.key = normalize_message(message)
+        # Sessions waiting on this run, plus requests that came without one
+        self.sessions: Set[str] = {session_id} if session_id else set()
+        self.anonymous = 0 if session_id else 1
+        self.events: List[Dict[str, Any]] = []
+        self.listeners = 0
+        self.error: Optional[BaseException] = None
+        self.cancel_reason: Optional[str] = None
+        self.started = time.perf_counter()
+        self.tokens = 0
+        self.tools_running: Set[str] = set()
+        self.tools_used: Set[str] = set()
+        self.finished: Optional[float] = None
+        self.changed = asyncio.Event()
+        self.task = asyncio.create_task(self._run(graph))
+
+    @property
+    def done(self) -> bool:
+        return self.task.done()
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+        # Wake listeners, then give them a fresh event to wait on
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    async def _run(self, graph: CompiledStateGraph) -> None:
+        try:
+            async for event in stream_agent_events(graph, self.message):
+                if event["type"] == "token":
+                    self.tokens += 1
+                elif event["type"] == "tool_start":
+                    self.tools_running.add(event["id"])
+                    self.tools_used.add(event["tool"])
+                elif event["type"] == "tool_end":
+                    self.tools_running.discard(event["id"])
+                self._publish(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = time.monotonic()
+            self.changed.set()
+
+    @property
+    def reusable_for(self) -> float:
+        """Seconds a successful answer may be handed to identical questions.
+
+        Answers built only from the knowledge base (or no tools) don't depend
+        on race state; anything that read live data is only reused while that
+        data would still be current.
+        """
+        if self.error is not None or self.cancel_reason or self.finished is None:
+            return 0.0
+        if self.tools_used <= KNOWLEDGE_TOOL_NAMES:
+            return CHAT_REUSE_WINDOW_STATIC
+        return CHAT_REUSE_WINDOW
+
+
+class RunManager:
+    """Starts agent runs and cancels them once nobody is waiting for the answer.
+
+    A run is cancelled when its last listener disconnects, or when every
+    session waiting on it has asked a new question. Cancelling the run task
+    cancels the pending LLM request and abandons in-flight tool calls (the
+    MCP server still finishes any tool it already started).
+
+    Identical questions (after normalize_message) share one run: later callers
+    join the run in flight and replay its stream from the start, and a
+    finished answer is reused for a short window (see AgentRun.reusable_for).
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, AgentRun] = {}
+        self._active: Set[AgentRun] = set()
+        # Latest run per normalized question, in flight or recently finished
+        self._by_key: Dict[str, AgentRun] = {}
+        self._metrics = {
+            "started_runs": 0,
+            "joined_in_flight": 0,
+            "reused_answers": 0,
+            "completed_runs": 0,
+            "failed_runs": 0,
+            "cancelled_runs": 0,
+            "cancelled_disconnected": 0,
+            "cancelled_superseded": 0,
+            "cancelled_tool_calls": 0,
+            "cancelled_tokens": 0,
+            "cancelled_seconds": 0.0,
+        }
+
+    def _supersede(self, session_id: Optional[str]) -> None:
+        """Drop a session's interest in its previous run, cancelling it if unshared."""
+        if not session_id:
+            return
+        previous = self._sessions.pop(session_id, None)
+        if previous is None or previous.done:
+            return
+        previous.sessions.discard(session_id)
+        if not previous.sessions and not previous.anonymous:
+            self.cancel(previous, "superseded")
+
+    def join(
+        self, message: str, session_id: Optional[str] = None
+    ) -> Optional[AgentRun]:
+        """Attach to a run for the same question that is in flight or fresh.
+
+        Returns None if there is nothing to share and a new run is needed.
+        """
+        if not CHAT_DEDUP_ENABLED:
+            return None
+        run = self._by_key.get(normalize_message(message))
+        if run is None or run.cancel_reason:
+            return None
+        if run.done:
+            if time.monotonic() - run.finished > run.reusable_for:
+                return None
+            self._metrics["reused_answers"] += 1
+        else:
+            self._metrics["joined_in_flight"] += 1
+
+        if session_id:
+            if self._sessions.get(session_id) is not run:
+                self._supersede(session_id)
+            run.sessions.add(session_id)
+            self._sessions[session_id] = run
+        else:
+            run.anonymous += 1
+        return run
+
+    def start(
+        self, graph: CompiledStateGraph, message: str, session_id: Optional[str] = None
+    ) -> AgentRun:
+        """Start a run, cancelling the session's previous run if still going."""
+        self._supersede(session_id)
+
+        run = AgentRun(graph, message, session_id)
+        self._active.add(run)
+        run.task.add_done_callback(lambda _: self._finished(run))
+        if session_id:
+            self._sessions[session_id] = run
+        self._by_key[run.key] = run
+        self._metrics["started_runs"] += 1
+        return run
+
+    def join_or_start(
+        self, graph: CompiledStateGraph, message: str, session_id: Optional[str] = None
+    ) -> Tuple[AgentRun, bool]:
+        """Join a run for the same question, or start one if there is none.
+
+        Neither step awaits, so concurrent callers for one question can't both
+        start a run. Returns the run and whether this call started it.
+        """
+        run = self.join(message, session_id)
+        if run is not None:
+            return run, False
+        return self.start(graph, message, session_id), True
+
+    def _finished(self, run: AgentRun) -> None:
+        self._active.discard(run)
+        for session_id in run.sessions:
+            if self._sessions.get(session_id) is run:
+                del self._sessions[session_id]
+        # Forget answers that can't be reused any more
+        now = time.monotonic()
+        for key, other in list(self._by_key.items()):
+            if other.done and now - other.finished > other.reusable_for:
+                del self._by_key[key]
+        if run.cancel_reason:
+            return
+        if run.error is not None:
+            self._metrics["failed_runs"] += 1
+        else:
+            self._metrics["completed_runs"] += 1
+
+    def cancel(self, run: AgentRun, reason: str) -> None:
+        """Cancel a run and record the work that was abandoned."""
+        if run.done or run.cancel_reason:
+            return
+        run.cancel_reason = reason
+        run._publish({"type": "cancelled", "reason": reason})
+        run.task.cancel()
+
+        self._metrics["cancelled_runs"] += 1
+        self._metrics[f"cancelled_{reason}"] += 1
+        self._metrics["cancelled_tool_calls"] += len(run.tools_running)
+        self._metrics["cancelled_tokens"] += run.tokens
+        self._metrics["cancelled_seconds"] += time.perf_counter() - run.started
+        logger.info(
+            f"Cancelled agent run ({reason}) with {len(run.tools_running)} tool "
+            "calls in flight"
+        )
+
+    async def subscribe(
+        self,
+        run: AgentRun,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a run's events, cancelling the run if this was its last listener.
+
+        Args:
+            run: Run to follow
+            is_disconnected: Optional check polled while waiting for events, so
+                a client that went away is noticed even when nothing is sent
+
+        Raises the run's error, if it failed, after its events.
+        """
+        run.listeners += 1
+        index = 0
+        try:
+            while True:
+                changed = run.changed
+                if index < len(run.events):
+                    index += 1
+                    yield run.events[index - 1]
+                    continue
+                if run.done:
+                    break
+                try:
+                    await asyncio.wait_for(changed.wait(), DISCONNECT_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+        finally:
+            run.listeners -= 1
+            if not run.listeners:
+                self.cancel(run, "disconnected")
+
+        if run.error is not None:
+            raise run.error
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Run counts and the work abandoned by cancelled runs."""
+        return {
+            "active_runs": len(self._active),
+            **self._metrics,
+            "cancelled_seconds": round(self._metrics["cancelled_seconds"], 3),
+        }
+
+
+# Global instance
+run_manager = RunManager()
@@ -0,0 +1,156 @@
+"""Admission control and priority scheduling for agent runs"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Dict, List, Tuple
+
+from . import (
+    API_MAX_CONCURRENT,
+    API_MAX_QUEUE,
+    API_QUEUE_TIMEOUT,
+    API_URGENT_RESERVED,
+)
+
+# Lower rank runs first
+PRIORITIES = {"urgent": 0, "normal": 1, "analytics": 2}
+
+
+class SchedulerBusy(Exception):
+    """Raised when a request can't be admitted (queue full or wait timed out)."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RequestScheduler:
+    """Bounded concurrency with a priority queue in front of it.
+
+    At most max_concurrent runs execute at once. Extra requests wait in
+    priority order (urgent, then normal, then analytics) for up to
+    queue_timeout seconds, and are rejected outright once max_queue are
+    waiting. The last urgent_reserved slots are kept for urgent requests so a
+    burst of analytics questions can't starve pit calls.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = API_MAX_CONCURRENT,
+        max_queue: int = API_MAX_QUEUE,
+        queue_timeout: float = API_QUEUE_TIMEOUT,
+        urgent_reserved: int = API_URGENT_RESERVED,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.urgent_reserved = min(urgent_reserved, max_concurrent - 1)
+        self.running = 0
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._stats = {
+            priority: {"admitted": 0, "rejected": 0, "timed_out": 0, "wait_s": 0.0}
+            for priority in PRIORITIES
+        }
+        self._max_wait = 0.0
+
+    def _can_run(self, rank: int) -> bool:
+        limit = self.max_concurrent
+        if rank > PRIORITIES["urgent"]:
+            limit -= self.urgent_reserved
+        return self.running < limit
+
+    def _waiting(self) -> List[Tuple[int, int, asyncio.Future]]:
+        return [entry for entry in self._queue if not entry[2].done()]
+
+    def _admit(self, priority: str, queued_at: float) -> None:
+        wait = time.perf_counter() - queued_at
+        stats = self._stats[priority]
+        stats["admitted"] += 1
+        stats["wait_s"] += wait
+        self._max_wait = max(self._max_wait, wait)
+
+    async def acquire(self, priority: str = "normal") -> None:
+        """Wait for a run slot.
+
+        Raises SchedulerBusy if the queue is full or the wait times out.
+        """
+        rank = PRIORITIES[priority]
+        queued_at = time.perf_counter()
+        # Only queue behind waiters that could take this slot themselves; an
+        # analytics waiter held back by the urgent reserve mustn't block urgent
+        ahead = any(entry[0] <= rank for entry in self._waiting())
+        if self._can_run(rank) and not ahead:
+            self.running += 1
+            self._admit(priority, queued_at)
+            return
+
+        if len(self._queue) >= self.max_queue:
+            # Drop entries whose callers already gave up before refusing
+            self._queue = self._waiting()
+            heapq.heapify(self._queue)
+        if len(self._queue) >= self.max_queue:
+            self._stats[priority]["rejected"] += 1
+            raise SchedulerBusy("queue full", retry_after=self.queue_timeout)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (rank, next(self._order), future))
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._stats[priority]["timed_out"] += 1
+            raise SchedulerBusy("timed out waiting for a slot", retry_after=1.0)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted a slot just as the caller went away
+                self.release()
+            raise
+        self._admit(priority, queued_at)
+
+    def release(self) -> None:
+        """Free a run slot and hand it to the highest priority waiter."""
+        self.running -= 1
+        while self._queue:
+            rank, _, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            if not self._can_run(rank):
+                break
+            heapq.heappop(self._queue)
+            self.running += 1
+            future.set_result(None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Running count, queue depth per priority and admission stats."""
+        depth = {priority: 0 for priority in PRIORITIES}
+        ranks = {rank: priority for priority, rank in PRIORITIES.items()}
+        for rank, _, _ in self._waiting():
+            depth[ranks[rank]] += 1
+
+        priorities = {}
+        for priority, stats in self._stats.items():
+            admitted = stats["admitted"]
+            priorities[priority] = {
+                "admitted": admitted,
+                "rejected": stats["rejected"],
+                "timed_out": stats["timed_out"],
+                "queued": depth[priority],
+                "avg_wait_ms": round(stats["wait_s"] / admitted * 1000, 1)
+                if admitted
+                else 0.0,
+            }
+        return {
+            "running": self.running,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": sum(depth.values()),
+            "max_queue": self.max_queue,
+            "max_wait_ms": round(self._max_wait * 1000, 1),
+            "priorities": priorities,
+        }
+
+
+# Global instance
+scheduler = RequestScheduler()
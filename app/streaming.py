@@ -0,0 +1,195 @@
+"""Streaming helpers for the agent graphs"""
+
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph.state import CompiledStateGraph
+
+from . import SPEECH_MAX_CHARS, SPEECH_MIN_CHARS
+
+# Graph node whose LLM output is the answer; tokens from LLM calls made inside
+# tools (e.g. the RAG chain) are not forwarded
+ANSWER_NODE = "agent"
+
+# Terminal punctuation (plus closing quotes/brackets) followed by whitespace, or
+# a line break
+SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s|\n")
+CLAUSE_END = re.compile(r"[,;:\u2014]\s")
+# Periods that don't end a sentence: abbreviations and list numbers ("2. ")
+NOT_SENTENCE_END = re.compile(
+    r"\b(?:no|mr|mrs|dr|st|jr|sr|vs|approx|e\.g|i\.e)\.$|(?:^|\n)\s*\d+\.$",
+    re.IGNORECASE,
+)
+# Markdown that shouldn't be read aloud
+MARKDOWN = re.compile(r"[*_`#]+|^\s*[-+]\s+", re.MULTILINE)
+
+
+def _text(content: Any) -> str:
+    """Text of a message chunk, whether content is a string or content blocks."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+        )
+    return ""
+
+
+async def stream_agent_events(
+    graph: CompiledStateGraph, message: str
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run the agent graph and yield answer tokens and tool events as they happen.
+
+    Args:
+        graph: Compiled agent graph
+        message: User message
+
+    Yields dicts with a "type" of:
+        token: {"content"} - a piece of the answer text
+        tool_start: {"tool", "id"} - a tool call began
+        tool_end: {"tool", "id", "duration_ms", "error"} - a tool call finished
+        answer: {"content"} - the complete final answer, once the graph ends
+    """
+    tool_started: Dict[str, float] = {}
+
+    async for event in graph.astream_events(
+        {"messages": [HumanMessage(content=message)]}, version="v2"
+    ):
+        kind = event["event"]
+
+        if kind == "on_chat_model_stream":
+            if event["metadata"].get("langgraph_node") != ANSWER_NODE:
+                continue
+            content = _text(event["data"]["chunk"].content)
+            if content:
+                yield {"type": "token", "content": content}
+
+        elif kind == "on_tool_start":
+            tool_started[event["run_id"]] = time.perf_counter()
+            yield {"type": "tool_start", "tool": event["name"], "id": event["run_id"]}
+
+        elif kind in ("on_tool_end", "on_tool_error"):
+            started = tool_started.pop(event["run_id"], None)
+            duration = time.perf_counter() - started if started else 0.0
+            yield {
+                "type": "tool_end",
+                "tool": event["name"],
+                "id": event["run_id"],
+                "duration_ms": round(duration * 1000, 1),
+                "error": kind == "on_tool_error",
+            }
+
+        elif kind == "on_chain_end" and not event["parent_ids"]:
+            # The graph itself finished; its output is the final state
+            output = event["data"].get("output") or {}
+            messages = output.get("messages") if isinstance(output, dict) else None
+            if messages and isinstance(messages[-1], AIMessage):
+                yield {"type": "answer", "content": _text(messages[-1].content)}
+
+
+class SentenceChunker:
+    """Buffer streamed tokens into speakable sentence or clause chunks.
+
+    A chunk is released as soon as a sentence ends. Longer runs are split at
+    clause punctuation once they reach min_chars, and hard-split at the last
+    space before max_chars so a run-on answer still starts playing quickly.
+    """
+
+    def __init__(
+        self, min_chars: int = SPEECH_MIN_CHARS, max_chars: int = SPEECH_MAX_CHARS
+    ):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def _split_point(self) -> Optional[int]:
+        for match in SENTENCE_END.finditer(self._buffer):
+            if not NOT_SENTENCE_END.search(self._buffer[: match.end()].rstrip()):
+                return match.end()
+
+        if len(self._buffer) >= self.min_chars:
+            for match in CLAUSE_END.finditer(self._buffer, self.min_chars - 1):
+                return match.end()
+
+        if len(self._buffer) >= self.max_chars:
+            space = self._buffer.rfind(" ", 0, self.max_chars)
+            return space + 1 if space > 0 else self.max_chars
+        return None
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return any chunks that are now complete."""
+        self._buffer += text
+        chunks = []
+        while (cut := self._split_point()) is not None:
+            chunk, self._buffer = self._buffer[:cut], self._buffer[cut:]
+            chunk = _speakable(chunk)
+            if chunk:
+                chunks.append(chunk)
+        return chunks
+
+    def flush(self) -> List[str]:
+        """Return whatever is left once the answer is complete."""
+        chunk, self._buffer = _speakable(self._buffer), ""
+        return [chunk] if chunk else []
+
+
+def _speakable(text: str) -> str:
+    return " ".join(MARKDOWN.sub("", text).split())
+
+
+async def stream_speech_chunks(
+    events: AsyncIterator[Dict[str, Any]],
+    started: Optional[float] = None,
+    chunker: Optional[SentenceChunker] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Turn token events into speakable chunks for text-to-speech playback.
+
+    Args:
+        events: Events from stream_agent_events
+        started: time.perf_counter() when the request arrived (defaults to now)
+        chunker: Sentence chunker to use (defaults to configured sizes)
+
+    Yields tool events unchanged, a speech event {"text", "index", "t_ms"} per
+    chunk, and a final speech_done event with the chunk count, first-chunk
+    latency and total time in milliseconds.
+    """
+    started = started if started is not None else time.perf_counter()
+    chunker = chunker or SentenceChunker()
+    first_chunk_ms: Optional[float] = None
+    count = 0
+
+    def speech(text: str) -> Dict[str, Any]:
+        nonlocal first_chunk_ms, count
+        elapsed = round((time.perf_counter() - started) * 1000, 1)
+        if first_chunk_ms is None:
+            first_chunk_ms = elapsed
+        count += 1
+        return {"type": "speech", "text": text, "index": count - 1, "t_ms": elapsed}
+
+    streamed = False
+    async for event in events:
+        if event["type"] == "token":
+            streamed = True
+            for text in chunker.feed(event["content"]):
+                yield speech(text)
+            continue
+        if event["type"] == "answer":
+            texts = [] if streamed else chunker.feed(event["content"])
+            # The answer is complete, so release whatever is still buffered.
+            # If the model didn't stream tokens, this speaks the whole answer
+            for text in texts + chunker.flush():
+                yield speech(text)
+        yield event
+
+    for text in chunker.flush():
+        yield speech(text)
+
+    yield {
+        "type": "speech_done",
+        "chunks": count,
+        "first_chunk_ms": first_chunk_ms,
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
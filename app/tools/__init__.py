@@ -1,32 +1,139 @@
 """Tool registry"""
 
+import asyncio
 import logging
-from typing import List
+import threading
+from typing import Dict, List, Optional, Tuple
 
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
 from langchain_core.tools import BaseTool
 
-from .mcp_client import get_mcp_tools
+from ..models import get_chat_model
+from .mcp_client import get_mcp_client, get_mcp_tools
 from .rag_knowledge import get_knowledge_tools
 
 logger = logging.getLogger(__name__)
 
+# Process-wide registry: tools are discovered once and reused across requests
+_tools: Optional[List[BaseTool]] = None
+_tools_version = 0
+_mcp_version = -1
+_tools_lock = threading.Lock()
 
-def get_tools() -> List[BaseTool]:
-    """Get all available tools"""
-    tools = []
+# Chat models bound to the current tool set, keyed by (model name, tool version)
+_bound_models: Dict[
+    Tuple[Optional[str], int], Runnable[LanguageModelInput, BaseMessage]
+] = {}
 
-    # Get RAG knowledge tools
-    tools.extend(get_knowledge_tools())
 
-    # Get MCP server tools (NASCAR simulator tools)
-    try:
-        mcp_tools = get_mcp_tools()
-        if mcp_tools:
+def get_tools(refresh: bool = False) -> List[BaseTool]:
+    """Get all available tools
+
+    Args:
+        refresh: Re-discover MCP server tools instead of using the cached list
+
+    Returns:
+        Knowledge tools followed by MCP server tools
+    """
+    global _tools, _tools_version, _mcp_version
+
+    if _tools is not None and not refresh and _mcp_version > 0:
+        return _tools
+
+    with _tools_lock:
+        # Get MCP server tools (NASCAR simulator tools)
+        mcp_tools: List[BaseTool] = []
+        try:
+            mcp_tools = get_mcp_tools(refresh=refresh)
+            if not mcp_tools:
+                logger.warning(
+                    "No tools loaded from MCP server - server may be offline"
+                )
+        except Exception as e:
+            logger.error(f"Failed to load MCP tools: {e}")
+
+        mcp_version = get_mcp_client().version
+        if _tools is None or mcp_version != _mcp_version:
+            # Get RAG knowledge tools
+            tools = list(get_knowledge_tools())
             tools.extend(mcp_tools)
-            logger.info(f"Loaded {len(mcp_tools)} tools from MCP server")
-        else:
-            logger.warning("No tools loaded from MCP server - server may be offline")
-    except Exception as e:
-        logger.error(f"Failed to load MCP tools: {e}")
+            if mcp_tools:
+                logger.info(f"Loaded {len(mcp_tools)} tools from MCP server")
+            _tools = tools
+            _mcp_version = mcp_version
+            _tools_version += 1
+
+        return _tools
+
+
+async def aget_tools() -> List[BaseTool]:
+    """Get all available tools without blocking the event loop.
+
+    Returns the cached tool list directly; discovery runs in a worker thread.
+    """
+    if _tools is not None and _mcp_version > 0:
+        return _tools
+    return await asyncio.to_thread(get_tools)
+
+
+def get_tools_version() -> int:
+    """Version of the tool set, bumped whenever the tool list changes."""
+    return _tools_version
+
+
+def refresh_tools() -> List[BaseTool]:
+    """Re-list MCP server tools over the shared session."""
+    return get_tools(refresh=True)
+
+
+def get_model_with_tools(
+    model_name: Optional[str] = None,
+) -> Runnable[LanguageModelInput, BaseMessage]:
+    """Get a chat model bound to all available tools.
+
+    The bound model is built once per tool set version and reused, so graph
+    nodes don't re-serialize every tool schema on each step.
+
+    Args:
+        model_name: Model name to use (defaults to OPENAI_MODEL env var)
+
+    Returns:
+        Chat model with the current tools bound
+    """
+    get_tools()
+    model = _bound_models.get((model_name, _tools_version))
+    if model is None:
+        with _tools_lock:
+            # The tool list and its version only change together under the lock
+            key = (model_name, _tools_version)
+            if key not in _bound_models:
+                # Drop models bound to an older tool set
+                for stale in [k for k in _bound_models if k[1] != key[1]]:
+                    del _bound_models[stale]
+                model = get_chat_model(model_name=model_name)
+                _bound_models[key] = model.bind_tools(_tools)
+            model = _bound_models[key]
+    return model
+
+
+async def aget_model_with_tools(
+    model_name: Optional[str] = None,
+) -> Runnable[LanguageModelInput, BaseMessage]:
+    """Get a chat model bound to all available tools without blocking the loop.
+
+    A model already bound to the current tool set is returned directly; tool
+    discovery and binding run in a worker thread.
+
+    Args:
+        model_name: Model name to use (defaults to OPENAI_MODEL env var)
 
-    return tools
+    Returns:
+        Chat model with the current tools bound
+    """
+    if _tools is not None and _mcp_version > 0:
+        model = _bound_models.get((model_name, _tools_version))
+        if model is not None:
+            return model
+    return await asyncio.to_thread(get_model_with_tools, model_name)
@@ -0,0 +1,109 @@
+"""Persistent embedding cache for knowledge base chunks"""
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain_core.embeddings import Embeddings
+from langchain_core.stores import ByteStore
+
+from .. import EMBEDDING_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteByteStore(ByteStore):
+    """Key-value byte store in a single SQLite file.
+
+    Safe to share between threads; writes from several processes are
+    serialized by SQLite itself.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0}
+
+    def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        found: Dict[str, bytes] = {}
+        with self._lock:
+            # Stay well under SQLite's bound parameter limit
+            for start in range(0, len(keys), 500):
+                batch = list(keys[start : start + 500])
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM kv WHERE key IN ({placeholders})", batch
+                )
+                found.update(rows)
+            self._stats["hits"] += sum(1 for key in keys if key in found)
+            self._stats["misses"] += sum(1 for key in keys if key not in found)
+        return [found.get(key) for key in keys]
+
+    def mset(self, key_value_pairs: Sequence[Tuple[str, bytes]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)", key_value_pairs
+            )
+            self._conn.commit()
+            self._stats["writes"] += len(key_value_pairs)
+
+    def mdelete(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            self._conn.executemany("DELETE FROM kv WHERE key = ?", [(k,) for k in keys])
+            self._conn.commit()
+
+    def yield_keys(self, prefix: Optional[str] = None) -> Iterator[str]:
+        with self._lock:
+            if prefix is None:
+                rows = self._conn.execute("SELECT key FROM kv").fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT key FROM kv WHERE substr(key, 1, ?) = ?",
+                    (len(prefix), prefix),
+                ).fetchall()
+        for (key,) in rows:
+            yield key
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lookup and write counters since this store was opened."""
+        with self._lock:
+            return {**self._stats, "path": self.path}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def cached_embeddings(
+    embeddings: Embeddings, namespace: str, path: str = EMBEDDING_CACHE_PATH
+) -> Embeddings:
+    """Wrap document embeddings in a content-hash keyed on-disk cache.
+
+    Chunks are keyed by the SHA-256 of namespace + text, so only new or edited
+    chunks reach the embeddings API; namespace should name the embedding model.
+    Query embeddings are not cached. An empty path disables the cache.
+
+    Returns the wrapped embeddings, or the original ones if the cache can't
+    be opened.
+    """
+    if not path:
+        return embeddings
+    try:
+        store = SQLiteByteStore(path)
+    except sqlite3.Error as e:
+        logger.warning(f"Embedding cache unavailable at {path}: {e}")
+        return embeddings
+    return CacheBackedEmbeddings.from_bytes_store(
+        embeddings, store, namespace=namespace, key_encoder="sha256"
+    )
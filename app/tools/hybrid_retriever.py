@@ -0,0 +1,259 @@
+"""Local BM25 retrieval fused with dense retrieval for the knowledge base"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+# Retrieval modes:
+#   dense   embeddings only (one embedding call per query)
+#   hybrid  BM25 and dense results fused with reciprocal rank fusion
+#   bm25    BM25 only, never embeds the query
+#   auto    BM25 only for exact-term queries, hybrid for everything else
+RETRIEVAL_MODES = ("dense", "hybrid", "bm25", "auto")
+
+TOKEN = re.compile(r"[^\W_]+(?:\.[0-9]+)?")
+HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*$", re.MULTILINE)
+CAR_NUMBER = re.compile(r"(?:\bno\.?\s*|#|\bnumber\s+)(\d{1,3})\b")
+STOPWORDS = frozenset(
+    "a an and are as at be by do does for from how in is it its of on or the "
+    "this to was what when where which who why with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word and number tokens, without stopwords.
+
+    Car numbers are spelled the way the knowledge base does ("#99" and
+    "number 99" both become "no 99").
+    """
+    text = CAR_NUMBER.sub(r"no \1", text.lower())
+    return [token for token in TOKEN.findall(text) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents, using an inverted index."""
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.lengths: List[int] = []
+        # term -> [(document index, term frequency)]
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for i, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            self.lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings[term].append((i, tf))
+        self.avg_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0
+        n = len(self.lengths)
+        self.idf = {
+            term: math.log(1 + (n - len(posts) + 0.5) / (len(posts) + 0.5))
+            for term, posts in self.postings.items()
+        }
+
+    def search(
+        self, query: str, k: int, allowed: Optional[Set[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """Top k (document index, score) pairs for a query, best first.
+
+        Args:
+            query: Search text
+            k: Maximum number of results
+            allowed: Only score these document indices (e.g. one source file)
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for i, tf in self.postings[term]:
+                if allowed is not None and i not in allowed:
+                    continue
+                norm = self.k1 * (
+                    1 - self.b + self.b * self.lengths[i] / self.avg_length
+                )
+                scores[i] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[int]], k: int = 60
+) -> List[Tuple[int, float]]:
+    """Merge ranked id lists; each id scores sum(1 / (k + rank)) over lists."""
+    scores: Dict[int, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] += 1 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def heading_path(source: str, position: int) -> List[str]:
+    """Markdown headings enclosing a position in a source text, outermost first."""
+    path: Dict[int, str] = {}
+    for match in HEADING.finditer(source):
+        # A heading starting exactly at the position is the chunk's own
+        if match.start() > position:
+            break
+        level = len(match.group(1))
+        path = {lvl: title for lvl, title in path.items() if lvl < level}
+        path[level] = match.group(2)
+    return [path[level] for level in sorted(path)]
+
+
+def heading_terms(texts: Sequence[str]) -> Set[str]:
+    """Distinctive markdown heading phrases, e.g. flag, track and driver names.
+
+    Headings are split at " - ", parentheses and commas; phrases used as a
+    heading more than once (like "Special Programs") are too generic to be
+    treated as exact terms.
+    """
+    counts: Counter = Counter()
+    for text in texts:
+        for _, heading in HEADING.findall(text):
+            for part in re.split(r"\s+-\s+|[(),]", heading):
+                phrase = " ".join(tokenize(part))
+                if phrase:
+                    counts[phrase] += 1
+    return {phrase for phrase, count in counts.items() if count == 1}
+
+
+class HybridRetriever(BaseRetriever):
+    """Knowledge retriever combining local BM25 with dense vector search.
+
+    Exact-term queries (a heading phrase such as a flag, track, glossary term
+    or driver name, or a car number) are answered from BM25 alone in auto
+    mode, which needs no embedding call. Other queries fuse BM25 and dense
+    rankings with reciprocal rank fusion.
+
+    The number of chunks adapts to the scores: dense hits below min_score
+    are dropped, and each ranking stops at the first hit scoring under
+    relative_cutoff times its best hit, so a clear match isn't padded with
+    k - 1 weak ones.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    documents: List[Document]
+    bm25: BM25Index
+    # (query vector, k, source or None, min score) -> [(index, score)], best first
+    dense_search: Callable[
+        [List[float], int, Optional[str], float], List[Tuple[int, float]]
+    ]
+    embed_query: Callable[[str], List[float]]
+    exact_terms: Set[str]
+    # source file -> indices of its chunks
+    source_indices: Dict[str, Set[int]]
+    mode: str = "auto"
+    k: int = 5
+    fetch_k: int = 20
+    min_score: float = 0.0
+    relative_cutoff: float = 0.0
+
+    @classmethod
+    def from_documents(
+        cls,
+        documents: List[Document],
+        sources: Mapping[str, str],
+        dense_search: Callable[
+            [List[float], int, Optional[str], float], List[Tuple[int, float]]
+        ],
+        embed_query: Callable[[str], List[float]],
+        **kwargs,
+    ) -> "HybridRetriever":
+        """Index chunks for BM25.
+
+        Args:
+            documents: Chunks, in the same order as the dense index
+            sources: Raw text of each knowledge file, keyed by the chunks'
+                "source" metadata. Chunks are indexed together with the
+                headings they sit under, so a chunk deep in the Daytona
+                section still matches "Daytona"; the headings also supply
+                the exact terms. Each chunk's metadata gains a "section"
+                entry naming those headings, below the file title.
+            dense_search: Vector search returning scored chunk indices
+            embed_query: Query embedding function for dense search
+        """
+        texts = []
+        source_indices: Dict[str, Set[int]] = defaultdict(set)
+        for i, doc in enumerate(documents):
+            source_indices[doc.metadata.get("source")].add(i)
+            source = sources.get(doc.metadata.get("source"), "")
+            position = source.find(doc.page_content)
+            headings = heading_path(source, position) if position >= 0 else []
+            doc.metadata["section"] = " > ".join(headings[1:])
+            texts.append("\n".join([*headings, doc.page_content]))
+        return cls(
+            documents=documents,
+            bm25=BM25Index(texts),
+            dense_search=dense_search,
+            embed_query=embed_query,
+            exact_terms=heading_terms(list(sources.values())),
+            source_indices=dict(source_indices),
+            **kwargs,
+        )
+
+    def is_exact_term_query(self, query: str) -> bool:
+        """True if the query names a heading phrase or a car number."""
+        if CAR_NUMBER.search(query.lower()):
+            return True
+        padded = f" {' '.join(tokenize(query))} "
+        return any(f" {term} " in padded for term in self.exact_terms)
+
+    def route(self, query: str) -> str:
+        """Which retrieval the query will use: dense, hybrid or bm25."""
+        if self.mode == "auto":
+            return "bm25" if self.is_exact_term_query(query) else "hybrid"
+        return self.mode
+
+    def retrieve(
+        self,
+        query: str,
+        vector: Optional[List[float]] = None,
+        source: Optional[str] = None,
+        k: Optional[int] = None,
+    ) -> List[Document]:
+        """Retrieve up to k documents.
+
+        Args:
+            query: Search text
+            vector: Query embedding, if already computed
+            source: Only search chunks from this knowledge file
+            k: Maximum number of chunks (defaults to the retriever's k)
+        """
+        k = k or self.k
+        allowed = self.source_indices.get(source, set()) if source else None
+        route = self.route(query)
+        if route == "bm25":
+            lexical = self._cut(self.bm25.search(query, k, allowed))
+            return [self.documents[i] for i in lexical]
+
+        if vector is None:
+            vector = self.embed_query(query)
+        if route == "dense":
+            dense = self._cut(self.dense_search(vector, k, source, self.min_score))
+            return [self.documents[i] for i in dense]
+
+        dense = self._cut(
+            self.dense_search(vector, self.fetch_k, source, self.min_score)
+        )
+        lexical = self._cut(self.bm25.search(query, self.fetch_k, allowed))
+        fused = reciprocal_rank_fusion([dense, lexical])
+        return [self.documents[i] for i, _ in fused[:k]]
+
+    def _cut(self, scored: List[Tuple[int, float]]) -> List[int]:
+        """Indices of best-first hits down to relative_cutoff x the best score."""
+        if not scored:
+            return []
+        floor = scored[0][1] * self.relative_cutoff
+        return [i for i, score in scored if score >= floor]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self.retrieve(query)
@@ -0,0 +1,220 @@
+"""Prebuilt knowledge index: chunks, metadata and vectors on disk
+
+The index is a directory with three files:
+
+    manifest.json   format version, build settings and knowledge file hashes
+    chunks.json     chunk text and metadata, in vector order
+    vectors.npy     float32 array of chunk embeddings, memory-mapped on load
+
+Build it ahead of deploys with `make build-index`. At
+startup the RAG loads it without any embedding calls, and rebuilds it only
+when a knowledge file or a build setting changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from langchain_community.document_loaders import TextLoader
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from .. import KNOWLEDGE_INDEX_PATH
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the index files changes
+INDEX_FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+CHUNKS_FILE = "chunks.json"
+VECTORS_FILE = "vectors.npy"
+
+
+class KnowledgeIndex(NamedTuple):
+    """A loaded index; vectors are memory-mapped when read from disk."""
+
+    manifest: Dict[str, Any]
+    documents: List[Document]
+    vectors: np.ndarray
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def index_settings(
+    knowledge_files: List[str],
+    chunk_size: int,
+    chunk_overlap: int,
+    embedding_model: str,
+) -> Dict[str, Any]:
+    """Everything an index depends on, as recorded in its manifest."""
+    return {
+        "format_version": INDEX_FORMAT_VERSION,
+        "embedding_model": embedding_model,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "files": {
+            os.path.basename(path): file_sha256(path)
+            for path in knowledge_files
+            if os.path.exists(path)
+        },
+    }
+
+
+def load_chunks(
+    knowledge_files: List[str], chunk_size: int, chunk_overlap: int
+) -> List[Document]:
+    """Load the knowledge files and split them into tagged chunks."""
+    documents = []
+    for file_path in knowledge_files:
+        if os.path.exists(file_path):
+            docs = TextLoader(file_path).load()
+            # Add source metadata
+            for doc in docs:
+                doc.metadata["source"] = os.path.basename(file_path)
+            documents.extend(docs)
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+    chunks = splitter.split_documents(documents)
+    for i, chunk in enumerate(chunks):
+        chunk.metadata["chunk_id"] = f"chunk_{i}"
+    return chunks
+
+
+def build_index(
+    knowledge_files: List[str],
+    chunk_size: int,
+    chunk_overlap: int,
+    embeddings: Embeddings,
+    embedding_model: str,
+    path: str = KNOWLEDGE_INDEX_PATH,
+) -> Optional[KnowledgeIndex]:
+    """Chunk and embed the knowledge files, writing the index if path is set.
+
+    Returns None when there are no knowledge files to index.
+    """
+    settings = index_settings(
+        knowledge_files, chunk_size, chunk_overlap, embedding_model
+    )
+    chunks = load_chunks(knowledge_files, chunk_size, chunk_overlap)
+    if not chunks:
+        return None
+
+    vectors = np.asarray(
+        embeddings.embed_documents([chunk.page_content for chunk in chunks]),
+        dtype=np.float32,
+    )
+    manifest = {
+        **settings,
+        "version": _version(settings),
+        "built_at": time.time(),
+        "count": len(chunks),
+        "dimension": int(vectors.shape[1]),
+    }
+    index = KnowledgeIndex(manifest, chunks, vectors)
+    if path:
+        _write(index, path)
+    return index
+
+
+def load_index(path: str, settings: Dict[str, Any]) -> Optional[KnowledgeIndex]:
+    """Load an index from disk if it was built from the same files and settings.
+
+    Returns None when the index is missing, unreadable or stale.
+    """
+    try:
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != _version(settings):
+        return None
+
+    try:
+        with open(os.path.join(path, CHUNKS_FILE)) as f:
+            chunks = json.load(f)
+        vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+    except (OSError, ValueError) as e:
+        logger.warning(f"Knowledge index at {path} is unreadable: {e}")
+        return None
+    if len(chunks) != manifest["count"] or vectors.shape != (
+        manifest["count"],
+        manifest["dimension"],
+    ):
+        logger.warning(f"Knowledge index at {path} is incomplete")
+        return None
+
+    documents = [
+        Document(page_content=chunk["page_content"], metadata=chunk["metadata"])
+        for chunk in chunks
+    ]
+    return KnowledgeIndex(manifest, documents, vectors)
+
+
+def load_or_build_index(
+    knowledge_files: List[str],
+    chunk_size: int,
+    chunk_overlap: int,
+    embeddings: Embeddings,
+    embedding_model: str,
+    path: str = KNOWLEDGE_INDEX_PATH,
+) -> Optional[KnowledgeIndex]:
+    """Load the prebuilt index, rebuilding it first if it is stale or missing."""
+    if path:
+        settings = index_settings(
+            knowledge_files, chunk_size, chunk_overlap, embedding_model
+        )
+        index = load_index(path, settings)
+        if index is not None:
+            return index
+        logger.info(f"Knowledge index at {path} is stale or missing, rebuilding")
+    return build_index(
+        knowledge_files, chunk_size, chunk_overlap, embeddings, embedding_model, path
+    )
+
+
+def _version(settings: Dict[str, Any]) -> str:
+    encoded = json.dumps(settings, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _write(index: KnowledgeIndex, path: str) -> None:
+    """Write index files, replacing the manifest last so readers never see a
+    manifest that points at half-written chunks or vectors."""
+    os.makedirs(path, exist_ok=True)
+    chunks = [
+        {"page_content": doc.page_content, "metadata": doc.metadata}
+        for doc in index.documents
+    ]
+    # Invalidate the old manifest before touching the data files
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    tmp = os.path.join(path, CHUNKS_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(chunks, f)
+    os.replace(tmp, os.path.join(path, CHUNKS_FILE))
+
+    tmp = os.path.join(path, "vectors.tmp.npy")
+    np.save(tmp, index.vectors)
+    os.replace(tmp, os.path.join(path, VECTORS_FILE))
+
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(index.manifest, f, indent=2)
+    os.replace(tmp, manifest_path)
@@ -1,19 +1,181 @@
 """MCP Client integration for discovering and using MCP server tools."""
 
 import asyncio
+import atexit
+import contextvars
 import logging
 import os
+import threading
+import time
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Coroutine, Dict, List, Optional, Set, Tuple
 
-from langchain_core.tools import BaseTool
+import anyio
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
+
+from .. import (
+    MCP_CONNECT_TIMEOUT,
+    MCP_HEALTH_INTERVAL,
+    MCP_HOST,
+    MCP_POOL_SIZE,
+    MCP_PORT,
+    MCP_RETRY_INTERVAL,
+    MCP_TRANSPORT,
+    MCP_WORKER_MAX_AGE,
+    MCP_WORKER_MAX_CALLS,
+)
 
 logger = logging.getLogger(__name__)
 
+SERVER_NAME = "trackhouse"
+
+# Raised when a session's transport is already closed. The request was never
+# written to the server, so retrying it on a fresh session can't run it twice.
+TRANSPORT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError)
+
+
+class MCPWorker:
+    """One MCP session: a stdio server process or an HTTP connection.
+
+    The session runs inside its own task so the transport's task group is
+    entered and exited by the same task, which lets a worker be stopped and
+    restarted cleanly from anywhere on the client's event loop.
+    """
+
+    def __init__(self, index: int, client: MultiServerMCPClient):
+        self.index = index
+        self.session = None
+        self.tools: Dict[str, BaseTool] = {}
+        self.ready = False
+        self.draining = False
+        self.in_flight = 0
+        self.calls = 0
+        self.cancelled = 0
+        self.generation = 0
+        self.started_at = 0.0
+        self._client = client
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._lock = asyncio.Lock()
+
+    async def _run(self, started: asyncio.Future) -> None:
+        try:
+            async with self._client.session(SERVER_NAME) as session:
+                tools = await load_mcp_tools(session)
+                self.session = session
+                self.tools = {tool.name: tool for tool in tools}
+                if not started.done():
+                    started.set_result(None)
+                await self._stopping.wait()
+        except asyncio.CancelledError:
+            if not started.done():
+                started.cancel()
+            raise
+        except Exception as e:
+            if not started.done():
+                started.set_exception(e)
+            else:
+                logger.debug(f"MCP worker {self.index} exited: {e!r}")
+        finally:
+            self.session = None
+            self.ready = False
+
+    async def start(self) -> None:
+        """Open the session and list its tools (spawns the server for stdio)."""
+        started = asyncio.get_running_loop().create_future()
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run(started))
+        try:
+            await asyncio.wait_for(started, MCP_CONNECT_TIMEOUT)
+        except BaseException:
+            self._task.cancel()
+            raise
+        self.calls = 0
+        self.draining = False
+        self.started_at = time.monotonic()
+        self.generation += 1
+        self.ready = True
+
+    async def stop(self) -> None:
+        """Close the session, waiting briefly for the transport to shut down."""
+        self.ready = False
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        self._stopping.set()
+        _, pending = await asyncio.wait({task}, timeout=5)
+        if pending:
+            task.cancel()
+
+    async def restart(self, generation: int) -> bool:
+        """Replace the session unless another caller already replaced it.
+
+        Args:
+            generation: Session generation the caller saw before deciding to
+                restart
+
+        Returns True if this call restarted the worker
+        """
+        async with self._lock:
+            if self.ready and self.generation != generation:
+                return False
+            await self.stop()
+            await self.start()
+            return True
+
+    async def ping(self) -> bool:
+        """Check that the server still answers on this session."""
+        if not self.ready or self.session is None:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), MCP_CONNECT_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def call(self, name: str, arguments: Dict[str, Any]) -> Any:
+        self.in_flight += 1
+        self.calls += 1
+        try:
+            return await self.tools[name].ainvoke(arguments)
+        except asyncio.CancelledError:
+            # Only abandoned locally: the SDK has no public way to tell the
+            # server which request to cancel, so the tool runs to completion
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "worker": self.index,
+            "ready": self.ready,
+            "draining": self.draining,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "cancelled": self.cancelled,
+            "age_s": round(time.monotonic() - self.started_at, 1)
+            if self.ready
+            else None,
+        }
+
 
 class MCPToolsClient:
-    """Client for discovering and using MCP server tools."""
+    """Client for discovering and using MCP server tools.
+
+    Keeps a warm pool of MCP sessions open for the life of the process: several
+    pre-started server subprocesses for stdio, one connection for HTTP. The
+    sessions live on a dedicated background event loop, and the LangChain tools
+    handed out are thin proxies that dispatch each call to the least busy
+    session, so they can be awaited from any event loop or thread.
+
+    Sessions are pinged every health interval and restarted if they stop
+    answering, and recycled once they reach the configured call count or age.
+    Tools are discovered once and re-listed only on refresh.
+    """
 
     def __init__(
         self,
@@ -21,6 +183,10 @@ class MCPToolsClient:
         server_path: Optional[str] = None,
         host: str = "127.0.0.1",
         port: int = 8000,
+        pool_size: Optional[int] = None,
+        max_calls: int = MCP_WORKER_MAX_CALLS,
+        max_age: float = MCP_WORKER_MAX_AGE,
+        health_interval: float = MCP_HEALTH_INTERVAL,
     ):
         """Initialize MCP client.
 
@@ -29,6 +195,11 @@ class MCPToolsClient:
             server_path: Path to MCP server script (for stdio)
             host: Host for HTTP transport
             port: Port for HTTP transport
+            pool_size: Number of server processes for stdio (HTTP always uses one
+                connection)
+            max_calls: Recycle a worker after this many calls (0 disables)
+            max_age: Recycle a worker after this many seconds (0 disables)
+            health_interval: Seconds between worker health checks
         """
         self.transport = transport
         self.server_path = server_path or str(
@@ -36,24 +207,46 @@ class MCPToolsClient:
         )
         self.host = host
         self.port = port
-        self._client = None
-        self._tools = []
+        if transport == "stdio":
+            self.pool_size = max(1, pool_size or MCP_POOL_SIZE)
+        else:
+            self.pool_size = 1
+        self.max_calls = max_calls
+        self.max_age = max_age
+        self.health_interval = health_interval
+        self.version = 0
+        self._tools: List[BaseTool] = []
+        self._workers: List[MCPWorker] = []
+        self._monitor: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._retry_at = 0.0
+        self._stats = {
+            "reconnects": 0,
+            "recycles": 0,
+            "health_restarts": 0,
+            "tool_calls": 0,
+        }
 
-    async def _initialize_client(self) -> MultiServerMCPClient:
+    def _initialize_client(self) -> MultiServerMCPClient:
         """Initialize the MCP client based on transport type."""
         if self.transport == "stdio":
             # Configure for stdio transport
             config = {
-                "trackhouse": {
+                SERVER_NAME: {
                     "command": "python",
                     "args": [self.server_path],
                     "transport": "stdio",
+                    # Pass our settings through (stdio only forwards PATH/HOME)
+                    "env": dict(os.environ),
                 }
             }
         else:  # http
             # Configure for HTTP transport
             config = {
-                "trackhouse": {
+                SERVER_NAME: {
                     "url": f"http://{self.host}:{self.port}",
                     "transport": "sse",  # MCP adapters use SSE for HTTP
                 }
@@ -61,42 +254,265 @@ class MCPToolsClient:
 
         return MultiServerMCPClient(config)
 
-    async def get_tools_async(self) -> List[BaseTool]:
-        """Get tools from MCP server asynchronously."""
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop that owns the MCP sessions."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="mcp-session", daemon=True
+            )
+            self._thread.start()
+        return self._loop
+
+    def _submit(self, coro: Coroutine) -> Future:
+        # Schedule from an empty context so the caller's LangChain run config
+        # (callbacks, event streams) doesn't leak onto the background loop
+        return contextvars.Context().run(
+            asyncio.run_coroutine_threadsafe, coro, self._ensure_loop()
+        )
+
+    def _spawn(self, coro: Coroutine) -> None:
+        """Run a housekeeping coroutine on the client loop without awaiting it."""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _ensure_pool(self) -> None:
+        """Start any workers that aren't running yet, in parallel."""
+        if not self._workers:
+            client = self._initialize_client()
+            self._workers = [MCPWorker(i, client) for i in range(self.pool_size)]
+
+        stopped = [worker for worker in self._workers if not worker.ready]
+        results = await asyncio.gather(
+            *(worker.restart(worker.generation) for worker in stopped),
+            return_exceptions=True,
+        )
+        if not any(worker.ready for worker in self._workers):
+            errors = [r for r in results if isinstance(r, BaseException)]
+            raise errors[0] if errors else ConnectionError("No MCP workers started")
+
+        if self._monitor is None or self._monitor.done():
+            self._monitor = asyncio.create_task(self._monitor_workers())
+
+    async def _discover(self, refresh: bool) -> List[BaseTool]:
+        """Start the pool if needed and return the server's tool definitions."""
+        await self._ensure_pool()
+        if refresh:
+            for worker in self._workers:
+                if not worker.ready:
+                    continue
+                try:
+                    tools = await load_mcp_tools(worker.session)
+                    worker.tools = {tool.name: tool for tool in tools}
+                except Exception as e:
+                    # A refresh is also how callers recover a dead session
+                    logger.warning(f"MCP worker {worker.index} lost: {e!r}")
+                    await worker.restart(worker.generation)
+
+        worker = next(worker for worker in self._workers if worker.ready)
+        return list(worker.tools.values())
+
+    async def _pick(self) -> MCPWorker:
+        """Least busy ready worker, preferring ones that aren't draining."""
+        ready = [w for w in self._workers if w.ready]
+        if not ready:
+            await self._ensure_pool()
+            ready = [w for w in self._workers if w.ready]
+        candidates = [w for w in ready if not w.draining] or ready
+        return min(candidates, key=lambda w: (w.in_flight, w.calls))
+
+    def _due_for_recycle(self, worker: MCPWorker) -> bool:
+        if self.max_calls and worker.calls >= self.max_calls:
+            return True
+        age = time.monotonic() - worker.started_at
+        return bool(self.max_age) and age >= self.max_age
+
+    async def _recycle(self, worker: MCPWorker, generation: int) -> None:
+        try:
+            if await worker.restart(generation):
+                self._stats["recycles"] += 1
+        except Exception as e:
+            logger.error(f"Failed to recycle MCP worker {worker.index}: {e}")
+
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Run a tool on the least busy worker.
+
+        If the worker's transport is already closed (e.g. its server process
+        died), the request was never sent: the worker is restarted and the
+        call retried once. Any other failure may come after the server started
+        the tool, so it is raised rather than risk running the tool twice.
+        """
+        self._stats["tool_calls"] += 1
+        worker = await self._pick()
+        if name not in worker.tools:
+            raise ToolException(f"Tool {name} is not available on the MCP server")
+
+        generation = worker.generation
         try:
-            if not self._client:
-                self._client = await self._initialize_client()
+            return await worker.call(name, arguments)
+        except TRANSPORT_ERRORS as e:
+            logger.warning(
+                f"MCP call to {name} failed on worker {worker.index} ({e!r}); "
+                "restarting it"
+            )
+            if await worker.restart(generation):
+                self._stats["reconnects"] += 1
+            return await worker.call(name, arguments)
+        finally:
+            if worker.ready and self._due_for_recycle(worker):
+                # Stop routing to it and replace it once its calls finish
+                worker.draining = True
+            if worker.draining and not worker.in_flight:
+                self._spawn(self._recycle(worker, worker.generation))
+
+    async def _monitor_workers(self) -> None:
+        """Ping idle workers and restart any that died or failed to start."""
+        while True:
+            await asyncio.sleep(self.health_interval)
+            for worker in self._workers:
+                if worker.in_flight:
+                    continue
+                if worker.ready and not self._due_for_recycle(worker):
+                    if await worker.ping():
+                        continue
+                    logger.warning(f"MCP worker {worker.index} failed health check")
+                try:
+                    if await worker.restart(worker.generation):
+                        self._stats["health_restarts"] += 1
+                except Exception as e:
+                    logger.error(f"Failed to restart MCP worker {worker.index}: {e}")
+
+    async def _shutdown(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+        await asyncio.gather(*(worker.stop() for worker in self._workers))
+        self._workers = []
+
+    def _proxy(self, tool: BaseTool) -> BaseTool:
+        """Wrap a session-bound MCP tool so it can run from any event loop."""
+        name = tool.name
+
+        async def call_tool(**arguments: Any) -> Any:
+            return await asyncio.wrap_future(
+                self._submit(self._call_tool(name, arguments))
+            )
+
+        def call_tool_sync(**arguments: Any) -> Any:
+            return self._submit(self._call_tool(name, arguments)).result()
+
+        return StructuredTool(
+            name=name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            func=call_tool_sync,
+            coroutine=call_tool,
+            metadata=tool.metadata,
+        )
+
+    def get_tools(self, refresh: bool = False) -> List[BaseTool]:
+        """Get tools from the MCP server, discovering them on first use.
+
+        Args:
+            refresh: Re-list tools over the sessions (restarting dead ones)
+
+        Returns:
+            Cached list of MCP tools, or an empty list if the server is offline
+        """
+        if self._tools and not refresh:
+            return self._tools
+
+        with self._lock:
+            if self._tools and not refresh:
+                return self._tools
+            if not refresh and time.monotonic() < self._retry_at:
+                # Server was offline recently; don't spawn a new one every step
+                return []
 
-            # Get tools from the MCP server
-            self._tools = await self._client.get_tools()
+            try:
+                tools = self._submit(self._discover(refresh)).result(
+                    MCP_CONNECT_TIMEOUT
+                )
+            except Exception as e:
+                logger.error(f"Failed to connect to MCP server: {e}")
+                self._retry_at = time.monotonic() + MCP_RETRY_INTERVAL
+                # Return empty list if connection fails - graceful degradation
+                return []
+
+            self._tools = [self._proxy(tool) for tool in tools]
+            self.version += 1
+            self._retry_at = 0.0
             logger.info(f"Successfully loaded {len(self._tools)} tools from MCP server")
             return self._tools
 
-        except Exception as e:
-            logger.error(f"Failed to connect to MCP server: {e}")
-            # Return empty list if connection fails - graceful degradation
-            return []
+    async def get_tools_async(self, refresh: bool = False) -> List[BaseTool]:
+        """Get tools from MCP server without blocking the caller's event loop."""
+        return await asyncio.to_thread(self.get_tools, refresh)
 
-    def get_tools(self) -> List[BaseTool]:
-        """Get tools from MCP server (synchronous wrapper)."""
-        # Check if we're in an async context
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool, session and tool call counters."""
+        return {
+            "transport": self.transport,
+            "pool_size": self.pool_size,
+            "ready_workers": sum(worker.ready for worker in self._workers),
+            "connects": sum(worker.generation for worker in self._workers),
+            "cancelled_calls": sum(worker.cancelled for worker in self._workers),
+            "tools": len(self._tools),
+            "version": self.version,
+            **self._stats,
+            "workers": [worker.get_stats() for worker in self._workers],
+        }
+
+    def close(self) -> None:
+        """Stop every worker and the background loop."""
+        if self._loop is None:
+            return
         try:
-            asyncio.get_running_loop()
-            # We're in an async context, create a new thread
-            import concurrent.futures
+            self._submit(self._shutdown()).result(MCP_CONNECT_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Error closing MCP client: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = self._thread = None
+        self._tools = []
 
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, self.get_tools_async())
-                return future.result()
-        except RuntimeError:
-            # No async loop, we can run directly
-            return asyncio.run(self.get_tools_async())
+
+# Process-wide clients keyed by connection settings
+_clients: Dict[Tuple[str, str, int], MCPToolsClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_mcp_client(
+    transport: Optional[str] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+) -> MCPToolsClient:
+    """Get the shared MCP client for a connection, creating it on first use."""
+    key = (transport or MCP_TRANSPORT, host or MCP_HOST, port or MCP_PORT)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = MCPToolsClient(transport=key[0], host=key[1], port=key[2])
+        return _clients[key]
+
+
+def close_mcp_clients() -> None:
+    """Close every shared MCP session (stops stdio server subprocesses)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+atexit.register(close_mcp_clients)
 
 
 def get_mcp_tools(
     transport: Optional[str] = None,
     host: Optional[str] = None,
     port: Optional[int] = None,
+    refresh: bool = False,
 ) -> List[BaseTool]:
     """Convenience function to get MCP tools.
 
@@ -104,14 +520,9 @@ def get_mcp_tools(
         transport: Override transport from environment
         host: Override host from environment
         port: Override port from environment
+        refresh: Re-list tools from the server instead of using the cache
 
     Returns:
         List of MCP tools as LangChain tools
     """
-    # Get configuration from environment or use defaults
-    transport = transport or os.getenv("MCP_TRANSPORT", "stdio")
-    host = host or os.getenv("MCP_HOST", "127.0.0.1")
-    port = port or int(os.getenv("MCP_PORT", "8000"))
-
-    client = MCPToolsClient(transport=transport, host=host, port=port)
-    return client.get_tools()
+    return get_mcp_client(transport, host, port).get_tools(refresh=refresh)
@@ -1,33 +1,90 @@
 """Production RAG chain implementation for NASCAR knowledge"""
 
+import logging
 import os
-from typing import List
+import threading
+import time
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 
-from langchain_community.document_loaders import TextLoader
+from langchain_core.embeddings import Embeddings
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables.passthrough import RunnablePassthrough
 from langchain_core.tools import BaseTool, tool
 from langchain_openai import OpenAIEmbeddings
 from langchain_qdrant import QdrantVectorStore
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams
-
-from .. import KNOWLEDGE_BASE_PATH
+from qdrant_client.http.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    MatchValue,
+    PointStruct,
+    VectorParams,
+)
+
+from .. import (
+    KNOWLEDGE_BASE_PATH,
+    KNOWLEDGE_INDEX_PATH,
+    KNOWLEDGE_MIN_SCORE,
+    KNOWLEDGE_RELATIVE_CUTOFF,
+    KNOWLEDGE_RETRIEVAL_MODE,
+    KNOWLEDGE_SOURCE_K,
+    KNOWLEDGE_TOOL_MODE,
+    KNOWLEDGE_WARMUP,
+)
 from ..models import get_chat_model
+from .embedding_cache import cached_embeddings
+from .hybrid_retriever import HybridRetriever
+from .knowledge_index import KnowledgeIndex, build_index, load_or_build_index
+from .semantic_cache import SemanticAnswerCache, answer_cache, knowledge_fingerprint
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+CHUNK_SIZE = 400
+CHUNK_OVERLAP = 50
+
+TEAM_SOURCE = "trackhouse_team.txt"
+GLOSSARY_SOURCE = "nascar_glossary.txt"
+TRACKS_SOURCE = "nascar_tracks.txt"
+KNOWLEDGE_FILES = [TEAM_SOURCE, GLOSSARY_SOURCE, TRACKS_SOURCE]
+
+
+def _knowledge_file_paths() -> List[str]:
+    return [os.path.join(KNOWLEDGE_BASE_PATH, filename) for filename in KNOWLEDGE_FILES]
+
+
+def _make_embeddings() -> Embeddings:
+    return cached_embeddings(
+        OpenAIEmbeddings(model=EMBEDDING_MODEL), namespace=EMBEDDING_MODEL
+    )
 
 
 class NASCARKnowledgeRAG:
     """Production RAG chain with retrieval + generation"""
 
-    def __init__(self, llm_model: str = "gpt-4.1-mini"):
+    def __init__(
+        self,
+        llm_model: str = "gpt-4.1-mini",
+        cache: SemanticAnswerCache = answer_cache,
+        index_path: str = KNOWLEDGE_INDEX_PATH,
+        retrieval_mode: str = KNOWLEDGE_RETRIEVAL_MODE,
+        tool_mode: str = KNOWLEDGE_TOOL_MODE,
+    ):
         self.knowledge_path = KNOWLEDGE_BASE_PATH
+        self.knowledge_files = _knowledge_file_paths()
+        self.index_path = index_path
+        self.retrieval_mode = retrieval_mode
+        self.tool_mode = tool_mode
         self.llm_model = llm_model
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=400, chunk_overlap=50
-        )
-        self.vectorstore = None
+        self.cache = cache
+        self.embeddings = _make_embeddings()
+        self.index: Optional[KnowledgeIndex] = None
+        # Knowledge file state the loaded index was checked against
+        self.sources: Optional[Tuple] = None
+        self._reload_lock = threading.Lock()
+        self.client: Optional[QdrantClient] = None
         self.retriever = None
         self.chain = None
 
@@ -36,57 +93,114 @@ class NASCARKnowledgeRAG:
         self._setup_chain()
 
     def _setup_vectorstore(self):
-        """Load documents and create in-memory vector store."""
-        documents = []
-
-        # Load text files from knowledge directory
-        knowledge_files = [
-            "trackhouse_team.txt",
-            "nascar_glossary.txt",
-            "nascar_tracks.txt",
-        ]
-        for filename in knowledge_files:
-            file_path = os.path.join(self.knowledge_path, filename)
-            if os.path.exists(file_path):
-                loader = TextLoader(file_path)
-                docs = loader.load()
-                # Add source metadata
-                for doc in docs:
-                    doc.metadata["source"] = filename
-                documents.extend(docs)
-
-        if not documents:
+        """Load the prebuilt index and create in-memory vector store.
+
+        The index is checked against the knowledge files and rebuilt if they
+        changed. Everything is built before being swapped in, so queries
+        running during a reload keep using the previous index.
+        """
+        sources = knowledge_fingerprint(self.knowledge_files)
+        index = load_or_build_index(
+            self.knowledge_files,
+            CHUNK_SIZE,
+            CHUNK_OVERLAP,
+            self.embeddings,
+            EMBEDDING_MODEL,
+            self.index_path,
+        )
+        if index is None:
+            self.index, self.client, self.retriever = None, None, None
+            self.sources = sources
+            self.cache.observe_sources(sources)
             return
 
-        # Split documents into chunks
-        chunks = self.text_splitter.split_documents(documents)
-
-        # Add metadata to chunks
-        for i, chunk in enumerate(chunks):
-            chunk.metadata["chunk_id"] = f"chunk_{i}"
-
         # Create in-memory Qdrant client
         client = QdrantClient(":memory:")
         client.create_collection(
             collection_name="nascar_knowledge",
-            vectors_config=VectorParams(size=1536, distance=Distance.COSINE),
+            vectors_config=VectorParams(
+                size=index.manifest["dimension"], distance=Distance.COSINE
+            ),
         )
 
-        # Create vector store
-        self.vectorstore = QdrantVectorStore(
-            client=client,
+        # Add the prebuilt vectors; nothing is embedded here
+        client.upsert(
             collection_name="nascar_knowledge",
-            embedding=self.embeddings,
+            points=[
+                PointStruct(
+                    id=i,
+                    vector=vector.tolist(),
+                    payload={
+                        QdrantVectorStore.CONTENT_KEY: doc.page_content,
+                        QdrantVectorStore.METADATA_KEY: doc.metadata,
+                    },
+                )
+                for i, (doc, vector) in enumerate(zip(index.documents, index.vectors))
+            ],
         )
 
-        # Add documents
-        self.vectorstore.add_documents(chunks)
-
-        # Create retriever with similarity for precision
-        self.retriever = self.vectorstore.as_retriever(
-            search_type="similarity", search_kwargs={"k": 5}
+        # Local BM25 alongside the dense index; headings give the exact terms
+        texts = {}
+        for path in self.knowledge_files:
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    texts[os.path.basename(path)] = f.read()
+        retriever = HybridRetriever.from_documents(
+            index.documents,
+            texts,
+            dense_search=partial(self._dense_search, client),
+            embed_query=self.embeddings.embed_query,
+            mode=self.retrieval_mode,
+            k=5,
+            min_score=KNOWLEDGE_MIN_SCORE,
+            relative_cutoff=KNOWLEDGE_RELATIVE_CUTOFF,
         )
 
+        self.index, self.client, self.retriever = index, client, retriever
+        self.sources = sources
+        # Cached answers came from the old files; drop them with the old index
+        self.cache.observe_sources(sources)
+
+    def _reload_if_changed(self) -> None:
+        """Reload the index when the knowledge files changed since it loaded."""
+        if knowledge_fingerprint(self.knowledge_files) == self.sources:
+            return
+        with self._reload_lock:
+            if knowledge_fingerprint(self.knowledge_files) != self.sources:
+                logger.info("Knowledge files changed, reloading the knowledge index")
+                self._setup_vectorstore()
+
+    def _dense_search(
+        self,
+        client: QdrantClient,
+        vector: List[float],
+        k: int,
+        source: Optional[str],
+        min_score: float,
+    ) -> List[Tuple[int, float]]:
+        """(index, cosine score) of the k chunks nearest to a query vector.
+
+        Runs in Qdrant, filtering on the chunk's source file when one is given.
+        """
+        query_filter = None
+        if source:
+            query_filter = Filter(
+                must=[
+                    FieldCondition(
+                        key=f"{QdrantVectorStore.METADATA_KEY}.source",
+                        match=MatchValue(value=source),
+                    )
+                ]
+            )
+        hits = client.query_points(
+            collection_name="nascar_knowledge",
+            query=[float(x) for x in vector],
+            query_filter=query_filter,
+            score_threshold=min_score or None,
+            limit=k,
+        ).points
+        return [(hit.id, hit.score) for hit in hits]
+
     def _setup_chain(self):
         """Set up the RAG chain with retrieval + generation."""
         if not self.retriever:
@@ -119,7 +233,7 @@ Context:
         # Create chain with parallel execution
         self.chain = (
             {
-                "context": lambda x: self.retriever.invoke(x["question"]),
+                "context": self._retrieve,
                 "question": lambda x: x["question"],
             }
             | RunnablePassthrough.assign(
@@ -129,6 +243,15 @@ Context:
             | self.llm
         )
 
+    def _retrieve(self, inputs):
+        """Retrieve context, reusing the question embedding when there is one."""
+        return self.retriever.retrieve(
+            inputs["question"],
+            inputs.get("vector"),
+            source=inputs.get("source"),
+            k=inputs.get("k"),
+        )
+
     def _format_docs(self, docs):
         """Format retrieved documents for the prompt."""
         if not docs:
@@ -142,34 +265,200 @@ Context:
 
         return "\n\n".join(formatted)
 
-    def invoke(self, question: str) -> str:
-        """Invoke the RAG chain with a question."""
+    def invoke(
+        self, question: str, use_cache: bool = True, source: Optional[str] = None
+    ) -> str:
+        """Invoke the RAG chain with a question.
+
+        Near-duplicates of earlier questions are answered from the semantic
+        cache; pass use_cache=False to always run retrieval and generation.
+        Questions routed to BM25 only match exact repeats, so they never wait
+        on an embedding call.
+
+        Args:
+            question: Question to answer
+            use_cache: Allow answers from the semantic cache
+            source: Only retrieve from this knowledge file, with at most
+                KNOWLEDGE_SOURCE_K chunks
+        """
         if not self.chain:
             return "RAG chain not available."
 
         try:
-            response = self.chain.invoke({"question": question})
-            return response.content if hasattr(response, "content") else str(response)
+            self._reload_if_changed()
+            vector = None
+            cache = use_cache and self.cache.enabled
+            if cache:
+                embed = None
+                if self.retriever.route(question) != "bm25":
+                    embed = self.embeddings.embed_query
+                cached, vector = self.cache.lookup(question, embed, scope=source or "")
+                if cached is not None:
+                    return cached
+
+            response = self.chain.invoke(
+                {
+                    "question": question,
+                    "vector": vector,
+                    "source": source,
+                    "k": KNOWLEDGE_SOURCE_K if source else None,
+                }
+            )
+            answer = response.content if hasattr(response, "content") else str(response)
+            if cache:
+                usage = getattr(response, "usage_metadata", None) or {}
+                self.cache.store(
+                    question,
+                    vector,
+                    answer,
+                    usage.get("total_tokens", 0),
+                    scope=source or "",
+                )
+            return answer
         except Exception as e:
             return f"Error processing question: {str(e)}"
 
+    def retrieve_context(self, question: str, source: Optional[str] = None) -> str:
+        """Retrieve compact, cited chunks for the agent to answer from itself.
+
+        Skips the RAG generation step entirely; the agent model reads the
+        excerpts instead of a second model's summary of them.
+        """
+        try:
+            self._reload_if_changed()
+            if not self.retriever:
+                return "Knowledge base not available."
+            docs = self.retriever.retrieve(
+                question, source=source, k=KNOWLEDGE_SOURCE_K if source else None
+            )
+        except Exception as e:
+            return f"Error processing question: {str(e)}"
+        if not docs:
+            return "No relevant information found in the knowledge base."
+
+        excerpts = []
+        for i, doc in enumerate(docs, start=1):
+            citation = doc.metadata.get("source", "unknown")
+            if doc.metadata.get("section"):
+                citation += f" > {doc.metadata['section']}"
+            excerpts.append(f"[{i}] {citation}\n{_compact(doc.page_content)}")
+        return (
+            "Knowledge base excerpts. Answer only from these and cite them as "
+            "[n]; if they don't cover the question, say so.\n\n" + "\n\n".join(excerpts)
+        )
+
+    def answer(self, question: str, source: Optional[str] = None) -> str:
+        """Answer for a knowledge tool: a generated answer or cited excerpts.
+
+        Which one depends on tool_mode ("generate" or "retrieve").
+        """
+        if self.tool_mode == "retrieve":
+            return self.retrieve_context(question, source)
+        return self.invoke(question, source=source)
+
     def get_retriever(self):
         """Get the retriever for external use."""
         return self.retriever
 
 
-# Global instance
-_knowledge_rag = None
+def _compact(text: str) -> str:
+    """Chunk text without markdown headings, emphasis or blank lines."""
+    lines = []
+    for line in text.splitlines():
+        line = line.strip().replace("**", "")
+        if line and not line.startswith("#"):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def build_knowledge_index(
+    path: str = KNOWLEDGE_INDEX_PATH,
+) -> Optional[KnowledgeIndex]:
+    """Build the knowledge index artifact without setting up the RAG chain."""
+    return build_index(
+        _knowledge_file_paths(),
+        CHUNK_SIZE,
+        CHUNK_OVERLAP,
+        _make_embeddings(),
+        EMBEDDING_MODEL,
+        path,
+    )
+
+
+# Global instance, created once even when many tool calls arrive on a cold start
+_knowledge_rag: Optional[NASCARKnowledgeRAG] = None
+_knowledge_rag_lock = threading.Lock()
+_knowledge_status: Dict[str, Any] = {
+    "state": "cold",
+    "error": None,
+    "init_seconds": None,
+}
+_warmup_thread: Optional[threading.Thread] = None
+# Separate from the build lock so starting warmup never waits on a build
+_warmup_lock = threading.Lock()
 
 
 def get_knowledge_rag() -> NASCARKnowledgeRAG:
-    """Get or create the knowledge RAG instance."""
+    """Get or create the knowledge RAG instance.
+
+    Callers arriving while another thread builds it wait for that build
+    instead of starting their own.
+    """
     global _knowledge_rag
-    if _knowledge_rag is None:
-        _knowledge_rag = NASCARKnowledgeRAG()
+    if _knowledge_rag is not None:
+        return _knowledge_rag
+    with _knowledge_rag_lock:
+        if _knowledge_rag is None:
+            _knowledge_status.update(state="warming", error=None)
+            started = time.perf_counter()
+            try:
+                _knowledge_rag = NASCARKnowledgeRAG()
+            except Exception as e:
+                _knowledge_status.update(state="failed", error=str(e))
+                raise
+            _knowledge_status.update(
+                state="ready",
+                init_seconds=round(time.perf_counter() - started, 3),
+            )
     return _knowledge_rag
 
 
+def start_knowledge_warmup() -> Optional[threading.Thread]:
+    """Build the knowledge RAG in a background thread, if not already started.
+
+    Never blocks, so it is safe to call from an event loop. Returns the
+    warmup thread, or None if warmup is disabled or the RAG is already built.
+    """
+    global _warmup_thread
+    if not KNOWLEDGE_WARMUP or _knowledge_rag is not None:
+        return None
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(
+                target=_warm_up, name="knowledge-warmup", daemon=True
+            )
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def _warm_up() -> None:
+    try:
+        get_knowledge_rag()
+        logger.info(f"Knowledge RAG ready in {_knowledge_status['init_seconds']}s")
+    except Exception as e:
+        # Tool calls will retry the build and report the error themselves
+        logger.warning(f"Knowledge RAG warmup failed: {e}")
+
+
+def get_knowledge_status() -> Dict[str, Any]:
+    """Readiness of the knowledge RAG: cold, warming, ready or failed."""
+    status = {**_knowledge_status, "ready": _knowledge_rag is not None}
+    if _knowledge_rag is not None and _knowledge_rag.index is not None:
+        status["index_version"] = _knowledge_rag.index.manifest["version"]
+        status["chunks"] = _knowledge_rag.index.manifest["count"]
+    return status
+
+
 @tool
 def search_trackhouse_team_info(query: str) -> str:
     """Search for information about Trackhouse Racing team, drivers, and history.
@@ -178,7 +467,7 @@ def search_trackhouse_team_info(query: str) -> str:
         query: Question about Trackhouse Racing team, drivers, achievements, etc.
     """
     rag = get_knowledge_rag()
-    return rag.invoke(f"Tell me about Trackhouse Racing: {query}")
+    return rag.answer(query, source=TEAM_SOURCE)
 
 
 @tool
@@ -189,7 +478,7 @@ def search_nascar_terminology(query: str) -> str:
         query: Question about NASCAR terms, rules, procedures, flags, etc.
     """
     rag = get_knowledge_rag()
-    return rag.invoke(f"Explain this NASCAR concept: {query}")
+    return rag.answer(query, source=GLOSSARY_SOURCE)
 
 
 @tool
@@ -200,7 +489,7 @@ def search_track_information(query: str) -> str:
         query: Question about NASCAR tracks, racing characteristics, track history, etc.
     """
     rag = get_knowledge_rag()
-    return rag.invoke(f"Tell me about this NASCAR track: {query}")
+    return rag.answer(query, source=TRACKS_SOURCE)
 
 
 @tool
@@ -211,7 +500,7 @@ def search_nascar_knowledge(query: str) -> str:
         query: Any question about NASCAR, Trackhouse Racing, or racing concepts
     """
     rag = get_knowledge_rag()
-    return rag.invoke(query)
+    return rag.answer(query)
 
 
 def get_knowledge_tools() -> List[BaseTool]:
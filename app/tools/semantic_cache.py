@@ -0,0 +1,200 @@
+"""Semantic answer cache for knowledge-base questions"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .. import (
+    KNOWLEDGE_CACHE_ENABLED,
+    KNOWLEDGE_CACHE_MAX_ENTRIES,
+    KNOWLEDGE_CACHE_THRESHOLD,
+    KNOWLEDGE_CACHE_TTL,
+)
+
+NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+class CachedAnswer(NamedTuple):
+    """A previous answer and what it took to produce it."""
+
+    vector: Optional[np.ndarray]
+    numbers: frozenset
+    answer: str
+    tokens: int
+    expires_at: float
+
+
+def knowledge_fingerprint(paths: List[str]) -> Tuple:
+    """Cheap change marker for the knowledge files (name, size, mtime)."""
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append((path, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            fingerprint.append((path, None, None))
+    return tuple(fingerprint)
+
+
+class SemanticAnswerCache:
+    """LRU cache of RAG answers matched by question embedding similarity.
+
+    A question hits when it was asked before verbatim, or when a cached
+    question's embedding has cosine similarity of at least threshold and both
+    mention the same numbers, so "Who drives the No. 1?" never answers for the
+    No. 99. Questions only match within the same scope (e.g. the knowledge
+    file a tool searches). Entries expire after ttl seconds and are all
+    dropped when the knowledge files change.
+    """
+
+    def __init__(
+        self,
+        threshold: float = KNOWLEDGE_CACHE_THRESHOLD,
+        max_entries: int = KNOWLEDGE_CACHE_MAX_ENTRIES,
+        ttl: float = KNOWLEDGE_CACHE_TTL,
+        enabled: bool = KNOWLEDGE_CACHE_ENABLED,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled and max_entries > 0
+        self._entries: "OrderedDict[Tuple[str, str], CachedAnswer]" = OrderedDict()
+        self._sources: Optional[Tuple] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+            "saved_tokens": 0,
+            "lookup_s": 0.0,
+        }
+
+    def observe_sources(self, fingerprint: Tuple) -> None:
+        """Record the knowledge files' state, dropping answers if it changed."""
+        with self._lock:
+            if self._sources is not None and fingerprint != self._sources:
+                self._stats["invalidations"] += len(self._entries)
+                self._entries.clear()
+            self._sources = fingerprint
+
+    def lookup(
+        self,
+        question: str,
+        embed: Optional[Callable[[str], List[float]]] = None,
+        scope: str = "",
+    ) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """Find a cached answer to the question or, given embed, a near-duplicate.
+
+        Exact repeats are found without embedding. Returns the cached answer
+        (or None) and the question's embedding if one was computed, so a miss
+        can reuse it for retrieval instead of embedding again.
+        """
+        started = time.perf_counter()
+        exact_key = (scope, question)
+        with self._lock:
+            self._expire()
+            exact = exact_key in self._entries
+        vector = None
+        if not exact and embed is not None:
+            vector = _normalize(embed(question))
+        numbers = frozenset(NUMBER.findall(question))
+        with self._lock:
+            self._expire()
+            best_key, best_score = None, self.threshold
+            if exact_key in self._entries:
+                best_key = exact_key
+            elif vector is not None:
+                for key, entry in self._entries.items():
+                    if key[0] != scope or entry.vector is None:
+                        continue
+                    if entry.numbers != numbers:
+                        continue
+                    score = float(np.dot(entry.vector, vector))
+                    if score >= best_score:
+                        best_key, best_score = key, score
+
+            self._stats["lookup_s"] += time.perf_counter() - started
+            if best_key is None:
+                self._stats["misses"] += 1
+                return None, vector
+            entry = self._entries[best_key]
+            self._entries.move_to_end(best_key)
+            self._stats["hits"] += 1
+            self._stats["saved_tokens"] += entry.tokens
+            return entry.answer, vector
+
+    def store(
+        self,
+        question: str,
+        vector: Optional[np.ndarray],
+        answer: str,
+        tokens: int = 0,
+        scope: str = "",
+    ) -> None:
+        """Cache an answer under its question and (normalized) embedding.
+
+        Answers stored without an embedding only match exact repeats.
+        """
+        if not self.enabled:
+            return
+        key = (scope, question)
+        with self._lock:
+            self._entries[key] = CachedAnswer(
+                vector=vector,
+                numbers=frozenset(NUMBER.findall(question)),
+                answer=answer,
+                tokens=tokens,
+                expires_at=time.monotonic() + self.ttl,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        expired = [k for k, e in self._entries.items() if e.expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self._stats["expirations"] += len(expired)
+
+    def clear(self) -> int:
+        """Drop every cached answer. Returns the number removed."""
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._stats["invalidations"] += removed
+            return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate, lookup latency and generation tokens saved."""
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        lookup_s = stats.pop("lookup_s")
+        return {
+            **stats,
+            "enabled": self.enabled,
+            "size": size,
+            "max_entries": self.max_entries,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+            "avg_lookup_ms": round(lookup_s / lookups * 1000, 2) if lookups else 0.0,
+        }
+
+
+def _normalize(vector: List[float]) -> np.ndarray:
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else array
+
+
+# Global instance
+answer_cache = SemanticAnswerCache()
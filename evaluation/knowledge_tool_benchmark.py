@@ -0,0 +1,100 @@
+"""End-to-end latency and token benchmark for the knowledge tool modes.
+
+Runs the RAGAS evaluation questions through the simple pit box agent with
+the knowledge tools in each mode: generate (the tool answers with its own
+LLM call) and retrieve (the tool returns cited chunks and the agent answers
+from them). Reports per-question wall-clock latency and LLM tokens, counting
+the agent's calls and any made inside the tools.
+
+Needs OPENAI_API_KEY. The semantic answer cache is disabled so every
+question reaches the tools.
+
+Usage:
+    python -m evaluation.knowledge_tool_benchmark [--runs 3] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict
+
+from langchain_core.callbacks import get_usage_metadata_callback
+from langchain_core.messages import HumanMessage
+
+from app.graphs.simple_pitbox import graph
+from app.tools.rag_knowledge import get_knowledge_rag
+from app.tools.semantic_cache import SemanticAnswerCache
+from evaluation.ragas_evaluation import TEST_DATA
+
+TOOL_MODES = ("generate", "retrieve")
+
+
+async def benchmark_mode(mode: str, runs: int) -> Dict:
+    """Time every test question through the agent with one tool mode."""
+    rag = get_knowledge_rag()
+    rag.tool_mode = mode
+    latencies, input_tokens, output_tokens = [], [], []
+    for item in TEST_DATA:
+        for _ in range(runs):
+            with get_usage_metadata_callback() as usage:
+                started = time.perf_counter()
+                await graph.ainvoke(
+                    {"messages": [HumanMessage(content=item["question"])]}
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+            input_tokens.append(
+                sum(u["input_tokens"] for u in usage.usage_metadata.values())
+            )
+            output_tokens.append(
+                sum(u["output_tokens"] for u in usage.usage_metadata.values())
+            )
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "avg_ms": round(statistics.mean(latencies), 1),
+        "p50_ms": round(latencies[len(latencies) // 2], 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+        "input_tokens": round(statistics.mean(input_tokens), 1),
+        "output_tokens": round(statistics.mean(output_tokens), 1),
+    }
+
+
+async def run(runs: int):
+    rag = get_knowledge_rag()
+    rag.cache = SemanticAnswerCache(enabled=False)
+    original_mode = rag.tool_mode
+    try:
+        return [await benchmark_mode(mode, runs) for mode in TOOL_MODES]
+    finally:
+        rag.tool_mode = original_mode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Repeats per question")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.runs))
+
+    print(f"\n{len(TEST_DATA)} questions x {args.runs} runs, per question")
+    print(
+        f"{'mode':<9} {'avg ms':>8} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'in tok':>8} {'out tok':>8}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:<9} {r['avg_ms']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+            f"{r['input_tokens']:>8} {r['output_tokens']:>8}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,73 @@ METRIC_NAMES = [
 DEFAULT_NUM_RUNS = 5
 STABILITY_THRESHOLD = 0.1
 
+# Questions with reference answers, shared with the retrieval benchmark
+TEST_DATA = [
+    {
+        "question": "Who are the current drivers for Trackhouse Racing?",
+        "ground_truth": (
+            "The current drivers for Trackhouse Racing are Ross Chastain "
+            "driving the No. 1 Chevrolet, Daniel Suárez driving the No. 99 "
+            "Chevrolet, and Shane van Gisbergen driving the No. 88 Chevrolet."
+        ),
+    },
+    {
+        "question": "What is the yellow flag in NASCAR?",
+        "ground_truth": (
+            "The yellow flag brings the race to a slowed pace and indicates a "
+            "caution period on-track due to a crash or debris that would impede "
+            "the race from continuing under full-speed conditions. When the flag "
+            "waves, the pace car enters the track and controls the field behind it."
+        ),
+    },
+    {
+        "question": "How long is Daytona International Speedway?",
+        "ground_truth": (
+            "Daytona International Speedway is 2.5 miles long with 31-degree "
+            "high banks and is a tri-oval track."
+        ),
+    },
+    {
+        "question": "What is pit road in NASCAR?",
+        "ground_truth": (
+            "Pit road is where teams service the race cars. This is where teams "
+            "make adjustments on the car, fuel stops, tire changes and fix damage "
+            "to the race cars. Pit road has specific speed limits that must be observed."
+        ),
+    },
+    {
+        "question": "Who owns Trackhouse Racing?",
+        "ground_truth": (
+            "Trackhouse Racing is owned by Justin Marks and rapper Pitbull "
+            "(Armando Christian Pérez)."
+        ),
+    },
+    {
+        "question": "What are superspeedways in NASCAR?",
+        "ground_truth": (
+            "Superspeedways are tracks that are 2.5 miles and bigger and feature "
+            "more drafting and pack racing. On the current schedule those are "
+            "Daytona International Speedway and Talladega Superspeedway."
+        ),
+    },
+    {
+        "question": "How many stages are in NASCAR Cup Series races?",
+        "ground_truth": (
+            "Each race is typically comprised of three stages (Stage 1, Stage 2 "
+            "and the Final Stage; the Coca-Cola 600 has four stages). Stage winners "
+            "earn playoff points and regular season points."
+        ),
+    },
+    {
+        "question": "What is Bristol Motor Speedway known for?",
+        "ground_truth": (
+            "Bristol Motor Speedway is a concrete half-mile track nicknamed "
+            "'The World's Fastest Half-Mile,' 'Thunder Valley' and 'The Last "
+            "Great Colosseum.' It features 24 degrees of banking through the turns."
+        ),
+    },
+]
+
 
 class RAGASEvaluator:
     """Evaluates RAG system using RAGAS metrics."""
@@ -44,71 +111,7 @@ class RAGASEvaluator:
 
     def create_test_dataset(self) -> Dataset:
         """Create test dataset for evaluation."""
-        test_data = [
-            {
-                "question": "Who are the current drivers for Trackhouse Racing?",
-                "ground_truth": (
-                    "The current drivers for Trackhouse Racing are Ross Chastain "
-                    "driving the No. 1 Chevrolet, Daniel Suárez driving the No. 99 "
-                    "Chevrolet, and Shane van Gisbergen driving the No. 88 Chevrolet."
-                ),
-            },
-            {
-                "question": "What is the yellow flag in NASCAR?",
-                "ground_truth": (
-                    "The yellow flag brings the race to a slowed pace and indicates a "
-                    "caution period on-track due to a crash or debris that would impede "
-                    "the race from continuing under full-speed conditions. When the flag "
-                    "waves, the pace car enters the track and controls the field behind it."
-                ),
-            },
-            {
-                "question": "How long is Daytona International Speedway?",
-                "ground_truth": (
-                    "Daytona International Speedway is 2.5 miles long with 31-degree "
-                    "high banks and is a tri-oval track."
-                ),
-            },
-            {
-                "question": "What is pit road in NASCAR?",
-                "ground_truth": (
-                    "Pit road is where teams service the race cars. This is where teams "
-                    "make adjustments on the car, fuel stops, tire changes and fix damage "
-                    "to the race cars. Pit road has specific speed limits that must be observed."
-                ),
-            },
-            {
-                "question": "Who owns Trackhouse Racing?",
-                "ground_truth": (
-                    "Trackhouse Racing is owned by Justin Marks and rapper Pitbull "
-                    "(Armando Christian Pérez)."
-                ),
-            },
-            {
-                "question": "What are superspeedways in NASCAR?",
-                "ground_truth": (
-                    "Superspeedways are tracks that are 2.5 miles and bigger and feature "
-                    "more drafting and pack racing. On the current schedule those are "
-                    "Daytona International Speedway and Talladega Superspeedway."
-                ),
-            },
-            {
-                "question": "How many stages are in NASCAR Cup Series races?",
-                "ground_truth": (
-                    "Each race is typically comprised of three stages (Stage 1, Stage 2 "
-                    "and the Final Stage; the Coca-Cola 600 has four stages). Stage winners "
-                    "earn playoff points and regular season points."
-                ),
-            },
-            {
-                "question": "What is Bristol Motor Speedway known for?",
-                "ground_truth": (
-                    "Bristol Motor Speedway is a concrete half-mile track nicknamed "
-                    "'The World's Fastest Half-Mile,' 'Thunder Valley' and 'The Last "
-                    "Great Colosseum.' It features 24 degrees of banking through the turns."
-                ),
-            },
-        ]
+        test_data = TEST_DATA
 
         # Generate answers and contexts using the RAG system
         questions = [item["question"] for item in test_data]
@@ -124,7 +127,7 @@ class RAGASEvaluator:
             contexts.append(context_list)
 
             # Get RAG answer
-            answer = self.rag.invoke(question)
+            answer = self.rag.invoke(question, use_cache=False)
             answers.append(answer)
 
         return Dataset.from_dict(
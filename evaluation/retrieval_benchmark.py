@@ -0,0 +1,98 @@
+"""Latency and recall benchmark for the knowledge retrieval modes.
+
+Runs the RAGAS evaluation questions through each retrieval mode (dense is
+the original embeddings-only retriever) and reports per-query latency,
+embedding calls and ground-truth recall. Recall is the share of the
+reference answer's content words found in the retrieved chunks.
+
+Usage:
+    python -m evaluation.retrieval_benchmark [--runs 5] [--output results.json]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Dict, List
+
+from app.tools.hybrid_retriever import RETRIEVAL_MODES, tokenize
+from app.tools.rag_knowledge import NASCARKnowledgeRAG
+from app.tools.semantic_cache import SemanticAnswerCache
+from evaluation.ragas_evaluation import TEST_DATA
+
+
+def token_recall(ground_truth: str, contexts: List[str]) -> float:
+    """Share of the reference answer's distinct content words in the contexts."""
+    expected = set(tokenize(ground_truth))
+    if not expected:
+        return 1.0
+    found = set(tokenize(" ".join(contexts)))
+    return len(expected & found) / len(expected)
+
+
+def benchmark_mode(rag: NASCARKnowledgeRAG, mode: str, runs: int) -> Dict:
+    """Time every test question through one retrieval mode."""
+    embed_calls = 0
+
+    def embed_query(text: str) -> List[float]:
+        nonlocal embed_calls
+        embed_calls += 1
+        return rag.embeddings.embed_query(text)
+
+    retriever = rag.retriever.model_copy(
+        update={"mode": mode, "embed_query": embed_query}
+    )
+    latencies, recalls, routes = [], [], []
+    for item in TEST_DATA:
+        question = item["question"]
+        for _ in range(runs):
+            started = time.perf_counter()
+            docs = retriever.retrieve(question)
+            latencies.append((time.perf_counter() - started) * 1000)
+        recalls.append(
+            token_recall(item["ground_truth"], [doc.page_content for doc in docs])
+        )
+        routes.append(retriever.route(question))
+
+    latencies.sort()
+    queries = len(TEST_DATA) * runs
+    return {
+        "mode": mode,
+        "avg_ms": round(statistics.mean(latencies), 2),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "embed_calls_per_query": round(embed_calls / queries, 2),
+        "recall": round(statistics.mean(recalls), 3),
+        "bm25_only_queries": routes.count("bm25"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Repeats per question")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    # The answer cache plays no part in retrieval; keep it out of the way
+    rag = NASCARKnowledgeRAG(cache=SemanticAnswerCache(enabled=False))
+    results = [benchmark_mode(rag, mode, args.runs) for mode in RETRIEVAL_MODES]
+
+    print(f"\n{len(TEST_DATA)} questions x {args.runs} runs")
+    print(
+        f"{'mode':<8} {'avg ms':>8} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'embeds/q':>9} {'recall':>7} {'bm25-only':>10}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:<8} {r['avg_ms']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+            f"{r['embed_calls_per_query']:>9} {r['recall']:>7} "
+            f"{r['bm25_only_queries']:>10}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
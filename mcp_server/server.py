@@ -3,7 +3,9 @@
 import argparse
 import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import List
 
 # Suppress FastMCP banner and verbose output
 os.environ["FASTMCP_DISABLE_BANNER"] = "1"
@@ -29,6 +31,7 @@ from tools import (
     get_all_flags,
     get_all_laps,
     get_all_positions,
+    get_api_client_stats,
     get_average_lap_time,
     get_best_lap_time,
     get_car_position,
@@ -37,19 +40,33 @@ from tools import (
     get_current_lap,
     get_driver_info,
     get_lap_time,
+    get_lap_time_stats,
+    get_multi_car_lap_times,
     get_pit_events,
     get_pit_times,
+    get_race_state_status,
     get_starting_grid,
+    get_stint_stats,
     get_team_info,
     get_telemetry_channels,
     get_tire_data,
+    get_tire_history,
     get_track_info,
     get_vehicle_id,
 )
-from tools.utils import WEB_SERVER_URL
+from tools.race_state import race_state_lifespan
+from tools.utils import WEB_SERVER_URL, http_client_lifespan
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """Keep the pooled HTTP client and race state mirror running while serving."""
+    async with http_client_lifespan(server), race_state_lifespan(server):
+        yield {}
+
 
 # Initialize FastMCP server
-mcp = FastMCP("TrackHouse Racing System")
+mcp = FastMCP("TrackHouse Racing System", lifespan=server_lifespan)
 
 
 # Register all tools with the MCP server
@@ -66,6 +83,18 @@ async def get_vehicle_id_tool():
     return await get_vehicle_id()
 
 
+@mcp.tool()
+async def get_api_client_stats_tool():
+    """Get web server API client statistics (connection reuse, cache hit rate)."""
+    return await get_api_client_stats()
+
+
+@mcp.tool()
+async def get_race_state_status_tool():
+    """Get how fresh the live race data served by the tools is."""
+    return await get_race_state_status()
+
+
 # Car Data Tools
 @mcp.tool()
 async def get_car_position_tool(car_number: str):
@@ -103,6 +132,25 @@ async def get_average_lap_time_tool(car_number: str, lap_number: int = None):
     return await get_average_lap_time(car_number, lap_number)
 
 
+@mcp.tool()
+async def get_lap_time_stats_tool(
+    car_number: str, start_lap: int = None, end_lap: int = None, window: int = 5
+):
+    """Get lap time statistics (average, best, median, percentiles) for a car."""
+    return await get_lap_time_stats(car_number, start_lap, end_lap, window)
+
+
+@mcp.tool()
+async def get_multi_car_lap_times_tool(
+    car_numbers: List[str] = None, start_lap: int = None, end_lap: int = None
+):
+    """Get lap time summaries (best, average, last) for several cars at once.
+
+    Pass car_numbers=['all'] or omit it to compare the whole field.
+    """
+    return await get_multi_car_lap_times(car_numbers, start_lap, end_lap)
+
+
 # Pit Stop Tools
 @mcp.tool()
 async def get_pit_events_tool(car_number: str):
@@ -122,6 +170,14 @@ async def get_tire_data_tool(lap_number: int, car_number: str = None):
     return await get_tire_data(lap_number, car_number)
 
 
+@mcp.tool()
+async def get_tire_history_tool(
+    start_lap: int, end_lap: int, car_numbers: List[str] = None
+):
+    """Get tire readings over a lap range with per-stint wear rates per corner."""
+    return await get_tire_history(start_lap, end_lap, car_numbers)
+
+
 # Race Status Tools
 @mcp.tool()
 async def get_current_flag_tool():
@@ -204,6 +260,15 @@ async def compare_lap_times_tool(car1: str, car2: str):
     return await compare_lap_times(car1, car2)
 
 
+@mcp.tool()
+async def get_stint_stats_tool(car_numbers: List[str] = None):
+    """Get current stint stats (average, consistency, degradation) per car.
+
+    Pass car_numbers=['all'] or omit it to cover the whole field.
+    """
+    return await get_stint_stats(car_numbers)
+
+
 def create_mcp_server() -> FastMCP:
     """Create and return the configured MCP server instance."""
     return mcp
@@ -236,7 +301,12 @@ def print_server_info(
 
     # List categories of tools
     tools = {
-        "System": ["check_system_health", "get_vehicle_id"],
+        "System": [
+            "check_system_health",
+            "get_vehicle_id",
+            "get_api_client_stats",
+            "get_race_state_status",
+        ],
         "Car Data": [
             "get_car_position",
             "get_all_positions",
@@ -244,8 +314,15 @@ def print_server_info(
             "get_lap_time",
             "get_best_lap_time",
             "get_average_lap_time",
+            "get_lap_time_stats",
+            "get_multi_car_lap_times",
+        ],
+        "Pit Stops": [
+            "get_pit_events",
+            "get_pit_times",
+            "get_tire_data",
+            "get_tire_history",
         ],
-        "Pit Stops": ["get_pit_events", "get_pit_times", "get_tire_data"],
         "Race Status": [
             "get_current_flag",
             "get_all_flags",
@@ -260,6 +337,7 @@ def print_server_info(
             "analyze_race_leader",
             "analyze_pit_strategy",
             "compare_lap_times",
+            "get_stint_stats",
         ],
     }
 
@@ -2,7 +2,12 @@
 
 # System status tools
 # Analysis tools
-from .analysis import analyze_pit_strategy, analyze_race_leader, compare_lap_times
+from .analysis import (
+    analyze_pit_strategy,
+    analyze_race_leader,
+    compare_lap_times,
+    get_stint_stats,
+)
 
 # Car data tools
 from .car_data import (
@@ -12,13 +17,15 @@ from .car_data import (
     get_car_position,
     get_car_rank,
     get_lap_time,
+    get_lap_time_stats,
+    get_multi_car_lap_times,
 )
 
 # Content tools
 from .content import get_all_drivers, get_driver_info, get_team_info
 
 # Pit stop tools
-from .pit_stop import get_pit_events, get_pit_times, get_tire_data
+from .pit_stop import get_pit_events, get_pit_times, get_tire_data, get_tire_history
 
 # Race status tools
 from .race_status import (
@@ -29,7 +36,12 @@ from .race_status import (
     get_starting_grid,
     get_track_info,
 )
-from .system_status import check_system_health, get_vehicle_id
+from .system_status import (
+    check_system_health,
+    get_api_client_stats,
+    get_race_state_status,
+    get_vehicle_id,
+)
 
 # Telemetry tools
 from .telemetry import get_telemetry_channels
@@ -38,6 +50,8 @@ __all__ = [
     # System status
     "check_system_health",
     "get_vehicle_id",
+    "get_api_client_stats",
+    "get_race_state_status",
     # Car data
     "get_car_position",
     "get_all_positions",
@@ -45,10 +59,13 @@ __all__ = [
     "get_lap_time",
     "get_best_lap_time",
     "get_average_lap_time",
+    "get_lap_time_stats",
+    "get_multi_car_lap_times",
     # Pit stops
     "get_pit_events",
     "get_pit_times",
     "get_tire_data",
+    "get_tire_history",
     # Race status
     "get_current_flag",
     "get_all_flags",
@@ -66,4 +83,5 @@ __all__ = [
     "analyze_race_leader",
     "analyze_pit_strategy",
     "compare_lap_times",
+    "get_stint_stats",
 ]
@@ -1,23 +1,42 @@
 """Race analysis and comparison tools."""
 
-from typing import Any, Dict
+import statistics
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
 
 from pydantic import Field
 
-from .car_data import get_all_positions, get_lap_time
+from .car_data import fetch_all_positions, load_lap_times
+from .lap_store import lap_store
 from .pit_stop import get_pit_events, get_pit_times
-from .race_status import get_all_laps
+from .race_state import CAR_ENDPOINTS, race_state
+from .race_status import fetch_all_laps
+from .stints import stint_tracker
+from .utils import BULK_MAX_CONCURRENCY, fan_out
+
+
+async def _without_age(
+    fetch: Awaitable[Tuple[Dict[str, Any], Optional[float]]],
+) -> Dict[str, Any]:
+    """Just the payload of a fetch_all_* result, for fan_out legs."""
+    payload, _ = await fetch
+    return payload
 
 
 async def analyze_race_leader() -> Dict[str, Any]:
     """Analyze who is currently leading the race and by how much.
 
-    Returns leader information and gap to second place.
+    Returns leader information and gap to second place. If lap counts are
+    unavailable, the leader is still reported without lap data.
     """
-    positions = await get_all_positions()
-    laps = await get_all_laps()
-
-    if "error" in positions or "error" in laps:
+    legs = await fan_out(
+        {
+            "positions": _without_age(fetch_all_positions()),
+            "laps": _without_age(fetch_all_laps()),
+        }
+    )
+    positions, laps = legs["positions"], legs["laps"]
+
+    if "error" in positions:
         return {"error": "Could not fetch race data"}
 
     # Find the leader (position 1)
@@ -40,14 +59,20 @@ async def analyze_race_leader() -> Dict[str, Any]:
             second_car = car
             break
 
-    result = {"leader": leader_car, "position": 1, "lap": leader_lap}
+    result = {"leader": leader_car, "position": 1}
+    if "error" in laps:
+        # Positions alone still answer who is leading
+        result["errors"] = {"laps": laps["error"]}
+    else:
+        result["lap"] = leader_lap
 
     if second_car:
-        second_lap = laps.get(second_car, 0) if isinstance(laps, dict) else 0
         result["second_place"] = second_car
-        result["gap_laps"] = (
-            int(leader_lap) - int(second_lap) if leader_lap and second_lap else 0
-        )
+        if "error" not in laps:
+            second_lap = laps.get(second_car, 0) if isinstance(laps, dict) else 0
+            result["gap_laps"] = (
+                int(leader_lap) - int(second_lap) if leader_lap and second_lap else 0
+            )
 
     return result
 
@@ -62,8 +87,13 @@ async def analyze_pit_strategy(
 
     Returns pit stop patterns and statistics.
     """
-    pit_events = await get_pit_events(car_number)
-    pit_times = await get_pit_times(car_number)
+    legs = await fan_out(
+        {
+            "pit_events": get_pit_events(car_number),
+            "pit_times": get_pit_times(car_number, None),
+        }
+    )
+    pit_events, pit_times = legs["pit_events"], legs["pit_times"]
 
     if "error" in pit_events:
         return pit_events
@@ -77,7 +107,9 @@ async def analyze_pit_strategy(
         "pit_out_laps": pit_data.get("out", []),
     }
 
-    if not isinstance(pit_times, dict) or "error" not in pit_times:
+    if isinstance(pit_times, dict) and "error" in pit_times:
+        analysis["errors"] = {"pit_times": pit_times["error"]}
+    else:
         times_data = (
             pit_times.get("pit_times", {}) if isinstance(pit_times, dict) else {}
         )
@@ -86,7 +118,7 @@ async def analyze_pit_strategy(
             if isinstance(times_data, dict) and times_data:
                 durations = [float(v) for v in times_data.values() if v]
                 if durations:
-                    analysis["average_pit_time"] = sum(durations) / len(durations)
+                    analysis["average_pit_time"] = statistics.mean(durations)
 
     return analysis
 
@@ -101,35 +133,95 @@ async def compare_lap_times(
         car1: First car number to compare
         car2: Second car number to compare
 
-    Returns comparison of lap times and performance metrics.
+    Returns comparison of lap times and performance metrics. If only one car's
+    lap times are available, its metrics are returned alongside the error.
     """
-    car1_times = await get_lap_time(car1)
-    car2_times = await get_lap_time(car2)
+    legs = await fan_out({"car1": load_lap_times(car1), "car2": load_lap_times(car2)})
 
-    if "error" in car1_times or "error" in car2_times:
+    if "error" in legs["car1"] and "error" in legs["car2"]:
         return {"error": "Could not fetch lap times for comparison"}
 
-    car1_data = car1_times.get("lap_times", {})
-    car2_data = car2_times.get("lap_times", {})
+    comparison = {"car1": car1, "car2": car2}
+    errors = {}
+    for name, car in (("car1", car1), ("car2", car2)):
+        if "error" in legs[name]:
+            errors[name] = legs[name]["error"]
+            comparison[f"{name}_laps"] = 0
+            continue
+
+        stats = lap_store.stats(car)
+        comparison[f"{name}_laps"] = stats["laps"]
+        # Calculate averages if data is available
+        if stats["laps"]:
+            comparison[f"{name}_average"] = stats["average"]
+            comparison[f"{name}_best"] = stats["best"]
+            comparison[f"{name}_median"] = stats["median"]
+
+    if errors:
+        comparison["errors"] = errors
 
-    comparison = {
-        "car1": car1,
-        "car2": car2,
-        "car1_laps": len(car1_data) if isinstance(car1_data, dict) else 0,
-        "car2_laps": len(car2_data) if isinstance(car2_data, dict) else 0,
-    }
+    return comparison
 
-    # Calculate averages if data is available
-    if isinstance(car1_data, dict) and car1_data:
-        times1 = [float(v) for v in car1_data.values() if v]
-        if times1:
-            comparison["car1_average"] = sum(times1) / len(times1)
-            comparison["car1_best"] = min(times1)
 
-    if isinstance(car2_data, dict) and car2_data:
-        times2 = [float(v) for v in car2_data.values() if v]
-        if times2:
-            comparison["car2_average"] = sum(times2) / len(times2)
-            comparison["car2_best"] = min(times2)
+async def _update_stints(car_number: str) -> Dict[str, Any]:
+    """Bring one car's stint statistics up to date with its laps and pit stops."""
+    legs = await fan_out(
+        {"laps": load_lap_times(car_number), "pits": get_pit_events(car_number)}
+    )
+    if "error" in legs["laps"]:
+        return legs["laps"]
+    if "error" not in legs["pits"]:
+        stint_tracker.update_pits(car_number, legs["pits"])
+    stint_tracker.update_laps(car_number, lap_store.times(car_number))
+    return stint_tracker.get_stints(car_number)
 
-    return comparison
+
+def _mirrored_stints(car_number: str) -> Optional[Dict[str, Any]]:
+    """A car's stint statistics if the race state mirror keeps them current.
+
+    The mirror feeds the stint tracker on every sync, so while the car's
+    mirrored laps and pit stops are fresh the tracker is already up to date.
+    """
+    if any(
+        race_state.get_car(section, car_number) is None for section in CAR_ENDPOINTS
+    ):
+        return None
+    return stint_tracker.get_stints(car_number)
+
+
+async def get_stint_stats(
+    car_numbers: Optional[List[str]] = Field(
+        default=None, description="Car numbers, or ['all'] for the whole field"
+    ),
+) -> Dict[str, Any]:
+    """Get running statistics for each car's current stint.
+
+    Args:
+        car_numbers: Car numbers to report (omit or ['all'] for every car)
+
+    Returns per-car current stint average, standard deviation, best lap and
+    degradation per lap, with summaries of completed stints. Cars the race
+    state mirror keeps current are served without fetching anything.
+    """
+    if not car_numbers or "all" in car_numbers:
+        positions, _ = await fetch_all_positions()
+        if "error" in positions:
+            return positions
+        car_numbers = list(positions.keys()) if isinstance(positions, dict) else []
+
+    results = {car: _mirrored_stints(car) for car in car_numbers}
+    fetched = await fan_out(
+        {car: _update_stints(car) for car, stints in results.items() if stints is None},
+        max_concurrency=BULK_MAX_CONCURRENCY,
+    )
+    results.update(fetched)
+
+    response = {
+        "cars": [result for result in results.values() if "error" not in result]
+    }
+    errors = {
+        car: result["error"] for car, result in results.items() if "error" in result
+    }
+    if errors:
+        response["errors"] = errors
+    return response
@@ -0,0 +1,146 @@
+"""Per-endpoint TTL response cache for web server API requests."""
+
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Configuration
+API_CACHE_ENABLED = os.getenv("API_CACHE_ENABLED", "true").lower() == "true"
+API_CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "512"))
+RACE_STATIC_TTL = 3600.0
+
+
+class CachePolicy(NamedTuple):
+    """Caching rule for endpoints matching a pattern.
+
+    Attributes:
+        pattern: Regex matched against the endpoint path
+        ttl: Seconds to keep a response (None keeps it until evicted, 0 disables)
+        flag_sensitive: Drop cached responses when the race flag changes
+    """
+
+    pattern: re.Pattern
+    ttl: Optional[float]
+    flag_sensitive: bool = False
+
+
+# First matching policy wins; unmatched endpoints are never cached
+CACHE_POLICIES: List[CachePolicy] = [
+    CachePolicy(re.compile(r"^/health$"), 0),
+    CachePolicy(re.compile(r"^/api/track/"), None),
+    CachePolicy(re.compile(r"^/content(/|$)"), RACE_STATIC_TTL),
+    CachePolicy(re.compile(r"^/api/grid(/|$)"), RACE_STATIC_TTL),
+    CachePolicy(re.compile(r"^/api/vehicle_id$"), RACE_STATIC_TTL),
+    CachePolicy(re.compile(r"^/api/flag$"), 1.0),
+    CachePolicy(re.compile(r"^/api/(pos|rank|lap|laps|flags)(/|$)"), 1.0, True),
+    CachePolicy(re.compile(r"^/api/(lt|at|bt|pit|pt|tires)(/|$)"), 5.0, True),
+]
+
+
+def get_cache_policy(endpoint: str) -> Optional[CachePolicy]:
+    """Find the caching policy for an endpoint, if it is cacheable."""
+    for policy in CACHE_POLICIES:
+        if policy.pattern.search(endpoint):
+            return policy if policy.ttl != 0 else None
+    return None
+
+
+class ResponseCache:
+    """Bounded LRU cache of successful API responses with per-entry expiry.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = API_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # endpoint -> (expires_at, flag_sensitive, value)
+        self._entries: "OrderedDict[str, Tuple[float, bool, Any]]" = OrderedDict()
+        self._flag: Optional[Any] = None
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, endpoint: str) -> Optional[Any]:
+        """Return a fresh cached value for the endpoint, or None."""
+        entry = self._entries.get(endpoint)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[endpoint]
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(endpoint)
+        self._stats["hits"] += 1
+        return value
+
+    def set(self, endpoint: str, value: Any, policy: CachePolicy) -> None:
+        """Store a value for the endpoint according to its policy."""
+        if self.max_entries <= 0:
+            return
+        ttl = policy.ttl if policy.ttl is not None else float("inf")
+        self._entries[endpoint] = (
+            time.monotonic() + ttl,
+            policy.flag_sensitive,
+            value,
+        )
+        self._entries.move_to_end(endpoint)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(self, pattern: Optional[str] = None) -> int:
+        """Drop cached entries whose endpoint matches a regex (all if None).
+
+        Returns the number of entries removed.
+        """
+        if pattern is None:
+            removed = len(self._entries)
+            self._entries.clear()
+        else:
+            regex = re.compile(pattern)
+            keys = [key for key in self._entries if regex.search(key)]
+            for key in keys:
+                del self._entries[key]
+            removed = len(keys)
+        self._stats["invalidations"] += removed
+        return removed
+
+    def invalidate_flag_sensitive(self) -> int:
+        """Drop entries for data that changes when the race flag changes."""
+        keys = [key for key, entry in self._entries.items() if entry[1]]
+        for key in keys:
+            del self._entries[key]
+        self._stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def observe_flag(self, flag: Any) -> None:
+        """Record the latest race flag, invalidating stale data on a change."""
+        if self._flag is not None and flag != self._flag:
+            self.invalidate_flag_sensitive()
+        self._flag = flag
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current cache size."""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "enabled": API_CACHE_ENABLED,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+# Global instance
+response_cache = ResponseCache()
@@ -1,10 +1,12 @@
 """Car data and performance tools."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import Field
 
-from .utils import make_api_request
+from .lap_store import lap_store
+from .race_state import race_state, with_age
+from .utils import BULK_MAX_CONCURRENCY, fan_out, make_api_request
 
 
 async def get_car_position(
@@ -17,21 +19,45 @@ async def get_car_position(
 
     Returns current position/rank information for the car.
     """
+    mirrored = race_state.get("positions")
+    if mirrored is not None and car_number in (mirrored[0] or {}):
+        positions, age = mirrored
+        return {
+            "car": car_number,
+            "position": positions[car_number],
+            "data_age_s": round(age, 3),
+        }
+
     result = await make_api_request(f"/api/pos/{car_number}")
     if result.success:
         return {"car": car_number, "position": result.data}
     return {"error": result.error}
 
 
-async def get_all_positions() -> Dict[str, Any]:
-    """Get current positions for all cars in the race.
+async def fetch_all_positions() -> Tuple[Dict[str, Any], Optional[float]]:
+    """Fetch positions for all cars, from the race state mirror when fresh.
 
-    Returns a dictionary mapping car numbers to their positions.
+    Returns the car number to position mapping (or an error) and the
+    mirrored data's age in seconds, or None if it was fetched live.
     """
+    mirrored = race_state.get("positions")
+    if mirrored is not None:
+        return mirrored
+
     result = await make_api_request("/api/pos")
     if result.success:
-        return result.data
-    return {"error": result.error}
+        return result.data, None
+    return {"error": result.error}, None
+
+
+async def get_all_positions() -> Dict[str, Any]:
+    """Get current positions for all cars in the race.
+
+    Returns a dictionary mapping car numbers to their positions, plus
+    data_age_s when served from the race state mirror.
+    """
+    positions, age = await fetch_all_positions()
+    return positions if age is None else with_age(positions, age)
 
 
 async def get_car_rank(
@@ -62,6 +88,11 @@ async def get_lap_time(
 
     Returns lap time(s) for the specified car.
     """
+    mirrored = None if lap_number else race_state.get_car("lap_times", car_number)
+    if mirrored is not None:
+        lap_times, age = mirrored
+        return {"car": car_number, "lap_times": lap_times, "data_age_s": round(age, 3)}
+
     if lap_number:
         result = await make_api_request(f"/api/lt/{car_number}/{lap_number}")
     else:
@@ -72,6 +103,17 @@ async def get_lap_time(
     return {"error": result.error}
 
 
+async def load_lap_times(car_number: str) -> Dict[str, Any]:
+    """Fetch a car's lap times and ingest them into the lap store.
+
+    Returns the get_lap_time result, including any error.
+    """
+    result = await get_lap_time(car_number, None)
+    if "error" not in result:
+        lap_store.ingest(car_number, result.get("lap_times"))
+    return result
+
+
 async def get_best_lap_time(
     car_number: Optional[str] = Field(default=None, description="Car number"),
 ) -> Dict[str, Any]:
@@ -112,3 +154,66 @@ async def get_average_lap_time(
     if result.success:
         return {"car": car_number, "average_times": result.data}
     return {"error": result.error}
+
+
+async def get_lap_time_stats(
+    car_number: str = Field(description="Car number"),
+    start_lap: Optional[int] = Field(default=None, description="First lap to include"),
+    end_lap: Optional[int] = Field(default=None, description="Last lap to include"),
+    window: int = Field(default=5, description="Laps in the rolling average"),
+) -> Dict[str, Any]:
+    """Get lap time statistics for a car over a lap range.
+
+    Args:
+        car_number: The car number to query
+        start_lap: Optional first lap of the range
+        end_lap: Optional last lap of the range
+        window: Number of recent laps in the rolling average
+
+    Returns average, best, median, percentiles, last lap and rolling average.
+    """
+    loaded = await load_lap_times(car_number)
+    if "error" in loaded:
+        return loaded
+    return lap_store.stats(car_number, start_lap, end_lap, window)
+
+
+async def get_multi_car_lap_times(
+    car_numbers: Optional[List[str]] = Field(
+        default=None, description="Car numbers, or ['all'] for the whole field"
+    ),
+    start_lap: Optional[int] = Field(default=None, description="First lap to include"),
+    end_lap: Optional[int] = Field(default=None, description="Last lap to include"),
+) -> Dict[str, Any]:
+    """Get lap time summaries for several cars in one call.
+
+    Args:
+        car_numbers: Car numbers to compare (omit or ['all'] for every car)
+        start_lap: Optional first lap of the range
+        end_lap: Optional last lap of the range
+
+    Returns a table of per-car lap counts, best, average and last lap times
+    over the lap range, sorted by average lap time.
+    """
+    if not car_numbers or "all" in car_numbers:
+        positions, _ = await fetch_all_positions()
+        if "error" in positions:
+            return positions
+        car_numbers = list(positions.keys()) if isinstance(positions, dict) else []
+
+    results = await fan_out(
+        {car: load_lap_times(car) for car in car_numbers},
+        max_concurrency=BULK_MAX_CONCURRENCY,
+    )
+    errors = {
+        car: result["error"] for car, result in results.items() if "error" in result
+    }
+
+    loaded = [car for car in car_numbers if car not in errors]
+    table = list(lap_store.field_stats(loaded, start_lap, end_lap).values())
+    table.sort(key=lambda row: row.get("average", float("inf")))
+
+    response = {"lap_range": [start_lap, end_lap], "cars": table}
+    if errors:
+        response["errors"] = errors
+    return response
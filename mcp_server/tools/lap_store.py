@@ -0,0 +1,166 @@
+"""Columnar NumPy store of per-car lap times."""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Highest lap number accepted; larger keys are bad data and would size the arrays
+MAX_LAPS = 2000
+
+
+def parse_lap_times(data: Any) -> Dict[int, float]:
+    """Convert a /api/lt payload into a lap number to lap time mapping."""
+    if isinstance(data, list):
+        data = dict(enumerate(data, start=1))
+    if not isinstance(data, dict):
+        return {}
+
+    lap_times = {}
+    for lap, value in data.items():
+        try:
+            lap, value = int(lap), float(value)
+        except (TypeError, ValueError):
+            continue
+        if 1 <= lap <= MAX_LAPS:
+            lap_times[lap] = value
+    return lap_times
+
+
+def _lap_slice(start_lap: Optional[int], end_lap: Optional[int]) -> slice:
+    """Array slice for an inclusive lap range (arrays are indexed by lap)."""
+    start = max(start_lap or 1, 1)
+    stop = end_lap + 1 if end_lap is not None else None
+    return slice(start, stop)
+
+
+class LapTimeStore:
+    """Per-car lap times held as float arrays indexed by lap number.
+
+    Missing or invalid laps are NaN. Payloads are only parsed when they change,
+    so repeated questions over cached or mirrored data don't re-parse anything.
+    """
+
+    def __init__(self):
+        self._times: Dict[str, np.ndarray] = {}
+        self._sources: Dict[str, Any] = {}
+
+    def ingest(self, car: str, payload: Any) -> np.ndarray:
+        """Load a car's /api/lt payload, skipping it if already ingested."""
+        if car in self._times and self._sources.get(car) is payload:
+            return self._times[car]
+
+        lap_times = parse_lap_times(payload)
+        times = np.full(max(lap_times, default=0) + 1, np.nan)
+        if lap_times:
+            laps = np.fromiter(lap_times.keys(), dtype=np.int64)
+            values = np.fromiter(lap_times.values(), dtype=np.float64)
+            values[values <= 0] = np.nan
+            times[laps] = values
+
+        self._times[car] = times
+        self._sources[car] = payload
+        return times
+
+    def times(self, car: str) -> np.ndarray:
+        """Lap time array for a car indexed by lap number (NaN where missing)."""
+        return self._times.get(car, np.empty(0))
+
+    def laps(
+        self, car: str, start_lap: Optional[int] = None, end_lap: Optional[int] = None
+    ) -> np.ndarray:
+        """Valid lap times for a car over an inclusive lap range."""
+        times = self.times(car)[_lap_slice(start_lap, end_lap)]
+        return times[~np.isnan(times)]
+
+    def stats(
+        self,
+        car: str,
+        start_lap: Optional[int] = None,
+        end_lap: Optional[int] = None,
+        window: int = 5,
+    ) -> Dict[str, Any]:
+        """Summary statistics for a car over an inclusive lap range.
+
+        Args:
+            car: Car number
+            start_lap: Optional first lap of the range
+            end_lap: Optional last lap of the range
+            window: Number of laps in the rolling average
+
+        Returns lap count, average, best (and its lap), median, 10th/90th
+        percentiles, last lap time and the rolling average over the last laps.
+        """
+        times = self.times(car)
+        lap_range = _lap_slice(start_lap, end_lap)
+        sliced = times[lap_range]
+        valid = ~np.isnan(sliced)
+        values = sliced[valid]
+        if not values.size:
+            return {"car": car, "laps": 0}
+
+        lap_numbers = np.arange(lap_range.start, lap_range.start + sliced.size)[valid]
+        best_index = int(np.argmin(values))
+        p10, median, p90 = np.percentile(values, [10, 50, 90])
+        window = max(1, min(window, values.size))
+
+        return {
+            "car": car,
+            "laps": int(values.size),
+            "average": round(float(values.mean()), 3),
+            "best": float(values[best_index]),
+            "best_lap": int(lap_numbers[best_index]),
+            "median": round(float(median), 3),
+            "p10": round(float(p10), 3),
+            "p90": round(float(p90), 3),
+            "last": float(values[-1]),
+            "rolling_average": round(float(values[-window:].mean()), 3),
+            "rolling_window": window,
+        }
+
+    def rolling_mean(self, car: str, window: int = 5) -> np.ndarray:
+        """Rolling average over a car's valid laps."""
+        values = self.laps(car)
+        if values.size < window:
+            return np.empty(0)
+        return np.convolve(values, np.ones(window) / window, mode="valid")
+
+    def field_stats(
+        self,
+        cars: List[str],
+        start_lap: Optional[int] = None,
+        end_lap: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Lap count, best, average and last lap time for many cars at once.
+
+        Builds a cars x laps matrix and reduces it in one vectorized pass.
+        """
+        cars = [car for car in cars if car in self._times]
+        if not cars:
+            return {}
+
+        width = max(self._times[car].size for car in cars)
+        matrix = np.full((len(cars), width), np.nan)
+        for row, car in enumerate(cars):
+            matrix[row, : self._times[car].size] = self._times[car]
+        matrix = matrix[:, _lap_slice(start_lap, end_lap)]
+        if not matrix.shape[1]:
+            return {car: {"car": car, "laps": 0} for car in cars}
+
+        valid = ~np.isnan(matrix)
+        counts = valid.sum(axis=1)
+        sums = np.where(valid, matrix, 0.0).sum(axis=1)
+        bests = np.where(valid, matrix, np.inf).min(axis=1)
+        last_index = np.where(valid, np.arange(matrix.shape[1]), -1).max(axis=1)
+
+        stats = {}
+        for row, car in enumerate(cars):
+            stats[car] = {"car": car, "laps": int(counts[row])}
+            if counts[row]:
+                stats[car]["best"] = float(bests[row])
+                stats[car]["average"] = round(float(sums[row] / counts[row]), 3)
+                stats[car]["last"] = float(matrix[row, last_index[row]])
+        return stats
+
+
+# Global instance
+lap_store = LapTimeStore()
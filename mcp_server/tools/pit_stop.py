@@ -1,10 +1,16 @@
 """Pit stop and tire management tools."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 from pydantic import Field
 
-from .utils import make_api_request
+from .race_state import race_state, with_age
+from .utils import BULK_MAX_CONCURRENCY, fan_out, make_api_request
+
+# Corner order used in tire matrices; unknown corners are appended sorted
+TIRE_CORNERS = ["LF", "RF", "LR", "RR"]
+MAX_TIRE_LAPS = 200
 
 
 async def get_pit_events(
@@ -17,6 +23,10 @@ async def get_pit_events(
 
     Returns lists of pit in and pit out lap numbers.
     """
+    mirrored = race_state.get_car("pit_events", car_number)
+    if mirrored is not None:
+        return with_age(*mirrored)
+
     result = await make_api_request(f"/api/pit/{car_number}")
     if result.success:
         return result.data
@@ -65,3 +75,154 @@ async def get_tire_data(
     if result.success:
         return {"lap": lap_number, "tires": result.data}
     return {"error": result.error}
+
+
+def _tire_value(value: Any) -> float:
+    """Numeric tire reading for one corner (uses 'wear' from nested readings)."""
+    if isinstance(value, dict):
+        value = value.get("wear")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _wear_rates(laps: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Least-squares change per lap for each column of a laps x corners array.
+
+    Missing readings (NaN) are ignored; columns with fewer than two readings
+    get NaN.
+    """
+    valid = ~np.isnan(values)
+    x = np.where(valid, laps[:, None], 0.0)
+    y = np.where(valid, values, 0.0)
+    n = valid.sum(axis=0)
+    sum_x, sum_y = x.sum(axis=0), y.sum(axis=0)
+    denominator = n * (x * x).sum(axis=0) - sum_x**2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = (n * (x * y).sum(axis=0) - sum_x * sum_y) / denominator
+    return np.where((n >= 2) & (denominator != 0), rates, np.nan)
+
+
+def _round_or_none(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+async def get_tire_history(
+    start_lap: int = Field(description="First lap of the range"),
+    end_lap: int = Field(description="Last lap of the range"),
+    car_numbers: Optional[List[str]] = Field(
+        default=None, description="Car numbers (omit for every car)"
+    ),
+) -> Dict[str, Any]:
+    """Get tire readings for a lap range as a lap x car x corner matrix.
+
+    Args:
+        start_lap: First lap of the range
+        end_lap: Last lap of the range
+        car_numbers: Optional car numbers to include (defaults to all cars)
+
+    Returns the tire matrix plus per-stint wear rates (change per lap for
+    each corner), with stints split on each car's pit-out laps.
+    """
+    if end_lap < start_lap:
+        return {"error": "end_lap must not be before start_lap"}
+    end_lap = min(end_lap, start_lap + MAX_TIRE_LAPS - 1)
+    laps = list(range(start_lap, end_lap + 1))
+
+    single_car = car_numbers[0] if car_numbers and len(car_numbers) == 1 else None
+    results = await fan_out(
+        {lap: get_tire_data(lap, single_car) for lap in laps},
+        max_concurrency=BULK_MAX_CONCURRENCY,
+    )
+    errors = {
+        str(lap): result["error"]
+        for lap, result in results.items()
+        if "error" in result
+    }
+
+    # Collect readings per lap as {car: {corner: value}}
+    readings = {}
+    for lap, result in results.items():
+        tires = result.get("tires") if "error" not in result else None
+        if single_car and isinstance(tires, dict) and single_car not in tires:
+            tires = {single_car: tires}
+        if isinstance(tires, dict):
+            readings[lap] = {
+                str(car): corners
+                for car, corners in tires.items()
+                if isinstance(corners, dict)
+                and (not car_numbers or str(car) in car_numbers)
+            }
+
+    cars = sorted({car for lap_cars in readings.values() for car in lap_cars})
+    found = {
+        corner
+        for lap_cars in readings.values()
+        for car_tires in lap_cars.values()
+        for corner in car_tires
+    }
+    corners = [c for c in TIRE_CORNERS if c in found] + sorted(
+        found - set(TIRE_CORNERS)
+    )
+    if not cars or not corners:
+        empty = {"laps": laps, "cars": [], "corners": [], "matrix": []}
+        if errors:
+            empty["errors"] = errors
+        return empty
+
+    matrix = np.full((len(laps), len(cars), len(corners)), np.nan)
+    for row, lap in enumerate(laps):
+        for col, car in enumerate(cars):
+            car_tires = readings.get(lap, {}).get(car, {})
+            for depth, corner in enumerate(corners):
+                if corner in car_tires:
+                    matrix[row, col, depth] = _tire_value(car_tires[corner])
+
+    pit_events = await fan_out(
+        {car: get_pit_events(car) for car in cars},
+        max_concurrency=BULK_MAX_CONCURRENCY,
+    )
+
+    lap_array = np.array(laps, dtype=float)
+    wear = {}
+    for col, car in enumerate(cars):
+        events = pit_events[car] if "error" not in pit_events[car] else {}
+        pit_out = sorted(
+            {
+                int(lap)
+                for lap in events.get("out", [])
+                if str(lap).isdigit() and start_lap < int(lap) <= end_lap
+            }
+        )
+        # New tires go on during the stop, so each pit-out lap starts a stint
+        bounds = [start_lap] + pit_out + [end_lap + 1]
+        stints = []
+        for stint_start, stint_end in zip(bounds, bounds[1:]):
+            rows = slice(stint_start - start_lap, stint_end - start_lap)
+            rates = _wear_rates(lap_array[rows], matrix[rows, col, :])
+            stints.append(
+                {
+                    "start_lap": stint_start,
+                    "end_lap": stint_end - 1,
+                    "wear_per_lap": {
+                        corner: _round_or_none(rate)
+                        for corner, rate in zip(corners, rates)
+                    },
+                }
+            )
+        wear[car] = stints
+
+    response = {
+        "laps": laps,
+        "cars": cars,
+        "corners": corners,
+        "matrix": [
+            [[_round_or_none(value) for value in car_row] for car_row in lap_row]
+            for lap_row in matrix
+        ],
+        "stint_wear": wear,
+    }
+    if errors:
+        response["errors"] = errors
+    return response
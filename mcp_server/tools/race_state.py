@@ -0,0 +1,252 @@
+"""In-process mirror of live race state for the MCP tools."""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from .lap_store import lap_store
+from .stints import stint_tracker
+from .utils import BULK_MAX_CONCURRENCY, fan_out, make_api_request
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# Off by default: every MCP worker runs its own mirror, polling even when idle
+RACE_STATE_ENABLED = os.getenv("RACE_STATE_ENABLED", "false").lower() == "true"
+RACE_STATE_REFRESH = float(os.getenv("RACE_STATE_REFRESH", "1.0"))
+RACE_STATE_MAX_AGE = float(os.getenv("RACE_STATE_MAX_AGE", "5.0"))
+
+# Race-wide endpoints polled on every refresh
+RACE_ENDPOINTS = {
+    "positions": "/api/pos",
+    "laps": "/api/laps",
+    "flag": "/api/flag",
+    "flags": "/api/flags",
+}
+
+# Per-car endpoints refreshed when the car's lap count changes, when the last
+# lap's time is still missing, and before an entry would go stale
+CAR_ENDPOINTS = {
+    "lap_times": "/api/lt/{car}",
+    "pit_events": "/api/pit/{car}",
+}
+
+
+def with_age(payload: Any, age: float) -> Any:
+    """Copy of a mirrored mapping payload with its age added as data_age_s."""
+    if not isinstance(payload, dict):
+        return payload
+    return {**payload, "data_age_s": round(age, 3)}
+
+
+def _has_lap_time(lap_times: Any, lap: Any) -> bool:
+    """Whether a /api/lt payload has a valid time for the given lap."""
+    if not isinstance(lap_times, dict):
+        return True
+    try:
+        return float(lap_times.get(str(lap))) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+class RaceState:
+    """Snapshot of live race data with the time each section was refreshed.
+
+    Race-wide sections hold the raw payload of their endpoint. Per-car sections
+    hold (lap count when fetched, payload, fetch time) and are current while
+    the car's lap count hasn't moved on and the payload is under max_age.
+    """
+
+    def __init__(self, max_age: float = RACE_STATE_MAX_AGE):
+        self.max_age = max_age
+        self.sections: Dict[str, Any] = {}
+        self.updated_at: Dict[str, float] = {}
+        self.cars: Dict[str, Dict[str, Tuple[Any, Any, float]]] = {
+            section: {} for section in CAR_ENDPOINTS
+        }
+
+    def update(self, section: str, data: Any) -> None:
+        """Store a fresh race-wide payload."""
+        self.sections[section] = data
+        self.updated_at[section] = time.monotonic()
+
+    def update_car(self, section: str, car: str, lap: Any, data: Any) -> None:
+        """Store a fresh per-car payload fetched at the given lap count."""
+        self.cars[section][car] = (lap, data, time.monotonic())
+
+    def car_age(self, section: str, car: str) -> Optional[float]:
+        """Seconds since a car's payload was fetched, or None if never."""
+        entry = self.cars[section].get(car)
+        if entry is None:
+            return None
+        return time.monotonic() - entry[2]
+
+    def age(self, section: str) -> Optional[float]:
+        """Seconds since a race-wide section was refreshed, or None if never."""
+        updated_at = self.updated_at.get(section)
+        if updated_at is None:
+            return None
+        return time.monotonic() - updated_at
+
+    def get(self, section: str) -> Optional[Tuple[Any, float]]:
+        """Get (payload, age) for a race-wide section if it is fresh."""
+        age = self.age(section)
+        if age is None or age > self.max_age:
+            return None
+        return self.sections[section], age
+
+    def get_car(self, section: str, car: str) -> Optional[Tuple[Any, float]]:
+        """Get (payload, age) for a car if it is current with the lap counts.
+
+        The age is the time since the car's own payload was fetched.
+        """
+        laps = self.get("laps")
+        entry = self.cars[section].get(car)
+        if laps is None or entry is None or not isinstance(laps[0], dict):
+            return None
+        lap, data, _ = entry
+        age = self.car_age(section, car)
+        if laps[0].get(car) != lap or age > self.max_age:
+            return None
+        return data, age
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get freshness of every mirrored section."""
+        sections = {}
+        for section in RACE_ENDPOINTS:
+            age = self.age(section)
+            sections[section] = {
+                "age_s": round(age, 3) if age is not None else None,
+                "fresh": self.get(section) is not None,
+            }
+        return {
+            "sections": sections,
+            "cars": {section: len(cars) for section, cars in self.cars.items()},
+            "max_age_s": self.max_age,
+        }
+
+
+class RaceStateMirror:
+    """Background task that keeps a RaceState in sync with the web server."""
+
+    def __init__(self, state: RaceState, refresh: float = RACE_STATE_REFRESH):
+        self.state = state
+        self.refresh = refresh
+        self._task: Optional[asyncio.Task] = None
+        self._users = 0
+        self._stats = {"syncs": 0, "sync_errors": 0, "car_refreshes": 0}
+
+    async def _fetch(self, endpoint: str) -> Dict[str, Any]:
+        result = await make_api_request(endpoint, use_cache=False)
+        if result.success:
+            return {"data": result.data}
+        return {"error": result.error}
+
+    def _car_needs_refresh(self, section: str, car: str, lap: Any) -> bool:
+        entry = self.state.cars[section].get(car)
+        if entry is None or entry[0] != lap:
+            return True
+        # Refresh before the next sync could find the entry stale
+        if self.state.car_age(section, car) + self.refresh >= self.state.max_age:
+            return True
+        # The edge posts lap times late; keep asking until the last one arrives
+        return section == "lap_times" and not _has_lap_time(entry[1], lap)
+
+    async def sync_once(self) -> None:
+        """Refresh race-wide sections, then cars whose lap count changed."""
+        results = await fan_out(
+            {
+                section: self._fetch(endpoint)
+                for section, endpoint in RACE_ENDPOINTS.items()
+            }
+        )
+        for section, result in results.items():
+            if "error" in result:
+                self._stats["sync_errors"] += 1
+            else:
+                self.state.update(section, result["data"])
+
+        laps = self.state.get("laps")
+        if laps is None or not isinstance(laps[0], dict):
+            return
+
+        fetches = {}
+        for car, lap in laps[0].items():
+            for section, endpoint in CAR_ENDPOINTS.items():
+                if self._car_needs_refresh(section, car, lap):
+                    fetches[(section, car, lap)] = self._fetch(endpoint.format(car=car))
+
+        results = await fan_out(fetches, max_concurrency=BULK_MAX_CONCURRENCY)
+        for (section, car, lap), result in results.items():
+            if "error" in result:
+                self._stats["sync_errors"] += 1
+            else:
+                self.state.update_car(section, car, lap, result["data"])
+                self._stats["car_refreshes"] += 1
+
+        # Keep lap statistics current as each new lap arrives
+        for (section, car, _), result in results.items():
+            if section == "pit_events" and "error" not in result:
+                stint_tracker.update_pits(car, result["data"])
+        for (section, car, _), result in results.items():
+            if section == "lap_times" and "error" not in result:
+                stint_tracker.update_laps(car, lap_store.ingest(car, result["data"]))
+        self._stats["syncs"] += 1
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                await self.sync_once()
+            except Exception as e:
+                self._stats["sync_errors"] += 1
+                logger.warning(f"Race state sync failed: {e}")
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, self.refresh - elapsed))
+
+    async def start(self) -> None:
+        """Register a user of the mirror, starting the sync task if needed."""
+        self._users += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Release a user of the mirror, stopping the sync task when unused."""
+        self._users = max(0, self._users - 1)
+        if self._users == 0 and self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sync counters and whether the mirror is running."""
+        return {
+            **self._stats,
+            "running": self._task is not None and not self._task.done(),
+            "refresh_s": self.refresh,
+        }
+
+
+# Global instances
+race_state = RaceState()
+race_state_mirror = RaceStateMirror(race_state)
+
+
+@asynccontextmanager
+async def race_state_lifespan(server: Any) -> AsyncIterator[Dict[str, Any]]:
+    """FastMCP lifespan that runs the race state mirror while serving."""
+    if not RACE_STATE_ENABLED:
+        yield {}
+        return
+
+    await race_state_mirror.start()
+    try:
+        yield {}
+    finally:
+        await race_state_mirror.stop()
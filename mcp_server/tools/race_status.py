@@ -1,17 +1,23 @@
 """Race status and track information tools."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from pydantic import Field
 
+from .race_state import race_state, with_age
 from .utils import make_api_request
 
 
-async def get_current_flag() -> Dict[str, str]:
+async def get_current_flag() -> Dict[str, Any]:
     """Get the current flag status of the race.
 
     Returns the current flag (green, yellow, red, white, checkered).
     """
+    mirrored = race_state.get("flag")
+    if mirrored is not None:
+        flag, age = mirrored
+        return {"flag": flag, "data_age_s": round(age, 3)}
+
     result = await make_api_request("/api/flag")
     if result.success:
         return {"flag": result.data}
@@ -23,6 +29,10 @@ async def get_all_flags() -> Dict[str, Any]:
 
     Returns a dictionary of all flag changes with timestamps.
     """
+    mirrored = race_state.get("flags")
+    if mirrored is not None:
+        return with_age(*mirrored)
+
     result = await make_api_request("/api/flags")
     if result.success:
         return result.data
@@ -40,15 +50,30 @@ async def get_current_lap() -> Dict[str, Any]:
     return {"error": result.error}
 
 
-async def get_all_laps() -> Dict[str, Any]:
-    """Get current lap count for all cars in the race.
+async def fetch_all_laps() -> Tuple[Dict[str, Any], Optional[float]]:
+    """Fetch lap counts for all cars, from the race state mirror when fresh.
 
-    Returns a dictionary mapping car numbers to their current lap counts.
+    Returns the car number to lap count mapping (or an error) and the
+    mirrored data's age in seconds, or None if it was fetched live.
     """
+    mirrored = race_state.get("laps")
+    if mirrored is not None:
+        return mirrored
+
     result = await make_api_request("/api/laps")
     if result.success:
-        return result.data
-    return {"error": result.error}
+        return result.data, None
+    return {"error": result.error}, None
+
+
+async def get_all_laps() -> Dict[str, Any]:
+    """Get current lap count for all cars in the race.
+
+    Returns a dictionary mapping car numbers to their current lap counts,
+    plus data_age_s when served from the race state mirror.
+    """
+    laps, age = await fetch_all_laps()
+    return laps if age is None else with_age(laps, age)
 
 
 async def get_starting_grid(
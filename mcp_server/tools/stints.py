@@ -0,0 +1,189 @@
+"""Incremental per-stint lap time statistics."""
+
+import math
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+
+class StintStats:
+    """Running statistics for one stint, updated one lap at a time.
+
+    Mean and variance use Welford's algorithm and the degradation slope is an
+    online least-squares fit of lap time against laps into the stint, so each
+    new lap costs O(1).
+    """
+
+    def __init__(self, number: int, start_lap: int):
+        self.number = number
+        self.start_lap = start_lap
+        self.laps = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.best = math.inf
+        self.best_lap: Optional[int] = None
+        self.last: Optional[float] = None
+        self.last_lap: Optional[int] = None
+        # Regression sums over x = laps into the stint, y = lap time
+        self.sum_x = 0.0
+        self.sum_xx = 0.0
+        self.sum_xy = 0.0
+
+    def add(self, lap: int, time: float) -> None:
+        """Fold a completed lap into the running statistics.
+
+        Laps may arrive out of order (a late lap time); the sums don't care.
+        """
+        self.laps += 1
+        delta = time - self.mean
+        self.mean += delta / self.laps
+        self.m2 += delta * (time - self.mean)
+
+        x = lap - self.start_lap
+        self.sum_x += x
+        self.sum_xx += x * x
+        self.sum_xy += x * time
+
+        if time < self.best:
+            self.best = time
+            self.best_lap = lap
+        if self.last_lap is None or lap > self.last_lap:
+            self.last = time
+            self.last_lap = lap
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.laps - 1) if self.laps > 1 else 0.0
+
+    @property
+    def degradation(self) -> float:
+        """Seconds of lap time lost per lap over the stint."""
+        denominator = self.laps * self.sum_xx - self.sum_x**2
+        if self.laps < 2 or denominator == 0:
+            return 0.0
+        sum_y = self.mean * self.laps
+        return (self.laps * self.sum_xy - self.sum_x * sum_y) / denominator
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = {"stint": self.number, "start_lap": self.start_lap, "laps": self.laps}
+        if self.laps:
+            stats.update(
+                {
+                    "end_lap": self.last_lap,
+                    "average": round(self.mean, 3),
+                    "stdev": round(math.sqrt(self.variance), 3),
+                    "best": self.best,
+                    "best_lap": self.best_lap,
+                    "last": self.last,
+                    "degradation_per_lap": round(self.degradation, 4),
+                }
+            )
+        return stats
+
+
+class _CarStints:
+    """Stint segmentation state for one car."""
+
+    def __init__(self):
+        self.pit_in: Set[int] = set()
+        self.pit_out: Set[int] = set()
+        self.stints: List[StintStats] = [StintStats(1, 1)]
+        self.next_lap = 1
+        # Laps seen without a time yet, added once the edge fills them in
+        self.pending: Set[int] = set()
+        self.times = np.empty(0)
+
+    def reset(self) -> None:
+        self.stints = [StintStats(1, 1)]
+        self.next_lap = 1
+        self.pending = set()
+
+    def _stint_for(self, lap: int) -> StintStats:
+        return next(s for s in reversed(self.stints) if s.start_lap <= lap)
+
+    def feed(self, times: np.ndarray) -> None:
+        """Process laps that haven't been seen yet and late lap times."""
+        self.times = times
+        for lap in sorted(self.pending):
+            if lap < times.size and not np.isnan(times[lap]):
+                self.pending.discard(lap)
+                self._stint_for(lap).add(lap, float(times[lap]))
+
+        for lap in range(max(self.next_lap, 1), times.size):
+            if lap in self.pit_out:
+                # Out lap closes the old stint; the next lap starts a new one
+                self.stints.append(StintStats(len(self.stints) + 1, lap + 1))
+            elif lap in self.pit_in:
+                continue
+            elif np.isnan(times[lap]):
+                self.pending.add(lap)
+            else:
+                self.stints[-1].add(lap, float(times[lap]))
+        self.next_lap = max(self.next_lap, times.size)
+
+
+def _lap_numbers(values: Any) -> Set[int]:
+    laps = set()
+    for value in values or []:
+        try:
+            laps.add(int(value))
+        except (TypeError, ValueError):
+            continue
+    return laps
+
+
+class StintTracker:
+    """Current and completed stint statistics for every car.
+
+    Laps are fed incrementally from the lap store; stints are split on the
+    pit-in and pit-out laps reported by /api/pit. In and out laps are left out
+    of the stint statistics.
+    """
+
+    def __init__(self):
+        self._cars: Dict[str, _CarStints] = {}
+
+    def _car(self, car: str) -> _CarStints:
+        if car not in self._cars:
+            self._cars[car] = _CarStints()
+        return self._cars[car]
+
+    def update_pits(self, car: str, pit_events: Any) -> None:
+        """Record a car's pit events, replaying its laps if a past stop appears."""
+        if not isinstance(pit_events, dict):
+            return
+        state = self._car(car)
+        pit_in = _lap_numbers(pit_events.get("in"))
+        pit_out = _lap_numbers(pit_events.get("out"))
+        if pit_in == state.pit_in and pit_out == state.pit_out:
+            return
+
+        changed = (pit_in ^ state.pit_in) | (pit_out ^ state.pit_out)
+        state.pit_in, state.pit_out = pit_in, pit_out
+        if min(changed) < state.next_lap:
+            # A stop we already processed laps past: rebuild this car's stints
+            state.reset()
+            state.feed(state.times)
+
+    def update_laps(self, car: str, times: np.ndarray) -> None:
+        """Feed a car's lap time array (indexed by lap), processing new laps."""
+        state = self._car(car)
+        if times.size < state.next_lap:
+            # Lap history shrank (new session or corrected data): start over
+            state.reset()
+        state.feed(times)
+
+    def get_stints(self, car: str) -> Optional[Dict[str, Any]]:
+        """Current stint statistics plus a summary of completed stints."""
+        state = self._cars.get(car)
+        if state is None:
+            return None
+        return {
+            "car": car,
+            "current_stint": state.stints[-1].to_dict(),
+            "completed_stints": [stint.to_dict() for stint in state.stints[:-1]],
+        }
+
+
+# Global instance
+stint_tracker = StintTracker()
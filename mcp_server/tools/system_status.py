@@ -2,7 +2,9 @@
 
 from typing import Any, Dict
 
-from .utils import make_api_request
+from .cache import response_cache
+from .race_state import race_state, race_state_mirror
+from .utils import get_http_client_stats, make_api_request
 
 
 async def check_system_health() -> Dict[str, Any]:
@@ -25,3 +27,20 @@ async def get_vehicle_id() -> Dict[str, str]:
     if result.success:
         return result.data
     return {"error": result.error}
+
+
+async def get_api_client_stats() -> Dict[str, Any]:
+    """Get connection pool and response cache statistics for the API client.
+
+    Returns request counts, how many connections were opened vs. reused, and
+    response cache hits, misses and evictions.
+    """
+    return {"http_client": get_http_client_stats(), "cache": response_cache.get_stats()}
+
+
+async def get_race_state_status() -> Dict[str, Any]:
+    """Get freshness of the in-process race state mirror.
+
+    Returns the age of each mirrored section and the mirror's sync counters.
+    """
+    return {**race_state.get_status(), "mirror": race_state_mirror.get_stats()}
@@ -1,15 +1,33 @@
 """Common utilities for MCP tools."""
 
+import asyncio
+import importlib.util
+import logging
 import os
-from typing import Any, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional, Tuple
 
 import httpx
 from pydantic import BaseModel
 
+from .cache import API_CACHE_ENABLED, get_cache_policy, response_cache
+
+logger = logging.getLogger(__name__)
+
 # Configuration
 WEB_SERVER_URL = os.getenv("WEB_SERVER_URL", "http://localhost:8000")
 API_TIMEOUT = 30
 
+# Connection pool configuration
+API_MAX_CONNECTIONS = int(os.getenv("API_MAX_CONNECTIONS", "100"))
+API_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("API_MAX_KEEPALIVE_CONNECTIONS", "20"))
+API_KEEPALIVE_EXPIRY = float(os.getenv("API_KEEPALIVE_EXPIRY", "30"))
+API_HTTP2 = os.getenv("API_HTTP2", "false").lower() == "true"
+
+# Composite tool configuration
+TOOL_DEADLINE = float(os.getenv("TOOL_DEADLINE", "10"))
+BULK_MAX_CONCURRENCY = int(os.getenv("BULK_MAX_CONCURRENCY", "8"))
+
 
 class APIResponse(BaseModel):
     """Standard API response model."""
@@ -19,25 +37,273 @@ class APIResponse(BaseModel):
     error: Optional[str] = None
 
 
-async def make_api_request(endpoint: str, method: str = "GET") -> APIResponse:
-    """Make a request to the TrackHouse web server API."""
+# Pooled clients per event loop, and how many lifespans hold each one open
+_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+_client_users: Dict[asyncio.AbstractEventLoop, int] = {}
+_client_stats = {
+    # Every attempt, including those that failed
+    "requests": 0,
+    "failed_requests": 0,
+    "connections_opened": 0,
+    "connections_reused": 0,
+    "coalesced_requests": 0,
+    "cancelled_requests": 0,
+}
+
+# In-flight GET requests keyed by (method, endpoint), shared by concurrent callers
+_inflight: Dict[Tuple[str, str], "asyncio.Task[APIResponse]"] = {}
+# Number of callers awaiting each in-flight request
+_waiters: Dict["asyncio.Task[APIResponse]", int] = {}
+
+
+def _http2_enabled() -> bool:
+    """Check whether HTTP/2 was requested and the h2 package is available."""
+    if not API_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("API_HTTP2 is set but 'h2' is not installed, using HTTP/1.1")
+        return False
+    return True
+
+
+def _create_client() -> httpx.AsyncClient:
+    """Create the pooled client used for all web server requests."""
+    limits = httpx.Limits(
+        max_connections=API_MAX_CONNECTIONS,
+        max_keepalive_connections=API_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=API_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        base_url=WEB_SERVER_URL,
+        timeout=API_TIMEOUT,
+        limits=limits,
+        http2=_http2_enabled(),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the running event loop's pooled HTTP client, creating it if needed.
+
+    A client is bound to the loop it was created on, so each loop gets its
+    own. Clients are closed by http_client_lifespan on their own loop; code
+    that runs short-lived loops (e.g. separate asyncio.run calls) should hold
+    the lifespan open so its client is closed too.
+    """
+    loop = asyncio.get_running_loop()
+    for finished in [other for other in _clients if other.is_closed()]:
+        # Its loop is gone, so it can no longer be closed; just forget it
+        del _clients[finished]
+        _client_users.pop(finished, None)
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = _create_client()
+    return client
+
+
+async def startup_http_client() -> None:
+    """Open this loop's HTTP client and register a user of it."""
+    loop = asyncio.get_running_loop()
+    _client_users[loop] = _client_users.get(loop, 0) + 1
+    get_http_client()
+
+
+async def shutdown_http_client() -> None:
+    """Release a user of this loop's HTTP client, closing it when unused."""
+    loop = asyncio.get_running_loop()
+    users = _client_users.get(loop, 0) - 1
+    if users > 0:
+        _client_users[loop] = users
+        return
+    _client_users.pop(loop, None)
+    client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+@asynccontextmanager
+async def http_client_lifespan(server: Any) -> AsyncIterator[Dict[str, Any]]:
+    """FastMCP lifespan that keeps the shared HTTP client open while serving.
+
+    The HTTP transport enters the lifespan once per session, so the client is
+    reference counted and only closed when the last session ends.
+    """
+    await startup_http_client()
     try:
-        async with httpx.AsyncClient(timeout=API_TIMEOUT) as client:
-            url = f"{WEB_SERVER_URL}{endpoint}"
-            response = await client.request(method, url)
-            response.raise_for_status()
-
-            # Handle different response types
-            content_type = response.headers.get("content-type", "")
-            if "application/json" in content_type:
-                data = response.json()
-            else:
-                data = response.text
-
-            return APIResponse(success=True, data=data)
+        yield {}
+    finally:
+        await shutdown_http_client()
+
+
+def get_http_client_stats() -> Dict[str, Any]:
+    """Get request and connection counters for the shared HTTP client."""
+    return {
+        **_client_stats,
+        "http2": _http2_enabled(),
+        "max_connections": API_MAX_CONNECTIONS,
+        "max_keepalive_connections": API_MAX_KEEPALIVE_CONNECTIONS,
+    }
+
+
+def _is_connect_event(event_name: str) -> bool:
+    """Check whether an httpcore trace event marks a newly opened connection."""
+    return event_name.startswith("connection.connect_") and event_name.endswith(
+        ".complete"
+    )
+
+
+async def _send_request(endpoint: str, method: str) -> APIResponse:
+    """Send a request over the shared client and wrap the result."""
+    opened_connection = False
+
+    async def trace(event_name: str, info: Dict[str, Any]) -> None:
+        nonlocal opened_connection
+        if _is_connect_event(event_name):
+            opened_connection = True
+
+    _client_stats["requests"] += 1
+    try:
+        client = get_http_client()
+        response = await client.request(method, endpoint, extensions={"trace": trace})
+        if opened_connection:
+            _client_stats["connections_opened"] += 1
+        else:
+            _client_stats["connections_reused"] += 1
+        response.raise_for_status()
+
+        # Handle different response types
+        content_type = response.headers.get("content-type", "")
+        if "application/json" in content_type:
+            data = response.json()
+        else:
+            data = response.text
+
+        return APIResponse(success=True, data=data)
     except httpx.HTTPStatusError as e:
+        _client_stats["failed_requests"] += 1
         return APIResponse(
             success=False, error=f"HTTP {e.response.status_code}: {e.response.text}"
         )
     except Exception as e:
+        _client_stats["failed_requests"] += 1
         return APIResponse(success=False, error=str(e))
+
+
+async def _coalesced_request(endpoint: str, method: str) -> APIResponse:
+    """Send a request, joining an identical one already in flight if any.
+
+    Concurrent callers for the same endpoint await one shared upstream request
+    instead of each hitting the web server. The shared request is cancelled
+    only once every caller waiting on it has been cancelled.
+    """
+    key = (method, endpoint)
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_send_request(endpoint, method))
+        _inflight[key] = task
+
+        def _clear(done: "asyncio.Task[APIResponse]") -> None:
+            if _inflight.get(key) is done:
+                del _inflight[key]
+            _waiters.pop(done, None)
+
+        task.add_done_callback(_clear)
+    else:
+        _client_stats["coalesced_requests"] += 1
+
+    _waiters[task] = _waiters.get(task, 0) + 1
+    try:
+        # Shield the shared request so one caller cancelling doesn't fail the rest
+        return await asyncio.shield(task)
+    finally:
+        remaining = _waiters.get(task, 1) - 1
+        if remaining:
+            _waiters[task] = remaining
+        else:
+            _waiters.pop(task, None)
+            if not task.done():
+                # Every caller was cancelled: stop the upstream request too
+                if _inflight.get(key) is task:
+                    del _inflight[key]
+                task.cancel()
+                _client_stats["cancelled_requests"] += 1
+
+
+async def make_api_request(
+    endpoint: str, method: str = "GET", use_cache: bool = True
+) -> APIResponse:
+    """Make a request to the TrackHouse web server API.
+
+    Successful GET responses are served from the response cache while fresh,
+    using the TTL configured for the endpoint in CACHE_POLICIES. Cache misses
+    for the same endpoint that arrive concurrently share one upstream request.
+    """
+    policy = None
+    if use_cache and API_CACHE_ENABLED and method == "GET":
+        policy = get_cache_policy(endpoint)
+    if policy:
+        cached = response_cache.get(endpoint)
+        if cached is not None:
+            return cached
+
+    if method == "GET":
+        result = await _coalesced_request(endpoint, method)
+    else:
+        result = await _send_request(endpoint, method)
+
+    if result.success and method == "GET":
+        if endpoint == "/api/flag":
+            response_cache.observe_flag(result.data)
+        if policy:
+            response_cache.set(endpoint, result, policy)
+
+    return result
+
+
+async def fan_out(
+    fetches: Dict[str, Awaitable[Dict[str, Any]]],
+    deadline: float = TOOL_DEADLINE,
+    max_concurrency: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Run independent tool fetches concurrently under a shared deadline.
+
+    Args:
+        fetches: Awaitables keyed by a name for each leg
+        deadline: Seconds to wait for all legs before giving up on the rest
+        max_concurrency: Optional limit on how many legs run at once
+
+    Returns results under the same keys. A leg that raises or misses the
+    deadline yields {"error": ...} so callers can return partial results.
+    """
+    if not fetches:
+        return {}
+
+    if max_concurrency:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def limited(fetch: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                return await fetch
+
+        fetches = {name: limited(fetch) for name, fetch in fetches.items()}
+
+    tasks = {name: asyncio.ensure_future(fetch) for name, fetch in fetches.items()}
+    try:
+        _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    finally:
+        # Also runs when the calling tool is cancelled, so the cancellation
+        # reaches every leg's edge request instead of leaving them running
+        unfinished = [task for task in tasks.values() if not task.done()]
+        for task in unfinished:
+            task.cancel()
+        if unfinished:
+            await asyncio.gather(*unfinished, return_exceptions=True)
+
+    results = {}
+    for name, task in tasks.items():
+        if task in pending:
+            results[name] = {"error": f"Timed out after {deadline}s"}
+        elif task.exception() is not None:
+            results[name] = {"error": str(task.exception())}
+        else:
+            results[name] = task.result()
+    return results
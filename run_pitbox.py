@@ -7,11 +7,14 @@ import sys
 from langchain_core.messages import AIMessage, HumanMessage
 
 from app.graphs.simple_pitbox import graph
+from app.tools.rag_knowledge import start_knowledge_warmup
 
 
 async def main():
     """Run the simple pitbox agent with a question from command line."""
-    
+    # Load the knowledge base while the agent works out its first step
+    start_knowledge_warmup()
+
     # Get the question from command line arguments or use default
     if len(sys.argv) > 1:
         question = " ".join(sys.argv[1:])
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+"""Build the knowledge index artifact used by the RAG tools at startup."""
+
+import logging
+import os
+import sys
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import KNOWLEDGE_INDEX_PATH  # noqa: E402
+from app.tools.rag_knowledge import build_knowledge_index  # noqa: E402
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    if not KNOWLEDGE_INDEX_PATH:
+        print("KNOWLEDGE_INDEX_PATH is empty, nothing to build")
+        return 1
+
+    index = build_knowledge_index()
+    if index is None:
+        print("No knowledge files found, nothing to index")
+        return 1
+
+    manifest = index.manifest
+    print(
+        f"Built knowledge index {manifest['version']} at {KNOWLEDGE_INDEX_PATH}: "
+        f"{manifest['count']} chunks x {manifest['dimension']} dims"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
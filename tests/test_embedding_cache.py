@@ -0,0 +1,57 @@
+"""Tests for the persistent chunk embedding cache"""
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from app.tools.embedding_cache import SQLiteByteStore, cached_embeddings
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings that remember which texts reached the "API"."""
+
+    embedded: list = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def test_restart_only_embeds_new_or_edited_chunks(tmp_path):
+    """A reopened cache serves unchanged chunks from disk."""
+    path = str(tmp_path / "cache" / "embeddings.sqlite3")
+    chunks = ["Yellow flag: caution.", "Green flag: racing.", "Pit road speed."]
+
+    first = CountingEmbeddings(size=8, embedded=[])
+    vectors = cached_embeddings(first, "model-a", path).embed_documents(chunks)
+
+    edited = chunks[:2] + ["Pit road speed is 45 mph."]
+    second = CountingEmbeddings(size=8, embedded=[])
+    reloaded = cached_embeddings(second, "model-a", path).embed_documents(edited)
+
+    assert first.embedded == chunks
+    assert second.embedded == ["Pit road speed is 45 mph."]
+    assert reloaded[:2] == vectors[:2]
+
+    # A different embedding model never reuses these vectors
+    other = CountingEmbeddings(size=8, embedded=[])
+    cached_embeddings(other, "model-b", path).embed_documents(chunks[:1])
+    assert other.embedded == chunks[:1]
+
+
+def test_sqlite_store_round_trip(tmp_path):
+    """Basic byte store operations and hit/miss counters."""
+    store = SQLiteByteStore(str(tmp_path / "kv.sqlite3"))
+    store.mset([("a:1", b"one"), ("a:2", b"two"), ("b:1", b"three")])
+
+    assert store.mget(["a:1", "missing", "b:1"]) == [b"one", None, b"three"]
+    assert sorted(store.yield_keys(prefix="a:")) == ["a:1", "a:2"]
+    store.mdelete(["a:1"])
+    assert store.mget(["a:1"]) == [None]
+
+    stats = store.get_stats()
+    assert (stats["hits"], stats["misses"], stats["writes"]) == (2, 2, 3)
+    store.close()
+
+
+def test_empty_path_disables_cache():
+    embeddings = CountingEmbeddings(size=8, embedded=[])
+    assert cached_embeddings(embeddings, "model-a", "") is embeddings
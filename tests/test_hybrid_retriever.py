@@ -0,0 +1,138 @@
+"""Tests for BM25 and hybrid knowledge retrieval"""
+
+import pytest
+from langchain_core.documents import Document
+
+from app.tools.hybrid_retriever import (
+    HybridRetriever,
+    heading_path,
+    reciprocal_rank_fusion,
+)
+
+GLOSSARY = """# Glossary
+
+## Flag Meanings
+
+### Yellow Flag
+Caution period; the pace car leads the field.
+
+### Green Flag
+Racing resumes at full speed.
+
+## Driving Terms
+
+### Loose
+The rear tires lose grip and the back end slides.
+"""
+
+TEAM = """# Team
+
+### Ross Chastain - No. 1 Chevrolet
+Chastain won at Circuit of The Americas in 2022.
+
+### Daniel Suárez - No. 99 Chevrolet
+Suárez won at Sonoma Raceway in 2022.
+"""
+
+
+def _retriever(mode="auto", dense=(2, 0, 1, 3, 4), **kwargs):
+    sources = {"glossary.txt": GLOSSARY, "team.txt": TEAM}
+    documents = []
+    for name, text in sources.items():
+        for block in text.split("\n\n"):
+            if block.startswith("### "):
+                documents.append(
+                    Document(page_content=block, metadata={"source": name})
+                )
+    calls = []
+
+    def embed_query(query):
+        calls.append(query)
+        return [1.0, 0.0]
+
+    def dense_search(vector, k, source, min_score):
+        # Scores fall by 0.1 per rank, from 0.9
+        hits = [(i, 0.9 - 0.1 * rank) for rank, i in enumerate(dense)]
+        hits = [hit for hit in hits if hit[1] >= min_score]
+        if source:
+            hits = [
+                hit for hit in hits if documents[hit[0]].metadata["source"] == source
+            ]
+        return hits[:k]
+
+    retriever = HybridRetriever.from_documents(
+        documents,
+        sources,
+        dense_search=dense_search,
+        embed_query=embed_query,
+        mode=mode,
+        k=2,
+        **kwargs,
+    )
+    return retriever, calls
+
+
+def test_exact_term_queries_use_bm25_without_embedding():
+    """Flag names and car numbers are answered locally."""
+    retriever, calls = _retriever()
+
+    flag = retriever.invoke("what does the yellow flag mean")
+    car = retriever.invoke("Who drives the #99 car?")
+
+    assert flag[0].page_content.startswith("### Yellow Flag")
+    assert car[0].page_content.startswith("### Daniel Suárez")
+    assert calls == []
+
+
+def test_chunks_match_the_headings_they_sit_under():
+    """A chunk without the term in its text still matches its section title."""
+    retriever, _ = _retriever(mode="bm25")
+    docs = retriever.invoke("flag meanings")
+    assert {doc.page_content.split("\n")[0] for doc in docs} == {
+        "### Yellow Flag",
+        "### Green Flag",
+    }
+    position = GLOSSARY.index("### Loose")
+    assert heading_path(GLOSSARY, position) == ["Glossary", "Driving Terms", "Loose"]
+    assert (
+        docs[0].metadata["section"]
+        == "Flag Meanings > " + docs[0].page_content[4:].split("\n")[0]
+    )
+
+
+@pytest.mark.parametrize(
+    "mode, expected_calls, first",
+    [("dense", 1, "### Loose"), ("hybrid", 1, "### Ross Chastain")],
+)
+def test_other_queries_embed_once(mode, expected_calls, first):
+    """Dense ranks by vector only; hybrid fuses it with BM25."""
+    retriever, calls = _retriever(mode=mode, dense=(2, 3, 0, 1))
+    docs = retriever.invoke("Chastain win")
+    assert len(calls) == expected_calls
+    assert docs[0].page_content.startswith(first)
+
+
+def test_source_filter_and_score_cutoffs():
+    """Single-source queries stay in their file; weak hits are not padded in."""
+    retriever, _ = _retriever(mode="dense", dense=(3, 0, 4, 1, 2), min_score=0.65)
+    team = retriever.retrieve("who won", source="team.txt", k=3)
+    anywhere = retriever.retrieve("who won", k=5)
+
+    assert [doc.metadata["source"] for doc in team] == ["team.txt", "team.txt"]
+    # 0.9, 0.8 and 0.7 clear the floor; 0.6 and 0.5 don't
+    assert len(anywhere) == 3
+
+    retriever, _ = _retriever(mode="bm25", relative_cutoff=0.5)
+    assert [doc.page_content[:13] for doc in retriever.retrieve("yellow flag")] == [
+        "### Yellow Fl"
+    ]
+    unfiltered = retriever.model_copy(update={"relative_cutoff": 0.0})
+    assert len(unfiltered.retrieve("yellow flag")) == 2
+    glossary = retriever.retrieve("Suárez 2022", source="glossary.txt")
+    assert glossary == []
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]], k=60)
+    assert [item for item, _ in fused] == [1, 3, 2, 4]
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 62)
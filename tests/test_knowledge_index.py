@@ -0,0 +1,70 @@
+"""Tests for the prebuilt knowledge index"""
+
+import numpy as np
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from app.tools.knowledge_index import (
+    build_index,
+    index_settings,
+    load_index,
+    load_or_build_index,
+)
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    embedded: list = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def _knowledge(tmp_path):
+    files = []
+    for name, text in [
+        ("nascar_glossary.txt", "Yellow flag: caution.\n\nGreen flag: racing."),
+        ("nascar_tracks.txt", "Daytona is 2.5 miles long."),
+    ]:
+        path = tmp_path / name
+        path.write_text(text)
+        files.append(str(path))
+    return files
+
+
+def test_index_loads_without_embedding_until_files_change(tmp_path):
+    """A fresh index is memory-mapped back; an edited file forces a rebuild."""
+    files = _knowledge(tmp_path)
+    path = str(tmp_path / "index")
+    embeddings = CountingEmbeddings(size=8, embedded=[])
+
+    built = build_index(files, 30, 0, embeddings, "fake", path)
+    loaded = load_or_build_index(files, 30, 0, embeddings, "fake", path)
+
+    assert len(embeddings.embedded) == built.manifest["count"] == 3
+    assert isinstance(loaded.vectors, np.memmap)
+    assert np.array_equal(loaded.vectors, built.vectors)
+    assert [doc.metadata["source"] for doc in loaded.documents] == [
+        "nascar_glossary.txt",
+        "nascar_glossary.txt",
+        "nascar_tracks.txt",
+    ]
+
+    (tmp_path / "nascar_tracks.txt").write_text("Daytona has 31-degree banking.")
+    embeddings.embedded.clear()
+    rebuilt = load_or_build_index(files, 30, 0, embeddings, "fake", path)
+
+    assert rebuilt.manifest["version"] != built.manifest["version"]
+    assert "Daytona has 31-degree banking." in embeddings.embedded
+
+
+def test_stale_settings_or_damaged_index_are_not_loaded(tmp_path):
+    files = _knowledge(tmp_path)
+    path = tmp_path / "index"
+    build_index(files, 30, 0, CountingEmbeddings(size=8), "fake", str(path))
+
+    assert load_index(str(path), index_settings(files, 30, 0, "fake")) is not None
+    assert load_index(str(path), index_settings(files, 30, 0, "other")) is None
+    assert load_index(str(path), index_settings(files, 40, 0, "fake")) is None
+
+    np.save(path / "vectors.npy", np.zeros((1, 8), dtype=np.float32))
+    assert load_index(str(path), index_settings(files, 30, 0, "fake")) is None
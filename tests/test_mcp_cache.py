@@ -0,0 +1,73 @@
+"""Tests for the MCP tool layer response cache"""
+
+import os
+import sys
+
+# Make the MCP server's tools package importable the same way server.py does
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "mcp_server")
+)
+
+from tools.cache import ResponseCache, get_cache_policy
+
+
+def test_cache_policies_by_endpoint():
+    """Static, live and uncacheable endpoints get the expected policies."""
+    assert get_cache_policy("/api/track/99").ttl is None
+    assert get_cache_policy("/content/1").ttl >= 3600
+    assert get_cache_policy("/api/grid").ttl >= 3600
+    assert get_cache_policy("/api/flag").ttl == 1.0
+    assert get_cache_policy("/api/pos").flag_sensitive
+    assert get_cache_policy("/health") is None
+    assert get_cache_policy("/unknown") is None
+
+
+def test_cache_hit_miss_and_expiry(monkeypatch):
+    """Entries are served until their TTL passes."""
+    now = [100.0]
+    monkeypatch.setattr("tools.cache.time.monotonic", lambda: now[0])
+
+    cache = ResponseCache(max_entries=8)
+    policy = get_cache_policy("/api/pos")
+
+    assert cache.get("/api/pos") is None
+    cache.set("/api/pos", {"1": "1"}, policy)
+    assert cache.get("/api/pos") == {"1": "1"}
+
+    now[0] += policy.ttl + 0.1
+    assert cache.get("/api/pos") is None
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["expirations"] == 1
+
+
+def test_cache_lru_eviction():
+    """The least recently used entry is evicted when the cache is full."""
+    cache = ResponseCache(max_entries=2)
+    policy = get_cache_policy("/content/1")
+
+    cache.set("/content/1", "one", policy)
+    cache.set("/content/2", "two", policy)
+    cache.get("/content/1")
+    cache.set("/content/3", "three", policy)
+
+    assert cache.get("/content/2") is None
+    assert cache.get("/content/1") == "one"
+    assert cache.get("/content/3") == "three"
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_flag_change_invalidates_live_data():
+    """A flag change drops flag-sensitive entries but keeps static ones."""
+    cache = ResponseCache()
+    cache.set("/api/pos", "positions", get_cache_policy("/api/pos"))
+    cache.set("/content", "drivers", get_cache_policy("/content"))
+
+    cache.observe_flag("green")
+    assert cache.get("/api/pos") == "positions"
+
+    cache.observe_flag("yellow")
+    assert cache.get("/api/pos") is None
+    assert cache.get("/content") == "drivers"
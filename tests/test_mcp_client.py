@@ -0,0 +1,132 @@
+"""Tests for the persistent MCP session behind the tool registry"""
+
+import asyncio
+import json
+import os
+import signal
+import time
+
+import anyio
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+
+from app.tools.mcp_client import MCPToolsClient
+
+# Runs the MCP server under a known pid, so a test can kill just that worker
+PID_RECORDING_SERVER = """
+import os, sys
+with open(os.environ["MCP_TEST_PID_FILE"], "w") as f:
+    f.write(str(os.getpid()))
+os.execv(sys.executable, [sys.executable, {server!r}])
+"""
+
+
+def _stats(tool) -> dict:
+    return json.loads(asyncio.run(tool.ainvoke({})))
+
+
+def test_session_is_reused_and_recovers(tmp_path, monkeypatch):
+    """Tools are listed once, shared across event loops and survive a crash."""
+    pid_file = tmp_path / "server.pid"
+    wrapper = tmp_path / "server.py"
+    wrapper.write_text(PID_RECORDING_SERVER.format(server=MCPToolsClient().server_path))
+    monkeypatch.setenv("MCP_TEST_PID_FILE", str(pid_file))
+    client = MCPToolsClient(transport="stdio", server_path=str(wrapper), pool_size=1)
+    try:
+        tools = client.get_tools()
+        assert tools and client.get_tools() is tools
+        tool = next(t for t in tools if t.name == "get_api_client_stats_tool")
+
+        # Each asyncio.run is a separate event loop; the session stays the same
+        assert "http_client" in _stats(tool)
+        assert "http_client" in _stats(tool)
+        assert client.get_stats()["connects"] == 1
+
+        # Kill the stdio server; the next call reconnects transparently
+        os.kill(int(pid_file.read_text()), signal.SIGKILL)
+        time.sleep(0.5)
+        assert "http_client" in _stats(tool)
+
+        stats = client.get_stats()
+        assert stats["connects"] == 2 and stats["reconnects"] == 1
+        assert stats["version"] == 1
+    finally:
+        client.close()
+
+
+def test_pool_spreads_calls_and_recycles_workers():
+    """Concurrent calls go to the least busy worker; busy workers are recycled."""
+    client = MCPToolsClient(transport="stdio", pool_size=2, max_calls=2)
+    try:
+        tool = next(
+            t for t in client.get_tools() if t.name == "get_api_client_stats_tool"
+        )
+        assert client.get_stats()["ready_workers"] == 2
+
+        async def burst():
+            return await asyncio.gather(*(tool.ainvoke({}) for _ in range(4)))
+
+        assert len(asyncio.run(burst())) == 4
+
+        # Each worker took two calls, hit max_calls and is replaced in place
+        deadline = time.monotonic() + 30
+        while client.get_stats()["recycles"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.2)
+        stats = client.get_stats()
+        assert stats["recycles"] == 2
+        assert stats["connects"] == 4
+        assert "http_client" in _stats(tool)
+    finally:
+        client.close()
+
+
+class FakeWorker:
+    """Worker stand-in whose calls fail with the given errors, in order."""
+
+    index = 0
+    ready = True
+    draining = False
+    in_flight = 0
+    generation = 1
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.tools = {"get_current_flag_tool": None}
+        self.calls = 0
+        self.restarts = 0
+        self.started_at = time.monotonic()
+
+    async def call(self, name, arguments):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "green"
+
+    async def restart(self, generation):
+        self.restarts += 1
+        return True
+
+
+def _call_with(worker):
+    client = MCPToolsClient(transport="stdio", pool_size=1)
+    client._workers = [worker]
+    return asyncio.run(client._call_tool("get_current_flag_tool", {}))
+
+
+def test_only_unsent_calls_are_retried():
+    """A closed transport is retried on a fresh session; other errors aren't."""
+    worker = FakeWorker(anyio.ClosedResourceError())
+    assert _call_with(worker) == "green"
+    assert worker.calls == 2 and worker.restarts == 1
+
+    # The server may already be running the tool: never send it twice
+    for error in (
+        McpError(ErrorData(code=408, message="Timed out")),
+        asyncio.TimeoutError(),
+        RuntimeError("connection reset"),
+    ):
+        worker = FakeWorker(error)
+        with pytest.raises(type(error)):
+            _call_with(worker)
+        assert worker.calls == 1 and worker.restarts == 0
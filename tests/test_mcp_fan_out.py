@@ -0,0 +1,140 @@
+"""Tests for concurrent fan-out in the composite MCP analysis tools"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Make the MCP server's tools package importable the same way server.py does
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "mcp_server")
+)
+
+from tools import analysis, car_data
+from tools.utils import fan_out
+
+
+async def _delayed(value, delay):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def _failing():
+    raise RuntimeError("edge server unreachable")
+
+
+def test_fan_out_runs_legs_concurrently():
+    """Total latency is the slowest leg, not the sum of legs."""
+    start = time.perf_counter()
+    results = asyncio.run(
+        fan_out({"a": _delayed({"a": 1}, 0.2), "b": _delayed({"b": 2}, 0.2)})
+    )
+    elapsed = time.perf_counter() - start
+
+    assert results == {"a": {"a": 1}, "b": {"b": 2}}
+    assert elapsed < 0.35
+
+
+def test_fan_out_partial_results():
+    """Failed and timed out legs become errors without losing the others."""
+    results = asyncio.run(
+        fan_out(
+            {
+                "ok": _delayed({"value": 1}, 0),
+                "failed": _failing(),
+                "slow": _delayed({"value": 2}, 5),
+            },
+            deadline=0.2,
+        )
+    )
+
+    assert results["ok"] == {"value": 1}
+    assert results["failed"] == {"error": "edge server unreachable"}
+    assert "Timed out" in results["slow"]["error"]
+
+
+def test_cancelled_tool_cancels_its_legs():
+    """Cancelling the calling tool mid fan-out stops every leg."""
+    finished = []
+    cancelled = []
+
+    async def leg(name):
+        try:
+            await asyncio.sleep(0.2)
+            finished.append(name)
+        except asyncio.CancelledError:
+            cancelled.append(name)
+            raise
+        return {}
+
+    async def scenario():
+        tool = asyncio.create_task(fan_out({"a": leg("a"), "b": leg("b")}))
+        await asyncio.sleep(0.05)
+        tool.cancel()
+        try:
+            await tool
+        except asyncio.CancelledError:
+            pass
+        await asyncio.sleep(0.3)
+
+    asyncio.run(scenario())
+
+    assert finished == []
+    assert sorted(cancelled) == ["a", "b"]
+
+
+def test_race_leader_without_lap_counts(monkeypatch):
+    """The leader is still reported when the laps leg fails."""
+
+    async def positions():
+        return {"1": "2", "99": "1"}, 0.2
+
+    async def laps():
+        return {"error": "HTTP 503: unavailable"}, None
+
+    monkeypatch.setattr(analysis, "fetch_all_positions", positions)
+    monkeypatch.setattr(analysis, "fetch_all_laps", laps)
+
+    result = asyncio.run(analysis.analyze_race_leader())
+
+    assert result["leader"] == "99"
+    assert result["second_place"] == "1"
+    assert result["errors"] == {"laps": "HTTP 503: unavailable"}
+    assert "gap_laps" not in result
+
+
+def test_multi_car_lap_times_bounded_concurrency(monkeypatch):
+    """The bulk tool fetches every car under the concurrency limit."""
+    active = 0
+    peak = 0
+
+    async def positions():
+        return {str(car): str(car) for car in range(1, 21)}, None
+
+    async def lap_time(car_number, lap_number):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if car_number == "13":
+            return {"error": "HTTP 404: not found"}
+        base = 30.0 + int(car_number) / 10
+        return {"car": car_number, "lap_times": {"1": base + 1, "2": base, "3": base}}
+
+    monkeypatch.setattr(car_data, "fetch_all_positions", positions)
+    monkeypatch.setattr(car_data, "get_lap_time", lap_time)
+    monkeypatch.setattr(car_data, "BULK_MAX_CONCURRENCY", 4)
+
+    result = asyncio.run(car_data.get_multi_car_lap_times(["all"], 2, 3))
+
+    assert peak <= 4
+    assert len(result["cars"]) == 19
+    assert result["errors"] == {"13": "HTTP 404: not found"}
+    assert result["cars"][0] == {
+        "car": "1",
+        "laps": 2,
+        "best": 30.1,
+        "average": 30.1,
+        "last": 30.1,
+    }
@@ -0,0 +1,142 @@
+"""Tests for the shared HTTP client behind the MCP tools"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Make the MCP server's tools package importable the same way server.py does
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "mcp_server")
+)
+
+from tools import utils
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def handle(self):
+        # Count connections the client still holds open
+        self.server.open_connections += 1
+        try:
+            super().handle()
+        finally:
+            self.server.open_connections -= 1
+
+    def do_GET(self):
+        if self.path == "/api/fail":
+            self.send_response(500)
+            self.send_header("content-length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def edge_server(monkeypatch):
+    """Run a keep-alive edge server and give the tools a fresh client."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.daemon_threads = True
+    server.open_connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        utils, "WEB_SERVER_URL", f"http://127.0.0.1:{server.server_port}"
+    )
+    monkeypatch.setattr(utils, "_clients", {})
+    monkeypatch.setattr(utils, "_client_users", {})
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_counted_as_opened_or_reused(edge_server):
+    """Sequential requests share one pooled keep-alive connection."""
+    before = utils.get_http_client_stats()
+
+    async def requests():
+        async with utils.http_client_lifespan(None):
+            for _ in range(3):
+                assert (
+                    await utils.make_api_request("/api/pos", use_cache=False)
+                ).success
+
+    asyncio.run(requests())
+    after = utils.get_http_client_stats()
+
+    assert after["requests"] - before["requests"] == 3
+    assert after["connections_opened"] - before["connections_opened"] == 1
+    assert after["connections_reused"] - before["connections_reused"] == 2
+
+
+def test_failed_requests_are_counted_as_attempts(edge_server):
+    before = utils.get_http_client_stats()
+
+    async def requests():
+        async with utils.http_client_lifespan(None):
+            assert (await utils.make_api_request("/api/pos", use_cache=False)).success
+            assert not (
+                await utils.make_api_request("/api/fail", use_cache=False)
+            ).success
+
+    asyncio.run(requests())
+    after = utils.get_http_client_stats()
+
+    assert after["requests"] - before["requests"] == 2
+    assert after["failed_requests"] - before["failed_requests"] == 1
+
+
+def test_lifespan_keeps_client_open_until_last_session_exits(edge_server):
+    async def sessions():
+        async with utils.http_client_lifespan(None):
+            client = utils.get_http_client()
+            async with utils.http_client_lifespan(None):
+                assert utils.get_http_client() is client
+            # One session still open: the client must survive the other's exit
+            assert not client.is_closed
+            assert (await utils.make_api_request("/api/pos", use_cache=False)).success
+        return client
+
+    client = asyncio.run(sessions())
+
+    assert client.is_closed
+    assert not utils._clients and not utils._client_users
+
+
+def test_lifespan_exit_closes_its_loops_connections(edge_server):
+    async def session():
+        async with utils.http_client_lifespan(None):
+            await utils.make_api_request("/api/pos", use_cache=False)
+            assert edge_server.open_connections == 1
+
+    asyncio.run(session())
+
+    deadline = time.monotonic() + 2
+    while edge_server.open_connections and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert edge_server.open_connections == 0
+
+
+def test_each_event_loop_gets_its_own_client(edge_server):
+    async def session():
+        async with utils.http_client_lifespan(None):
+            assert (await utils.make_api_request("/api/pos", use_cache=False)).success
+            return utils.get_http_client()
+
+    first = asyncio.run(session())
+    second = asyncio.run(session())
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
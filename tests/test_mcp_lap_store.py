@@ -0,0 +1,81 @@
+"""Tests for the columnar lap time store"""
+
+import os
+import sys
+
+import numpy as np
+
+# Make the MCP server's tools package importable the same way server.py does
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "mcp_server")
+)
+
+from tools.lap_store import MAX_LAPS, LapTimeStore, parse_lap_times
+
+LAP_TIMES = {"1": "31.0", "2": "30.0", "3": "bad", "4": "30.5", "5": "0", "6": "29.5"}
+
+
+def test_ingest_indexes_by_lap():
+    """Lap times land at their lap index with invalid laps as NaN."""
+    store = LapTimeStore()
+    times = store.ingest("99", LAP_TIMES)
+
+    assert times.size == 7
+    assert times[2] == 30.0
+    assert np.isnan(times[3]) and np.isnan(times[5])
+    assert store.laps("99", 2, 4).tolist() == [30.0, 30.5]
+
+
+def test_laps_outside_the_race_are_dropped():
+    """Out-of-range lap keys are bad data and must not size the arrays."""
+    payload = {"-1": "30.0", "0": "30.0", "1": "31.0", str(MAX_LAPS + 1): "30.0"}
+
+    assert parse_lap_times(payload) == {1: 31.0}
+    assert LapTimeStore().ingest("99", payload).size == 2
+
+
+def test_ingest_skips_unchanged_payload():
+    """Re-ingesting the same payload object reuses the parsed array."""
+    store = LapTimeStore()
+    first = store.ingest("99", LAP_TIMES)
+
+    assert store.ingest("99", LAP_TIMES) is first
+    assert store.ingest("99", dict(LAP_TIMES)) is not first
+
+
+def test_stats_over_lap_range():
+    """Stats cover only valid laps in the inclusive range."""
+    store = LapTimeStore()
+    store.ingest("99", LAP_TIMES)
+
+    stats = store.stats("99", start_lap=2, window=2)
+    assert stats["laps"] == 3
+    assert stats["average"] == 30.0
+    assert stats["best"] == 29.5
+    assert stats["best_lap"] == 6
+    assert stats["median"] == 30.0
+    assert stats["last"] == 29.5
+    assert stats["rolling_average"] == 30.0
+
+    assert store.stats("99", start_lap=50) == {"car": "99", "laps": 0}
+    assert store.rolling_mean("99", window=2).tolist() == [30.5, 30.25, 30.0]
+
+
+def test_field_stats_match_per_car_stats():
+    """Vectorized field stats agree with the per-car computation."""
+    rng = np.random.default_rng(7)
+    store = LapTimeStore()
+    cars = [str(car) for car in range(1, 41)]
+    for car in cars:
+        laps = rng.integers(400, 500)
+        store.ingest(car, {lap: 30 + rng.random() for lap in range(1, laps + 1)})
+
+    field = store.field_stats(cars + ["missing"], start_lap=100, end_lap=450)
+
+    assert set(field) == set(cars)
+    for car in cars:
+        single = store.stats(car, 100, 450)
+        assert field[car]["laps"] == single["laps"]
+        assert field[car]["best"] == single["best"]
+        assert field[car]["average"] == single["average"]
+        assert field[car]["last"] == single["last"]
@@ -0,0 +1,190 @@
+"""Tests for the in-process race state mirror"""
+
+import asyncio
+import os
+import sys
+from collections import Counter
+
+# Make the MCP server's tools package importable the same way server.py does
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "mcp_server")
+)
+
+from tools import analysis, car_data, pit_stop, race_state, race_status
+from tools.race_state import RaceState, RaceStateMirror
+from tools.stints import StintTracker
+from tools.utils import APIResponse
+
+EDGE_DATA = {
+    "/api/pos": {"1": "2", "99": "1"},
+    "/api/laps": {"1": "2", "99": "2"},
+    "/api/flag": "green",
+    "/api/flags": {"0": "green"},
+    "/api/lt/1": {"1": "30.5", "2": "30.1"},
+    "/api/lt/99": {"1": "30.2", "2": "30.0"},
+    "/api/pit/1": {"in": [], "out": []},
+    "/api/pit/99": {"in": [], "out": []},
+}
+
+
+def _fake_edge_server(monkeypatch):
+    """Serve EDGE_DATA to the mirror and count requests per endpoint."""
+    hits = Counter()
+
+    async def make_api_request(endpoint, method="GET", use_cache=True):
+        hits[endpoint] += 1
+        return APIResponse(success=True, data=EDGE_DATA[endpoint])
+
+    monkeypatch.setattr(race_state, "make_api_request", make_api_request)
+    return hits
+
+
+def test_sync_refreshes_cars_only_when_lap_changes(monkeypatch):
+    """Per-car data is fetched once per lap, race-wide data on every sync."""
+    hits = _fake_edge_server(monkeypatch)
+    mirror = RaceStateMirror(RaceState())
+
+    asyncio.run(mirror.sync_once())
+    asyncio.run(mirror.sync_once())
+    assert hits["/api/pos"] == 2
+    assert hits["/api/lt/99"] == 1
+
+    monkeypatch.setitem(EDGE_DATA, "/api/laps", {"1": "2", "99": "3"})
+    monkeypatch.setitem(
+        EDGE_DATA, "/api/lt/99", {"1": "30.2", "2": "30.0", "3": "30.1"}
+    )
+    asyncio.run(mirror.sync_once())
+    assert hits["/api/lt/99"] == 2
+    assert hits["/api/lt/1"] == 1
+
+    lap_times, age = mirror.state.get_car("lap_times", "99")
+    assert lap_times == EDGE_DATA["/api/lt/99"]
+    assert age < 1
+
+
+def test_stale_state_is_not_served(monkeypatch):
+    """Sections older than max_age read as cold."""
+    now = [100.0]
+    monkeypatch.setattr("tools.race_state.time.monotonic", lambda: now[0])
+
+    state = RaceState(max_age=5.0)
+    assert state.get("positions") is None
+
+    state.update("positions", {"99": "1"})
+    assert state.get("positions") == ({"99": "1"}, 0.0)
+
+    now[0] += 6.0
+    assert state.get("positions") is None
+    assert state.get_status()["sections"]["positions"]["fresh"] is False
+
+
+def test_tools_answer_from_warm_mirror(monkeypatch):
+    """Tools read the mirror when warm and fall back to requests when cold."""
+    _fake_edge_server(monkeypatch)
+    state = RaceState()
+    monkeypatch.setattr(car_data, "race_state", state)
+
+    requested = []
+
+    async def make_api_request(endpoint, method="GET", use_cache=True):
+        requested.append(endpoint)
+        return APIResponse(success=True, data="3")
+
+    monkeypatch.setattr(car_data, "make_api_request", make_api_request)
+
+    cold = asyncio.run(car_data.get_car_position("99"))
+    assert cold == {"car": "99", "position": "3"}
+    assert requested == ["/api/pos/99"]
+
+    asyncio.run(RaceStateMirror(state).sync_once())
+    warm = asyncio.run(car_data.get_car_position("99"))
+    assert warm["position"] == "1"
+    assert "data_age_s" in warm
+    assert requested == ["/api/pos/99"]
+
+
+def test_stint_stats_fetch_only_cars_the_mirror_does_not_cover(monkeypatch):
+    """Mirrored cars come straight from the stint tracker the mirror feeds."""
+    _fake_edge_server(monkeypatch)
+    state, tracker = RaceState(), StintTracker()
+    monkeypatch.setattr(analysis, "race_state", state)
+    monkeypatch.setattr(analysis, "stint_tracker", tracker)
+    monkeypatch.setattr(race_state, "stint_tracker", tracker)
+    asyncio.run(RaceStateMirror(state).sync_once())
+
+    fetched = []
+
+    async def load_lap_times(car_number):
+        fetched.append(car_number)
+        return {"car": car_number, "lap_times": {"1": "31.0"}}
+
+    async def get_pit_events(car_number):
+        return {"in": [], "out": []}
+
+    monkeypatch.setattr(analysis, "load_lap_times", load_lap_times)
+    monkeypatch.setattr(analysis, "get_pit_events", get_pit_events)
+
+    result = asyncio.run(analysis.get_stint_stats(["99", "7"]))
+
+    assert fetched == ["7"]
+    assert [stints["car"] for stints in result["cars"]] == ["99", "7"]
+    assert result["cars"][0]["current_stint"]["laps"] == 2
+
+
+def test_race_wide_tools_report_mirror_age(monkeypatch):
+    """Mirrored race-wide maps carry data_age_s; live responses don't."""
+    _fake_edge_server(monkeypatch)
+    state = RaceState()
+    for module in (car_data, race_status, pit_stop):
+        monkeypatch.setattr(module, "race_state", state)
+
+    async def make_api_request(endpoint, method="GET", use_cache=True):
+        return APIResponse(success=True, data=EDGE_DATA[endpoint])
+
+    monkeypatch.setattr(car_data, "make_api_request", make_api_request)
+    assert asyncio.run(car_data.get_all_positions()) == EDGE_DATA["/api/pos"]
+
+    asyncio.run(RaceStateMirror(state).sync_once())
+    for tool, endpoint in (
+        (car_data.get_all_positions(), "/api/pos"),
+        (race_status.get_all_laps(), "/api/laps"),
+        (race_status.get_all_flags(), "/api/flags"),
+        (pit_stop.get_pit_events("99"), "/api/pit/99"),
+    ):
+        result = asyncio.run(tool)
+        age = result.pop("data_age_s")
+        assert result == EDGE_DATA[endpoint]
+        assert 0 <= age < 1
+
+    # The mirror's own payload is left untouched
+    assert "data_age_s" not in state.get("positions")[0]
+
+
+def test_late_lap_times_and_aging_entries_are_refetched(monkeypatch):
+    """A car is refetched until its last lap has a time, and before going stale."""
+    now = [100.0]
+    monkeypatch.setattr("tools.race_state.time.monotonic", lambda: now[0])
+    hits = _fake_edge_server(monkeypatch)
+    monkeypatch.setitem(EDGE_DATA, "/api/lt/99", {"1": "30.2", "2": ""})
+    mirror = RaceStateMirror(RaceState(max_age=5.0), refresh=1.0)
+
+    asyncio.run(mirror.sync_once())
+    asyncio.run(mirror.sync_once())
+    assert hits["/api/lt/99"] == 2 and hits["/api/lt/1"] == 1
+
+    monkeypatch.setitem(EDGE_DATA, "/api/lt/99", {"1": "30.2", "2": "30.0"})
+    asyncio.run(mirror.sync_once())
+    asyncio.run(mirror.sync_once())
+    assert hits["/api/lt/99"] == 3
+    assert mirror.state.get_car("lap_times", "99")[0]["2"] == "30.0"
+
+    # The reported age is the car's own, not the lap counts'
+    now[0] += 2.0
+    asyncio.run(mirror.sync_once())
+    assert mirror.state.get_car("lap_times", "1") == (EDGE_DATA["/api/lt/1"], 2.0)
+
+    # Entries are refreshed before they would exceed max_age
+    now[0] += 2.0
+    asyncio.run(mirror.sync_once())
+    assert hits["/api/lt/1"] == 2 and hits["/api/pit/1"] == 2
+    assert mirror.state.get_car("lap_times", "1")[1] == 0.0
@@ -0,0 +1,145 @@
+"""Stress tests for single-flight request coalescing in the MCP tool layer"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Make the MCP server's tools package importable the same way server.py does
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "mcp_server")
+)
+
+from tools import analyze_race_leader, utils
+from tools.cache import response_cache
+
+# Stand-in edge server data
+RACE_DATA = {
+    "/api/pos": {"1": "2", "99": "1", "88": "3"},
+    "/api/laps": {"1": "120", "99": "121", "88": "120"},
+}
+UPSTREAM_DELAY = 0.1
+NUM_CALLERS = 300
+
+
+class StandInEdgeServer(ThreadingHTTPServer):
+    """Local edge server that counts requests per path."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.hits = Counter()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.hits[self.path] += 1
+        # Slow enough that concurrent callers overlap
+        time.sleep(UPSTREAM_DELAY)
+
+        body = json.dumps(RACE_DATA.get(self.path, {})).encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def edge_server(monkeypatch):
+    """Run a stand-in edge server and point the MCP tools at it."""
+    server = StandInEdgeServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(utils, "WEB_SERVER_URL", server.url)
+    response_cache.invalidate()
+    yield server
+    server.shutdown()
+    server.server_close()
+    response_cache.invalidate()
+
+
+async def _run_concurrently(tool, count):
+    async with utils.http_client_lifespan(None):
+        return await asyncio.gather(*(tool() for _ in range(count)))
+
+
+def test_concurrent_leader_checks_share_upstream_requests(edge_server):
+    """Hundreds of concurrent leader checks collapse into one request per endpoint."""
+    results = asyncio.run(_run_concurrently(analyze_race_leader, NUM_CALLERS))
+
+    assert all(result["leader"] == "99" for result in results)
+    assert all(result["second_place"] == "1" for result in results)
+    assert edge_server.hits["/api/pos"] == 1
+    assert edge_server.hits["/api/laps"] == 1
+
+
+def test_coalescing_without_cache(edge_server, monkeypatch):
+    """Coalescing alone deduplicates concurrent misses when caching is off."""
+    monkeypatch.setattr(utils, "API_CACHE_ENABLED", False)
+
+    before = utils.get_http_client_stats()["coalesced_requests"]
+    asyncio.run(_run_concurrently(analyze_race_leader, NUM_CALLERS))
+    coalesced = utils.get_http_client_stats()["coalesced_requests"] - before
+
+    assert edge_server.hits["/api/pos"] == 1
+    assert edge_server.hits["/api/laps"] == 1
+    assert coalesced == 2 * (NUM_CALLERS - 1)
+
+
+def test_sequential_requests_are_not_coalesced(edge_server, monkeypatch):
+    """Requests that don't overlap each go upstream when caching is off."""
+    monkeypatch.setattr(utils, "API_CACHE_ENABLED", False)
+
+    async def sequential():
+        async with utils.http_client_lifespan(None):
+            for _ in range(3):
+                await utils.make_api_request("/api/pos")
+
+    asyncio.run(sequential())
+    assert edge_server.hits["/api/pos"] == 3
+
+
+def test_shared_request_cancelled_only_when_all_callers_cancel(edge_server):
+    """One caller cancelling leaves the shared request running for the others."""
+
+    async def scenario():
+        async with utils.http_client_lifespan(None):
+            before = utils.get_http_client_stats()["cancelled_requests"]
+            first = asyncio.create_task(utils.make_api_request("/api/pos"))
+            second = asyncio.create_task(utils.make_api_request("/api/pos"))
+            await asyncio.sleep(0.02)
+            first.cancel()
+            result = await second
+
+            abandoned = asyncio.create_task(utils.make_api_request("/api/laps"))
+            await asyncio.sleep(0.02)
+            abandoned.cancel()
+            await asyncio.gather(abandoned, return_exceptions=True)
+            cancelled = utils.get_http_client_stats()["cancelled_requests"] - before
+            return result, cancelled
+
+    result, cancelled = asyncio.run(scenario())
+
+    assert result.success and result.data["99"] == "1"
+    assert edge_server.hits["/api/pos"] == 1
+    assert cancelled == 1
+    assert not utils._inflight and not utils._waiters
@@ -0,0 +1,84 @@
+"""Tests for incremental stint statistics"""
+
+import os
+import sys
+
+import numpy as np
+
+# Make the MCP server's tools package importable the same way server.py does
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "mcp_server")
+)
+
+from tools.stints import StintStats, StintTracker
+
+
+def _lap_array(times):
+    """Lap time array indexed by lap number, as held by the lap store."""
+    return np.concatenate([[np.nan], times])
+
+
+def test_running_stats_match_batch_computation():
+    """Online mean, variance and slope agree with NumPy over the same laps."""
+    rng = np.random.default_rng(3)
+    laps = np.arange(5, 65)
+    times = 30 + 0.02 * (laps - 5) + rng.normal(0, 0.1, laps.size)
+
+    stint = StintStats(1, 5)
+    for lap, time in zip(laps, times):
+        stint.add(int(lap), float(time))
+
+    assert np.isclose(stint.mean, times.mean())
+    assert np.isclose(stint.variance, times.var(ddof=1))
+    assert np.isclose(stint.degradation, np.polyfit(laps - 5, times, 1)[0])
+    assert stint.best == times.min()
+
+
+def test_stints_split_on_pit_laps():
+    """In and out laps are excluded and the out lap starts a new stint."""
+    tracker = StintTracker()
+    tracker.update_pits("99", {"in": ["4"], "out": ["5"]})
+    tracker.update_laps("99", _lap_array([31.0, 30.0, 30.2, 45.0, 50.0, 30.4, 30.6]))
+
+    stints = tracker.get_stints("99")
+    first = stints["completed_stints"][0]
+    current = stints["current_stint"]
+
+    assert first["laps"] == 3 and first["end_lap"] == 3
+    assert current["stint"] == 2 and current["start_lap"] == 6
+    assert current["laps"] == 2
+    assert current["average"] == 30.5
+    assert current["degradation_per_lap"] == 0.2
+
+
+def test_laps_are_processed_incrementally():
+    """Only new laps are folded in, and a late pit stop triggers a rebuild."""
+    tracker = StintTracker()
+    times = [30.0, 30.1, 30.2]
+    tracker.update_laps("1", _lap_array(times))
+    tracker.update_laps("1", _lap_array(times))
+    assert tracker.get_stints("1")["current_stint"]["laps"] == 3
+
+    times += [44.0, 49.0, 30.3]
+    tracker.update_laps("1", _lap_array(times))
+    assert tracker.get_stints("1")["current_stint"]["laps"] == 6
+
+    tracker.update_pits("1", {"in": [4], "out": [5]})
+    stints = tracker.get_stints("1")
+    assert stints["completed_stints"][0]["laps"] == 3
+    assert stints["current_stint"]["laps"] == 1
+
+
+def test_late_lap_time_is_added_on_a_later_sync():
+    """A lap whose time arrives one sync late still counts toward its stint."""
+    tracker = StintTracker()
+    tracker.update_pits("99", {"in": [4], "out": [5]})
+    tracker.update_laps("99", _lap_array([30.0, np.nan, 30.2]))
+    assert tracker.get_stints("99")["current_stint"]["laps"] == 2
+
+    tracker.update_laps("99", _lap_array([30.0, 30.1, 30.2, 45.0, 50.0, 30.4]))
+    first = tracker.get_stints("99")["completed_stints"][0]
+    assert first["laps"] == 3
+    assert first["average"] == 30.1
+    assert first["last"] == 30.2 and first["end_lap"] == 3
+    assert first["degradation_per_lap"] == 0.1
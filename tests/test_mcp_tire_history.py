@@ -0,0 +1,119 @@
+"""Tests for the tire history matrix and per-stint wear rates"""
+
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Make the MCP server's tools package importable the same way server.py does
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "mcp_server")
+)
+
+from tools import pit_stop
+
+# Car 99 pits and comes out on lap 4 with fresh tires
+WEAR = {
+    "1": {lap: 1.0 - 0.01 * lap for lap in range(1, 7)},
+    "99": {1: 0.98, 2: 0.96, 3: 0.94, 4: 1.0, 5: 0.97, 6: 0.94},
+}
+
+
+@pytest.fixture
+def edge(monkeypatch):
+    """Fake tire and pit endpoints; records the laps requested."""
+    requested = []
+
+    async def tire_data(lap_number, car_number=None):
+        requested.append((lap_number, car_number))
+        tires = {
+            car: {"LF": laps[lap_number], "RF": {"wear": laps[lap_number]}}
+            for car, laps in WEAR.items()
+            if lap_number in laps
+        }
+        if lap_number == 2:
+            # Car 1's reading is missing for lap 2
+            del tires["1"]
+        if car_number:
+            # The single-car endpoint returns the corners without the car key
+            return {"lap": lap_number, "tires": tires[car_number]}
+        return {"lap": lap_number, "tires": tires}
+
+    async def pit_events(car_number):
+        return {"in": [3], "out": [4]} if car_number == "99" else {"in": [], "out": []}
+
+    monkeypatch.setattr(pit_stop, "get_tire_data", tire_data)
+    monkeypatch.setattr(pit_stop, "get_pit_events", pit_events)
+    return requested
+
+
+def test_matrix_is_laps_by_cars_by_corners(edge):
+    result = asyncio.run(pit_stop.get_tire_history(1, 6, None))
+
+    assert result["laps"] == [1, 2, 3, 4, 5, 6]
+    assert result["cars"] == ["1", "99"]
+    assert result["corners"] == ["LF", "RF"]
+    matrix = result["matrix"]
+    assert len(matrix) == 6 and all(len(row) == 2 for row in matrix)
+    assert matrix[3][1] == [1.0, 1.0]
+    # Missing readings are None, not zero
+    assert matrix[1][0] == [None, None]
+    assert "errors" not in result
+
+
+def test_stints_split_on_pit_out_laps(edge):
+    result = asyncio.run(pit_stop.get_tire_history(1, 6, None))
+
+    stints = result["stint_wear"]["99"]
+    assert [(s["start_lap"], s["end_lap"]) for s in stints] == [(1, 3), (4, 6)]
+    assert stints[0]["wear_per_lap"] == {"LF": -0.02, "RF": -0.02}
+    assert stints[1]["wear_per_lap"] == {"LF": -0.03, "RF": -0.03}
+    # Car 1 never pits, so one stint whose rate skips the lap 2 gap
+    assert result["stint_wear"]["1"] == [
+        {"start_lap": 1, "end_lap": 6, "wear_per_lap": {"LF": -0.01, "RF": -0.01}}
+    ]
+
+
+def test_wear_rates_ignore_gaps():
+    laps = np.array([1.0, 2.0, 3.0, 4.0])
+    values = np.array(
+        [
+            [1.0, np.nan, np.nan],
+            [np.nan, 0.5, np.nan],
+            [0.96, np.nan, np.nan],
+            [0.94, np.nan, np.nan],
+        ]
+    )
+
+    rates = pit_stop._wear_rates(laps, values)
+
+    assert rates[0] == pytest.approx(-0.02)
+    # One reading, or none, is not enough for a rate
+    assert np.isnan(rates[1]) and np.isnan(rates[2])
+
+
+def test_long_ranges_are_truncated(edge, monkeypatch):
+    monkeypatch.setattr(pit_stop, "MAX_TIRE_LAPS", 3)
+
+    result = asyncio.run(pit_stop.get_tire_history(2, 100, None))
+
+    assert result["laps"] == [2, 3, 4]
+    assert sorted(lap for lap, _ in edge) == [2, 3, 4]
+    assert result["stint_wear"]["99"][-1]["end_lap"] == 4
+
+
+def test_single_car_response_is_keyed_by_car(edge):
+    result = asyncio.run(pit_stop.get_tire_history(3, 5, ["99"]))
+
+    assert all(car == "99" for _, car in edge)
+    assert result["cars"] == ["99"]
+    assert [row[0][0] for row in result["matrix"]] == [0.94, 1.0, 0.97]
+
+
+def test_no_readings_returns_an_empty_matrix(edge):
+    # No car has readings past lap 6
+    result = asyncio.run(pit_stop.get_tire_history(7, 8, None))
+
+    assert result == {"laps": [7, 8], "cars": [], "corners": [], "matrix": []}
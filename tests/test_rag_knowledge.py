@@ -0,0 +1,218 @@
+"""Tests for the shared knowledge RAG instance"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from app.tools import rag_knowledge
+from app.tools.semantic_cache import SemanticAnswerCache, knowledge_fingerprint
+
+
+class SlowRAG:
+    """Stand-in for NASCARKnowledgeRAG that takes a while to build."""
+
+    built = 0
+    fail = False
+    delay = 0.05
+    index = None
+
+    def __init__(self):
+        time.sleep(SlowRAG.delay)
+        if SlowRAG.fail:
+            raise RuntimeError("embeddings unavailable")
+        SlowRAG.built += 1
+
+
+@pytest.fixture
+def cold_rag(monkeypatch):
+    SlowRAG.built, SlowRAG.fail, SlowRAG.delay = 0, False, 0.05
+    monkeypatch.setattr(rag_knowledge, "NASCARKnowledgeRAG", SlowRAG)
+    monkeypatch.setattr(rag_knowledge, "_knowledge_rag", None)
+    monkeypatch.setattr(rag_knowledge, "_warmup_thread", None)
+    monkeypatch.setattr(rag_knowledge, "KNOWLEDGE_WARMUP", True)
+    monkeypatch.setattr(
+        rag_knowledge,
+        "_knowledge_status",
+        {"state": "cold", "error": None, "init_seconds": None},
+    )
+
+
+def test_concurrent_cold_callers_share_one_build(cold_rag):
+    """Requests during a cold start wait on one build instead of each building."""
+    barrier = threading.Barrier(8)
+
+    def call():
+        barrier.wait()
+        return rag_knowledge.get_knowledge_rag()
+
+    with ThreadPoolExecutor(8) as pool:
+        instances = list(pool.map(lambda _: call(), range(8)))
+
+    assert SlowRAG.built == 1
+    assert all(instance is instances[0] for instance in instances)
+    status = rag_knowledge.get_knowledge_status()
+    assert status["state"] == "ready" and status["ready"]
+    assert status["init_seconds"] >= 0.05
+
+
+def test_warmup_builds_in_background(cold_rag):
+    """Warmup starts once; tool calls during it get the warmed instance."""
+    thread = rag_knowledge.start_knowledge_warmup()
+    assert rag_knowledge.start_knowledge_warmup() is thread
+    time.sleep(0.01)
+    assert rag_knowledge.get_knowledge_status()["state"] == "warming"
+
+    rag = rag_knowledge.get_knowledge_rag()
+    thread.join()
+
+    assert SlowRAG.built == 1 and rag is rag_knowledge._knowledge_rag
+    assert rag_knowledge.start_knowledge_warmup() is None
+
+
+def test_warmup_start_does_not_wait_for_a_build_in_progress(cold_rag):
+    """Starting warmup from the event loop never blocks on a running build."""
+    SlowRAG.delay = 0.5
+    caller = threading.Thread(target=rag_knowledge.get_knowledge_rag)
+    caller.start()
+    time.sleep(0.05)
+
+    started = time.perf_counter()
+    thread = rag_knowledge.start_knowledge_warmup()
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.1
+    assert rag_knowledge.get_knowledge_status()["state"] == "warming"
+    caller.join()
+    thread.join()
+    assert SlowRAG.built == 1
+
+
+def test_failed_build_is_reported_and_retried(cold_rag):
+    SlowRAG.fail = True
+    rag_knowledge.start_knowledge_warmup().join()
+
+    status = rag_knowledge.get_knowledge_status()
+    assert status["state"] == "failed" and not status["ready"]
+    assert status["error"] == "embeddings unavailable"
+
+    SlowRAG.fail = False
+    rag_knowledge.get_knowledge_rag()
+    assert rag_knowledge.get_knowledge_status()["state"] == "ready"
+
+
+class StubRetriever:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    def route(self, query):
+        return "bm25"
+
+    def retrieve(self, query, vector=None, source=None, k=None):
+        self.calls.append((query, source, k))
+        return self.docs
+
+
+class CountingChain:
+    calls = 0
+
+    def invoke(self, inputs):
+        self.calls += 1
+        return AIMessage(content="Caution.")
+
+
+def _rag(tool_mode, docs):
+    rag = rag_knowledge.NASCARKnowledgeRAG.__new__(rag_knowledge.NASCARKnowledgeRAG)
+    rag.retriever = StubRetriever(docs)
+    rag.chain = CountingChain()
+    rag.cache = SemanticAnswerCache(enabled=False)
+    rag.tool_mode = tool_mode
+    rag.knowledge_files = []
+    rag.sources = knowledge_fingerprint([])
+    return rag
+
+
+def test_retrieve_mode_returns_cited_chunks_without_generation():
+    docs = [
+        Document(
+            page_content="### Yellow Flag\n\n**Caution** period; the pace car enters.",
+            metadata={
+                "source": "nascar_glossary.txt",
+                "section": "Flag Meanings > Yellow Flag",
+            },
+        ),
+        Document(page_content="Green means GO!", metadata={"source": "x.txt"}),
+    ]
+    rag = _rag("retrieve", docs)
+
+    output = rag.answer("yellow flag", source="nascar_glossary.txt")
+
+    assert rag.chain.calls == 0
+    assert "[1] nascar_glossary.txt > Flag Meanings > Yellow Flag\n" in output
+    assert "Caution period; the pace car enters." in output
+    assert "###" not in output and "**" not in output
+    assert "[2] x.txt\nGreen means GO!" in output
+    assert rag.retriever.calls == [
+        ("yellow flag", "nascar_glossary.txt", rag_knowledge.KNOWLEDGE_SOURCE_K)
+    ]
+    assert _rag("retrieve", []).answer("yellow flag").startswith("No relevant")
+
+
+def test_generate_mode_answers_through_the_chain():
+    rag = _rag("generate", [])
+    assert rag.answer("yellow flag") == "Caution."
+    assert rag.chain.calls == 1
+
+
+def _built_rag(tmp_path, monkeypatch, cache):
+    """A real RAG over the files in tmp_path with fake embeddings and model."""
+    monkeypatch.setattr(rag_knowledge, "KNOWLEDGE_BASE_PATH", str(tmp_path))
+    monkeypatch.setattr(
+        rag_knowledge, "_make_embeddings", lambda: DeterministicFakeEmbedding(size=8)
+    )
+    monkeypatch.setattr(
+        rag_knowledge,
+        "get_chat_model",
+        lambda **kwargs: GenericFakeChatModel(messages=iter(["Caution.", "Slow."])),
+    )
+    return rag_knowledge.NASCARKnowledgeRAG(
+        cache=cache, index_path=str(tmp_path / "index"), retrieval_mode="bm25"
+    )
+
+
+def test_changed_knowledge_files_reload_the_index(tmp_path, monkeypatch):
+    """Editing a knowledge file rebuilds the index and drops cached answers."""
+    glossary = tmp_path / rag_knowledge.GLOSSARY_SOURCE
+    glossary.write_text("Yellow flag: caution.")
+    cache = SemanticAnswerCache()
+    rag = _built_rag(tmp_path, monkeypatch, cache)
+    old_index = rag.index
+    assert rag.invoke("yellow flag") == "Caution."
+    assert cache.get_stats()["size"] == 1
+
+    glossary.write_text("Yellow flag: slow down behind the pace car.")
+    assert rag.invoke("yellow flag") == "Slow."
+
+    assert rag.index is not old_index
+    assert "pace car" in rag.index.documents[0].page_content
+    assert cache.get_stats()["invalidations"] == 1
+
+
+def test_dense_search_filters_on_source_in_qdrant(tmp_path, monkeypatch):
+    (tmp_path / rag_knowledge.GLOSSARY_SOURCE).write_text("Yellow flag: caution.")
+    (tmp_path / rag_knowledge.TRACKS_SOURCE).write_text("Daytona is 2.5 miles.")
+    rag = _built_rag(tmp_path, monkeypatch, SemanticAnswerCache(enabled=False))
+    vector = rag.embeddings.embed_query("yellow flag")
+
+    hits = rag._dense_search(rag.client, vector, 5, rag_knowledge.TRACKS_SOURCE, 0)
+
+    assert [rag.index.documents[i].metadata["source"] for i, _ in hits] == [
+        rag_knowledge.TRACKS_SOURCE
+    ]
+    assert len(rag._dense_search(rag.client, vector, 5, None, 0)) == 2
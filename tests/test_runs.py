@@ -0,0 +1,212 @@
+"""Tests for cancellable agent runs"""
+
+import asyncio
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, StateGraph
+
+from app import runs
+from app.runs import RunManager
+from app.state import PitBoxState
+
+
+def _graph(tool_finished: dict):
+    """One-node graph whose node waits on a slow tool."""
+
+    @tool
+    async def slow_lookup() -> str:
+        """Takes a long time."""
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            tool_finished["cancelled"] = True
+            raise
+        return "done"
+
+    async def agent(state: PitBoxState):
+        result = await slow_lookup.ainvoke({})
+        return {"messages": [AIMessage(content=result)]}
+
+    graph = StateGraph(PitBoxState)
+    graph.add_node("agent", agent)
+    graph.set_entry_point("agent")
+    graph.add_edge("agent", END)
+    return graph.compile()
+
+
+def test_disconnect_cancels_run_and_tool_calls(monkeypatch):
+    """A listener that goes away cancels the run and its in-flight tool."""
+    monkeypatch.setattr(runs, "DISCONNECT_POLL_INTERVAL", 0.02)
+    tool_state = {}
+    manager = RunManager()
+
+    async def scenario():
+        disconnected = False
+
+        async def is_disconnected():
+            return disconnected
+
+        run = manager.start(_graph(tool_state), "Where is the 99?")
+        events = []
+        async for event in manager.subscribe(run, is_disconnected):
+            events.append(event)
+            if event["type"] == "tool_start":
+                disconnected = True
+        await asyncio.sleep(0.05)
+        return run, events
+
+    run, events = asyncio.run(scenario())
+
+    assert [event["type"] for event in events] == ["tool_start"]
+    assert run.cancel_reason == "disconnected" and run.task.cancelled()
+    assert tool_state == {"cancelled": True}
+    metrics = manager.get_metrics()
+    assert metrics["cancelled_disconnected"] == 1
+    assert metrics["cancelled_tool_calls"] == 1
+    assert metrics["active_runs"] == 0
+
+
+def test_new_question_supersedes_session_run():
+    """A session's new question cancels its unfinished previous one."""
+    manager = RunManager()
+
+    async def scenario():
+        first = manager.start(_graph({}), "Current flag?", session_id="crew-1")
+        other = manager.start(_graph({}), "Current flag?", session_id="crew-2")
+        await asyncio.sleep(0.05)
+        second = manager.start(_graph({}), "Pit now?", session_id="crew-1")
+
+        events = [event async for event in manager.subscribe(first)]
+        await asyncio.sleep(0)
+        states = (first.task.cancelled(), other.done, second.done)
+        for run in (other, second):
+            manager.cancel(run, "disconnected")
+        return events, states
+
+    events, states = asyncio.run(scenario())
+
+    assert events[-1] == {"type": "cancelled", "reason": "superseded"}
+    assert states == (True, False, False)
+    assert manager.get_metrics()["cancelled_superseded"] == 1
+
+
+def _counting_graph(calls: list, tool_name: str = "get_live_timing"):
+    """One-node graph that records each execution and reports a tool call."""
+
+    @tool(tool_name)
+    async def lookup() -> str:
+        """Quick lookup."""
+        await asyncio.sleep(0.02)
+        return "P3"
+
+    async def agent(state: PitBoxState):
+        calls.append(state["messages"][-1].content)
+        result = await lookup.ainvoke({})
+        return {"messages": [AIMessage(content=result)]}
+
+    graph = StateGraph(PitBoxState)
+    graph.add_node("agent", agent)
+    graph.set_entry_point("agent")
+    graph.add_edge("agent", END)
+    return graph.compile()
+
+
+async def _events(manager: RunManager, run) -> list:
+    return [event async for event in manager.subscribe(run)]
+
+
+def test_identical_questions_share_one_run():
+    """A repeat of a question in flight joins it and gets the whole stream."""
+    calls = []
+    manager = RunManager()
+
+    async def scenario():
+        first = manager.start(_counting_graph(calls), "Where is the 99?", "crew-1")
+        await asyncio.sleep(0.01)
+        joined = manager.join("  where is the 99 ", "crew-2")
+        streams = await asyncio.gather(
+            *[_events(manager, run) for run in (first, joined)]
+        )
+        return first, joined, streams
+
+    first, joined, (a, b) = asyncio.run(scenario())
+
+    assert joined is first and len(calls) == 1
+    assert a == b and [event["type"] for event in a] == [
+        "tool_start",
+        "tool_end",
+        "answer",
+    ]
+    assert manager.get_metrics()["joined_in_flight"] == 1
+
+
+def test_join_or_start_starts_one_run_per_question():
+    """Callers racing on one question get one run, and only one starts it."""
+    calls = []
+    manager = RunManager()
+
+    async def scenario():
+        graph = _counting_graph(calls)
+        results = [
+            manager.join_or_start(graph, message, session)
+            for message, session in [
+                ("Where is the 99?", "crew-1"),
+                ("where is the 99", "crew-2"),
+            ]
+        ]
+        await asyncio.gather(*[_events(manager, run) for run, _ in results])
+        return results
+
+    (first, started), (second, joined_started) = asyncio.run(scenario())
+
+    assert second is first and len(calls) == 1
+    assert started and not joined_started
+    assert manager.get_metrics()["started_runs"] == 1
+
+
+def test_superseding_a_shared_run_leaves_it_running():
+    """One session moving on doesn't cancel a run another session joined."""
+    manager = RunManager()
+
+    async def scenario():
+        first = manager.start(_graph({}), "Current flag?", session_id="crew-1")
+        manager.join("Current flag?", session_id="crew-2")
+        second = manager.start(_graph({}), "Pit now?", session_id="crew-1")
+        await asyncio.sleep(0)
+        state = first.cancel_reason
+        for run in (first, second):
+            manager.cancel(run, "disconnected")
+        return state
+
+    assert asyncio.run(scenario()) is None
+    assert manager.get_metrics()["cancelled_superseded"] == 0
+
+
+def test_finished_answers_are_reused_by_freshness(monkeypatch):
+    """Live-data answers expire quickly; knowledge-base answers last longer."""
+    monkeypatch.setattr(runs, "CHAT_REUSE_WINDOW", 0.05)
+    monkeypatch.setattr(runs, "CHAT_REUSE_WINDOW_STATIC", 10)
+    calls = []
+    manager = RunManager()
+    knowledge_tool = next(iter(runs.KNOWLEDGE_TOOL_NAMES))
+
+    async def scenario():
+        live = manager.start(_counting_graph(calls), "Gap to leader?")
+        static = manager.start(
+            _counting_graph(calls, knowledge_tool), "What is a splash and go?"
+        )
+        await asyncio.gather(live.task, static.task)
+        reused = manager.join("gap to leader")
+        await asyncio.sleep(0.1)
+        return (
+            reused is live,
+            manager.join("Gap to leader?"),
+            manager.join("What is a splash and go") is static,
+        )
+
+    live_reused, expired, static_reused = asyncio.run(scenario())
+
+    assert live_reused and expired is None and static_reused
+    assert len(calls) == 2
+    assert manager.get_metrics()["reused_answers"] == 2
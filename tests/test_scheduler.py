@@ -0,0 +1,93 @@
+"""Tests for API admission control and priority scheduling"""
+
+import asyncio
+
+import pytest
+
+from app.scheduler import RequestScheduler, SchedulerBusy
+
+
+def test_waiters_are_admitted_in_priority_order():
+    """Queued requests run urgent first, then normal, then analytics."""
+    scheduler = RequestScheduler(max_concurrent=1, max_queue=10, urgent_reserved=0)
+    admitted = []
+
+    async def request(priority):
+        await scheduler.acquire(priority)
+        admitted.append(priority)
+        await asyncio.sleep(0.01)
+        scheduler.release()
+
+    async def scenario():
+        await scheduler.acquire("normal")
+        waiters = [
+            asyncio.create_task(request(priority))
+            for priority in ("analytics", "normal", "urgent", "analytics")
+        ]
+        await asyncio.sleep(0.01)
+        queued = scheduler.get_metrics()["queue_depth"]
+        scheduler.release()
+        await asyncio.gather(*waiters)
+        return queued
+
+    assert asyncio.run(scenario()) == 4
+    assert admitted == ["urgent", "normal", "analytics", "analytics"]
+    metrics = scheduler.get_metrics()
+    assert metrics["running"] == 0 and metrics["queue_depth"] == 0
+    assert metrics["priorities"]["analytics"]["admitted"] == 2
+    assert metrics["max_wait_ms"] > 0
+
+
+def test_full_queue_and_timeouts_are_rejected():
+    """Saturation is reported as SchedulerBusy instead of waiting forever."""
+    scheduler = RequestScheduler(
+        max_concurrent=1, max_queue=1, queue_timeout=0.05, urgent_reserved=0
+    )
+
+    async def scenario():
+        await scheduler.acquire()
+        waiter = asyncio.create_task(scheduler.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerBusy, match="queue full"):
+            await scheduler.acquire("analytics")
+        with pytest.raises(SchedulerBusy, match="timed out"):
+            await waiter
+
+    asyncio.run(scenario())
+    priorities = scheduler.get_metrics()["priorities"]
+    assert priorities["analytics"]["rejected"] == 1
+    assert priorities["normal"]["timed_out"] == 1
+    assert scheduler.running == 1
+
+
+def test_reserved_slot_keeps_room_for_urgent_requests():
+    """Analytics can't take the last slot, but an urgent request can."""
+    scheduler = RequestScheduler(max_concurrent=2, queue_timeout=0.05)
+
+    async def scenario():
+        await scheduler.acquire("analytics")
+        with pytest.raises(SchedulerBusy):
+            await scheduler.acquire("analytics")
+        await scheduler.acquire("urgent")
+
+    asyncio.run(scenario())
+    assert scheduler.running == 2
+
+
+def test_urgent_skips_waiters_held_back_by_the_reserve():
+    """A queued analytics request doesn't keep urgent out of its reserved slot."""
+    scheduler = RequestScheduler(
+        max_concurrent=2, max_queue=10, queue_timeout=0.05, urgent_reserved=1
+    )
+
+    async def scenario():
+        await scheduler.acquire("analytics")
+        waiter = asyncio.create_task(scheduler.acquire("analytics"))
+        await asyncio.sleep(0)
+        await scheduler.acquire("urgent")
+        assert scheduler.running == 2
+        with pytest.raises(SchedulerBusy, match="timed out"):
+            await waiter
+
+    asyncio.run(scenario())
+    assert scheduler.get_metrics()["priorities"]["urgent"]["admitted"] == 1
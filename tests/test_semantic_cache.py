@@ -0,0 +1,93 @@
+"""Tests for the semantic answer cache"""
+
+import time
+
+import numpy as np
+
+from app.tools.semantic_cache import SemanticAnswerCache
+
+VECTORS = {
+    "What is a yellow flag?": [1.0, 0.0, 0.0],
+    "what does the yellow flag mean": [0.98, 0.2, 0.0],
+    "What is a green-white-checkered finish?": [0.0, 1.0, 0.0],
+    "Who drives the No. 1 car?": [0.0, 0.0, 1.0],
+    "Who drives the No. 99 car?": [0.0, 0.05, 1.0],
+}
+
+
+def _embed(question):
+    return VECTORS[question]
+
+
+def _store(cache, question, answer, tokens=0):
+    cached, vector = cache.lookup(question, _embed)
+    assert cached is None
+    cache.store(question, vector, answer, tokens)
+
+
+def test_near_duplicate_questions_hit():
+    """Similar wording hits; unrelated questions and other car numbers miss."""
+    cache = SemanticAnswerCache(threshold=0.95, enabled=True)
+    _store(cache, "What is a yellow flag?", "Caution.", tokens=120)
+    _store(cache, "Who drives the No. 1 car?", "Ross Chastain.")
+
+    assert cache.lookup("what does the yellow flag mean", _embed)[0] == "Caution."
+    assert cache.lookup("What is a green-white-checkered finish?", _embed)[0] is None
+    assert cache.lookup("Who drives the No. 99 car?", _embed)[0] is None
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 4
+    assert stats["saved_tokens"] == 120
+    assert stats["hit_rate"] == 0.2
+
+
+def test_entries_expire_evict_and_invalidate():
+    """TTL, LRU size bound and knowledge file changes all drop answers."""
+    cache = SemanticAnswerCache(max_entries=2, ttl=0.05, enabled=True)
+    vector = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+    cache.store("What is a yellow flag?", vector, "Caution.")
+    time.sleep(0.06)
+    assert cache.lookup("What is a yellow flag?", _embed)[0] is None
+
+    cache.ttl = 60
+    for question in list(VECTORS)[2:]:
+        _store(cache, question, question.upper())
+    assert cache.get_stats()["size"] == 2
+    assert cache.lookup("What is a green-white-checkered finish?", _embed)[0] is None
+
+    cache.observe_sources(("glossary", 1))
+    cache.observe_sources(("glossary", 1))
+    assert cache.get_stats()["size"] == 2
+    cache.observe_sources(("glossary", 2))
+
+    stats = cache.get_stats()
+    assert stats["size"] == 0
+    assert stats["expirations"] == 1
+    assert stats["evictions"] == 1
+    assert stats["invalidations"] == 2
+
+
+def test_exact_repeats_hit_without_embedding():
+    """Answers stored without a vector (BM25-routed questions) match verbatim."""
+    cache = SemanticAnswerCache(enabled=True)
+    assert cache.lookup("What is a yellow flag?") == (None, None)
+    cache.store("What is a yellow flag?", None, "Caution.")
+
+    def embed(question):
+        raise AssertionError("exact repeats must not be embedded")
+
+    assert cache.lookup("What is a yellow flag?", embed)[0] == "Caution."
+    assert cache.lookup("what does the yellow flag mean", _embed)[0] is None
+
+
+def test_answers_are_scoped():
+    """The same question asked of another knowledge file is a miss."""
+    cache = SemanticAnswerCache(enabled=True)
+    cached, vector = cache.lookup("What is a yellow flag?", _embed, scope="glossary")
+    cache.store("What is a yellow flag?", vector, "Caution.", scope="glossary")
+
+    assert cache.lookup("What is a yellow flag?", _embed, scope="tracks")[0] is None
+    assert (
+        cache.lookup("what does the yellow flag mean", _embed, scope="glossary")[0]
+        == "Caution."
+    )
@@ -0,0 +1,149 @@
+"""Tests for concurrent tool execution in the simple pit box graph"""
+
+import asyncio
+import time
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+
+import app.tools as tool_registry
+from app.graphs import analytics_agent, simple_pitbox
+
+
+@tool
+async def slow_lookup(car: str) -> dict:
+    """Look up a car slowly."""
+    await asyncio.sleep(0.2)
+    return {"car": car}
+
+
+@tool
+async def stuck_lookup(car: str) -> str:
+    """Never finishes in time."""
+    await asyncio.sleep(5)
+    return car
+
+
+def _state(*calls):
+    tool_calls = [
+        {"name": name, "args": {"car": car}, "id": f"call_{i}"}
+        for i, (name, car) in enumerate(calls)
+    ]
+    return {"messages": [AIMessage(content="", tool_calls=tool_calls)]}
+
+
+def _tools(*tools):
+    async def aget_tools():
+        return list(tools)
+
+    return aget_tools
+
+
+def test_tool_calls_run_concurrently_in_order(monkeypatch):
+    """Independent calls overlap and results keep the call order."""
+    monkeypatch.setattr(simple_pitbox, "aget_tools", _tools(slow_lookup))
+
+    state = _state(("slow_lookup", "1"), ("slow_lookup", "88"), ("slow_lookup", "99"))
+    start = time.perf_counter()
+    result = asyncio.run(simple_pitbox.execute_tools(state))
+    elapsed = time.perf_counter() - start
+
+    messages = result["messages"]
+    assert elapsed < 0.5
+    assert [m.tool_call_id for m in messages] == ["call_0", "call_1", "call_2"]
+    assert messages[2].content == '{"car": "99"}'
+    assert all("duration_ms" in m.additional_kwargs for m in messages)
+
+
+def test_tool_timeout_and_missing_tool(monkeypatch):
+    """A slow tool times out without blocking the rest of the batch."""
+    monkeypatch.setattr(simple_pitbox, "aget_tools", _tools(stuck_lookup))
+    monkeypatch.setattr(simple_pitbox, "TOOL_TIMEOUT", 0.1)
+
+    state = _state(("stuck_lookup", "1"), ("missing_tool", "2"))
+    messages = asyncio.run(simple_pitbox.execute_tools(state))["messages"]
+
+    assert "timed out" in messages[0].content
+    assert messages[1].content == "Tool missing_tool not found"
+
+
+class FakeToolModel(GenericFakeChatModel):
+    """Fake chat model that records how often tools are bound."""
+
+    binds: int = 0
+
+    def bind_tools(self, tools, **kwargs):
+        self.binds += 1
+        return self
+
+
+def test_call_model_reuses_bound_model(monkeypatch):
+    """The model is bound once per tool set version and invoked asynchronously."""
+    model = FakeToolModel(messages=iter(["lap 1", "lap 2", "lap 3"]))
+    monkeypatch.setattr(tool_registry, "get_chat_model", lambda model_name: model)
+    monkeypatch.setattr(tool_registry, "get_tools", lambda: [slow_lookup])
+    monkeypatch.setattr(tool_registry, "_tools", [slow_lookup])
+    monkeypatch.setattr(tool_registry, "_tools_version", 1)
+    monkeypatch.setattr(tool_registry, "_bound_models", {})
+
+    state = {"messages": [HumanMessage(content="How fast?")]}
+    assert asyncio.run(simple_pitbox.call_model(state))["messages"][0].content == (
+        "lap 1"
+    )
+    asyncio.run(simple_pitbox.call_model(state))
+    assert model.binds == 1
+
+    # A new tool set version rebinds
+    monkeypatch.setattr(tool_registry, "_tools_version", 2)
+    assert asyncio.run(simple_pitbox.call_model(state))["messages"][0].content == (
+        "lap 3"
+    )
+    assert model.binds == 2
+    assert list(tool_registry._bound_models) == [(None, 2)]
+
+
+def test_cached_model_is_used_without_a_thread_hop(monkeypatch):
+    """Once tools are loaded and bound, nodes don't leave the event loop."""
+    model = FakeToolModel(messages=iter(["lap 1"]))
+    monkeypatch.setattr(tool_registry, "_tools", [slow_lookup])
+    monkeypatch.setattr(tool_registry, "_mcp_version", 1)
+    monkeypatch.setattr(tool_registry, "_tools_version", 1)
+    monkeypatch.setattr(tool_registry, "_bound_models", {(None, 1): model})
+
+    async def no_thread(*args, **kwargs):
+        raise AssertionError("cached lookups must not use a worker thread")
+
+    monkeypatch.setattr(tool_registry.asyncio, "to_thread", no_thread)
+
+    state = {"messages": [HumanMessage(content="How fast?")]}
+    assert asyncio.run(simple_pitbox.call_model(state))["messages"][0].content == (
+        "lap 1"
+    )
+    assert asyncio.run(tool_registry.aget_tools()) == [slow_lookup]
+
+
+def test_analytics_tool_node_follows_the_tool_set(monkeypatch):
+    """The analytics graph runs tools from the current tool set version."""
+
+    @tool
+    async def lap_lookup(car: str) -> str:
+        """Look up a car's lap."""
+        return f"lap for {car}"
+
+    tools = [slow_lookup]
+    monkeypatch.setattr(analytics_agent, "_tool_node", None)
+    monkeypatch.setattr(analytics_agent, "aget_tools", lambda: _tools(*tools)())
+    monkeypatch.setattr(analytics_agent, "get_tools_version", lambda: len(tools))
+
+    state = _state(("lap_lookup", "99"))
+    before = asyncio.run(analytics_agent.execute_tools(state, {"configurable": {}}))[
+        "messages"
+    ][0]
+    assert before.status == "error"
+
+    tools.append(lap_lookup)
+    after = asyncio.run(analytics_agent.execute_tools(state, {"configurable": {}}))[
+        "messages"
+    ][0]
+    assert after.content == "lap for 99"
@@ -0,0 +1,154 @@
+"""Tests for streaming agent output"""
+
+import asyncio
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.tools import tool
+
+from app.graphs import simple_pitbox
+from app.streaming import (
+    SentenceChunker,
+    stream_agent_events,
+    stream_speech_chunks,
+)
+
+
+@tool
+async def get_flag() -> str:
+    """Current flag."""
+    await asyncio.sleep(0.01)
+    return "green"
+
+
+class StreamingToolModel(GenericFakeChatModel):
+    """Fake chat model that streams tool calls as well as text."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = next(self.messages)
+        if isinstance(message, AIMessage) and message.tool_calls:
+            chunk = AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": call["name"], "args": "{}", "id": call["id"], "index": i}
+                    for i, call in enumerate(message.tool_calls)
+                ],
+            )
+            yield ChatGenerationChunk(message=chunk)
+            return
+        for token in message.split(" "):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token + " "))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+def _collect(message: str) -> list:
+    async def run():
+        graph = simple_pitbox.build_graph().compile()
+        return [event async for event in stream_agent_events(graph, message)]
+
+    return asyncio.run(run())
+
+
+def test_stream_forwards_tokens_and_tool_events(monkeypatch):
+    """Tool events arrive around the tool call, then the answer token by token."""
+    model = StreamingToolModel(
+        messages=iter(
+            [
+                AIMessage(
+                    content="", tool_calls=[{"name": "get_flag", "args": {}, "id": "1"}]
+                ),
+                "The flag is green",
+            ]
+        )
+    )
+
+    async def aget_model_with_tools():
+        return model
+
+    async def aget_tools():
+        return [get_flag]
+
+    monkeypatch.setattr(simple_pitbox, "aget_model_with_tools", aget_model_with_tools)
+    monkeypatch.setattr(simple_pitbox, "aget_tools", aget_tools)
+
+    events = _collect("What flag?")
+    types = [event["type"] for event in events]
+
+    assert types == ["tool_start", "tool_end"] + ["token"] * 4 + ["answer"]
+    assert events[1]["tool"] == "get_flag" and events[1]["error"] is False
+    assert events[1]["id"] == events[0]["id"]
+    assert "".join(e["content"] for e in events[2:6]) == "The flag is green "
+    assert events[-1]["content"] == "The flag is green "
+
+
+def test_sentence_chunker_splits_speakable_chunks():
+    """Sentences are released as they end; abbreviations and decimals don't split."""
+    chunker = SentenceChunker(min_chars=20, max_chars=60)
+    text = (
+        "The **No. 99** car is P3, running 31.52s laps. Pit window opens on lap "
+        "45! Options:\n1. two tires\n2. fuel only, which keeps track position "
+        "but leaves the car loose on the long run and slow on restarts"
+    )
+    chunks = []
+    for i in range(0, len(text), 3):
+        chunks += chunker.feed(text[i : i + 3])
+    chunks += chunker.flush()
+
+    assert chunks[:5] == [
+        "The No. 99 car is P3,",
+        "running 31.52s laps.",
+        "Pit window opens on lap 45!",
+        "Options:",
+        "1. two tires",
+    ]
+    # Too short to split at the comma; the run-on is cut at a space instead
+    assert chunks[5] == "2. fuel only, which keeps track position but leaves the car"
+    assert all(len(chunk) <= 60 for chunk in chunks)
+    assert " ".join(chunks).endswith("slow on restarts")
+
+
+def test_speech_stream_reports_first_chunk_latency():
+    """Speech events carry timestamps and tool events pass through."""
+
+    async def events():
+        yield {"type": "tool_start", "tool": "get_flag", "id": "1"}
+        for token in ["Green ", "flag. ", "Pit ", "now"]:
+            await asyncio.sleep(0.01)
+            yield {"type": "token", "content": token}
+
+    async def run():
+        return [event async for event in stream_speech_chunks(events())]
+
+    out = asyncio.run(run())
+    speech = [event for event in out if event["type"] == "speech"]
+
+    assert out[0]["type"] == "tool_start"
+    assert [event["text"] for event in speech] == ["Green flag.", "Pit now"]
+    assert speech[0]["t_ms"] < speech[1]["t_ms"]
+    assert out[-1]["type"] == "speech_done"
+    assert out[-1]["chunks"] == 2
+    assert out[-1]["first_chunk_ms"] == speech[0]["t_ms"]
+
+
+def test_speech_falls_back_to_complete_answer():
+    """Without streamed tokens the final answer is chunked for speech."""
+
+    async def events():
+        yield {"type": "answer", "content": "Green flag. Pit now."}
+
+    async def run():
+        return [event async for event in stream_speech_chunks(events())]
+
+    out = asyncio.run(run())
+
+    assert [e["text"] for e in out if e["type"] == "speech"] == [
+        "Green flag.",
+        "Pit now.",
+    ]
+    assert [e["type"] for e in out] == ["speech", "speech", "answer", "speech_done"]